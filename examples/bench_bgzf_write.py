@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Benchmark writing of BGZF files with writes of increasing size
+
+The time per MiB should stay constant with growing write sizes.
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+
+from vcfpy import bgzf
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+def run(args):
+    # Data that compresses somewhat similar to VCF
+    line = b"20\t14370\trs6054257\tG\tA\t29\tPASS\tNS=3;DP=14\tGT:GQ\t0|0:48\t1|0:48\n"
+    for size in args.sizes:
+        data = (line * (size * 1024 * 1024 // len(line) + 1))[: size * 1024 * 1024]
+        times = []
+        for _ in range(args.repetitions):
+            begin = time.perf_counter()
+            w = bgzf.BgzfWriter(
+                fileobj=io.BytesIO(), compresslevel=args.level, threads=args.threads
+            )
+            w.write(data)
+            w.flush()
+            times.append(time.perf_counter() - begin)
+        print(
+            "{:>5} MiB in one write: {:.3} seconds, {:.3} seconds per MiB".format(
+                size, statistics.mean(times), statistics.mean(times) / size
+            ),
+            file=sys.stderr,
+        )
+
+
+def main(argv=None):
+    """Main program entry point for parsing command line arguments"""
+    parser = argparse.ArgumentParser(description="BGZF writer benchmark")
+
+    parser.add_argument("--repetitions", type=int, default=3, help="Number of repetitions")
+    parser.add_argument("--level", type=int, default=6, help="Compression level")
+    parser.add_argument("--threads", type=int, default=1, help="Number of threads")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="Write sizes in MiB"
+    )
+
+    args = parser.parse_args(argv)
+    run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
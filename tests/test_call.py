@@ -155,3 +155,63 @@ def test_gt_type_filtered_empty():
 def test_gt_type_filtered_pass():
     call = record.Call("sample", vcfpy.OrderedDict([("GT", "1/1"), ("FT", ["PASS"])]))
     assert not call.is_filtered()
+
+
+# Call.genotype ---------------------------------------------------------------
+
+
+def test_genotype_shared():
+    call1 = record.Call("sample1", vcfpy.OrderedDict([("GT", "0|1")]))
+    call2 = record.Call("sample2", vcfpy.OrderedDict([("GT", "0|1")]))
+    assert call1.genotype is call2.genotype
+    assert call1.genotype == record.Genotype((0, 1), True, True, 2, vcfpy.HET)
+    assert call1.gt_alleles == [0, 1]
+    assert call1.gt_alleles is not call2.gt_alleles
+
+
+def test_genotype_no_call():
+    call = record.Call("sample", vcfpy.OrderedDict([("GT", "./.")]))
+    assert call.genotype == record.Genotype((None, None), False, False, 2, None)
+    assert call.gt_alleles == [None, None]
+    assert call.called is False
+    assert call.ploidy == 2
+    assert call.gt_type is None
+
+
+def test_genotype_haploid():
+    call = record.Call("sample", vcfpy.OrderedDict([("GT", "1")]))
+    assert call.genotype == record.Genotype((1,), False, True, 1, vcfpy.HOM_ALT)
+
+
+def test_genotype_gt_list():
+    call = record.Call("sample", vcfpy.OrderedDict([("GT", ["1/2"])]))
+    assert call.gt_alleles == [1, 2]
+    assert call.gt_type == vcfpy.HET
+
+
+def test_genotype_no_gt():
+    call = record.Call("sample", vcfpy.OrderedDict([("DP", 10)]))
+    assert call.genotype is None
+    assert call.gt_alleles is None
+    assert call.is_phased is False
+    assert call.gt_type is None
+
+
+def test_genotype_modified_gt_alleles():
+    call = record.Call("sample", vcfpy.OrderedDict([("GT", "0/1")]))
+    assert call.gt_type == vcfpy.HET
+    call.gt_alleles = [1, 1]
+    assert call.gt_type == vcfpy.HOM_ALT
+    call.gt_alleles[0] = 0
+    assert call.gt_type == vcfpy.HET
+    call.gt_alleles[1] = 0
+    assert call.gt_type == vcfpy.HOM_REF
+    assert call.genotype.gt_type == vcfpy.HET
+
+
+def test_genotype_modified_gt():
+    call = record.Call("sample", vcfpy.OrderedDict([("GT", "0/1")]))
+    assert call.is_phased is False
+    call.data["GT"] = "1|1"
+    assert call.is_phased is True
+    assert call.gt_phase_char == "|"
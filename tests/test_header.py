@@ -2,6 +2,7 @@
 """Tests for vcfpy.header
 """
 
+import pickle
 import sys
 
 import vcfpy
@@ -348,3 +349,38 @@ def test_header_has_header_line_positive_no_samples():
     assert not hdr.has_header_line("INFO", "AD")
     assert not hdr.has_header_line("FILTER", "PASS")
     assert not hdr.has_header_line("contig", "1")
+
+
+def test_header_get_info_decoder():
+    lines = [
+        header.InfoHeaderLine.from_mapping(
+            vcfpy.OrderedDict([("ID", "AD"), ("Number", "R"), ("Type", "Integer")])
+        )
+    ]
+    hdr = header.Header(lines, header.SamplesInfos([]))
+
+    decoder = hdr.get_info_decoder("AD")
+    assert decoder("1,2") == [1, 2]
+    assert hdr.get_info_decoder("AD") is decoder
+    with pytest.warns(vcfpy.exceptions.FieldInfoNotFound):
+        missing = hdr.get_info_decoder("XX")
+    assert missing("3") == ["3"]
+    assert hdr.get_info_decoder("XX") is missing
+    assert hdr.missing_field_counts == {("INFO", "XX"): 2}
+
+    hdr.add_info_line(vcfpy.OrderedDict([("ID", "XX"), ("Number", 1), ("Type", "Integer")]))
+    assert hdr.get_info_decoder("XX")("3") == 3
+    assert hdr.get_info_decoder("AD") is not decoder
+
+
+def test_header_pickle_with_info_decoders():
+    lines = [
+        header.InfoHeaderLine.from_mapping(
+            vcfpy.OrderedDict([("ID", "AD"), ("Number", "R"), ("Type", "Integer")])
+        )
+    ]
+    hdr = header.Header(lines, header.SamplesInfos(["one"]))
+    hdr.get_info_decoder("AD")
+    restored = pickle.loads(pickle.dumps(hdr))
+    assert restored == hdr
+    assert restored.get_info_decoder("AD")("1,2") == [1, 2]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Tests for the fallback of INFO and FORMAT fields missing from the header
+"""
+
+import io
+import warnings
+
+import pytest
+
+from vcfpy import Reader, header, exceptions
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+MISSING_FIELDS_VCF = (
+    "##fileformat=VCFv4.3\n"
+    '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tNA00001\n"
+    "20\t100\t.\tC\tT\t.\t.\tXX=1,2;DP=3\tGT:YY\t0/1:a\n"
+    "20\t200\t.\tC\tT\t.\t.\tXX=3\tGT:YY\t0/1:b\n"
+    "20\t300\t.\tC\tT\t.\t.\tXX=4\tGT\t0/1\n"
+)
+
+
+def test_missing_field_warned_once():
+    hdr = header.Header([], header.SamplesInfos([]))
+    with pytest.warns(exceptions.FieldInfoNotFound) as record:
+        first = hdr.get_info_field_info("XX")
+        second = hdr.get_info_field_info("XX")
+        hdr.get_format_field_info("XX")
+    assert len(record) == 2
+    assert first is second
+    assert (first.type, first.number) == ("String", ".")
+    assert hdr.get_missing_field_info("INFO", "XX") is first
+    assert hdr.get_missing_field_info("INFO", "YY") is None
+    # only decoded values are counted
+    assert hdr.missing_field_counts == {}
+
+
+def test_missing_field_reserved():
+    hdr = header.Header([], header.SamplesInfos([]))
+    with pytest.warns(exceptions.FieldInfoNotFound):
+        info = hdr.get_info_field_info("DP")
+    assert (info.type, info.number) == ("Integer", 1)
+
+
+@pytest.mark.parametrize("record_checks", [[], ["INFO", "FORMAT"]])
+def test_missing_field_counts_parsing(record_checks):
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter("always")
+        reader = Reader.from_stream(io.StringIO(MISSING_FIELDS_VCF), record_checks=record_checks)
+        records = list(reader)
+    assert [r.INFO["XX"] for r in records] == [["1", "2"], ["3"], ["4"]]
+    assert [r.calls[0].data.get("YY") for r in records] == [["a"], ["b"], None]
+    assert len([w for w in record if issubclass(w.category, exceptions.FieldInfoNotFound)]) == 3
+    assert reader.header.missing_field_counts == {
+        ("INFO", "XX"): 3,
+        ("INFO", "DP"): 1,
+        ("FORMAT", "YY"): 2,
+    }
+    out = io.StringIO()
+    reader.parser.print_warn_summary(out)
+    assert out.getvalue() == (
+        "Fields not found in header:\n"
+        "  FORMAT YY: 2 occurrences, used String/'.'\n"
+        "  INFO DP: 1 occurrences, used Integer/1\n"
+        "  INFO XX: 3 occurrences, used String/'.'\n"
+    )
+
+
+def test_print_warn_summary_no_warnings(multisample_vcf):
+    reader = Reader.from_stream(io.StringIO(multisample_vcf))
+    list(reader)
+    out = io.StringIO()
+    reader.parser.print_warn_summary(out)
+    assert out.getvalue() == ""
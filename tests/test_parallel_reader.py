@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Tests for parallel reading of tabix-indexed VCF files"""
+
+import os
+
+from vcfpy import ParallelReader, Reader
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+PATH = os.path.join(os.path.dirname(__file__), "vcfs", "multi_contig.vcf.gz")
+
+
+def count_records(records):
+    return len(records)
+
+
+def test_parallel_reader_regions():
+    reader = ParallelReader(PATH, chunk_size=100000000)
+    assert reader.regions() == [
+        ("1", 0, 100000000),
+        ("1", 100000000, 200000000),
+        ("1", 200000000, None),
+        ("2", 0, 100000000),
+        ("2", 100000000, 200000000),
+        ("2", 200000000, None),
+        ("20", 0, None),
+    ]
+
+
+def test_parallel_reader_iter_ordered():
+    with Reader.from_path(PATH) as reader:
+        expected = [(r.CHROM, r.POS) for r in reader]
+    reader = ParallelReader(PATH, processes=2, chunk_size=1200000)
+    assert [(r.CHROM, r.POS) for r in reader] == expected
+
+
+def test_parallel_reader_map_regions_unordered():
+    reader = ParallelReader(PATH, processes=2, chunk_size=1200000, ordered=False)
+    assert sum(reader.map_regions(count_records)) == 5
+
+
+def test_parallel_reader_map_regions_explicit():
+    reader = ParallelReader(PATH, processes=1)
+    regions = [("20", 1110695, 1230236), ("20", 1230236, 1234566)]
+    assert list(reader.map_regions(count_records, regions)) == [1, 1]
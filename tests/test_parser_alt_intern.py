@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Test sharing of ALT objects between records by the RecordParser
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from vcfpy import header
+from vcfpy import parser
+from vcfpy import record
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+@pytest.fixture
+def record_parser():
+    return parser.RecordParser(header.Header(), header.SamplesInfos([]))
+
+
+def test_intern_substitution(record_parser):
+    first = record_parser._process_alt("C", "T")
+    assert first is record_parser._process_alt("C", "T")
+    assert first == record.Substitution(record.SNV, "T")
+    assert record_parser._process_alt("G", "T") is not first
+    assert record_parser._process_alt("CT", "C").type == record.DEL
+
+
+def test_intern_symbolic(record_parser):
+    first = record_parser._process_alt("C", "<DEL>")
+    assert first is record_parser._process_alt("GATTACA", "<DEL>")
+    assert first == record.SymbolicAllele("DEL")
+
+
+def test_no_intern_long_alleles(record_parser):
+    ref, alt = "C", "C" + "T" * parser.ALT_INTERN_MAX_LENGTH
+    first = record_parser._process_alt(ref, alt)
+    assert first == parser.process_alt(None, ref, alt)
+    assert first is not record_parser._process_alt(ref, alt)
+
+
+def test_intern_parse_line(record_parser):
+    lines = ["20\t{}\t.\tC\tT,<DEL>\t.\t.\t.\n".format(pos) for pos in (100, 200)]
+    first, second = map(record_parser.parse_line, lines)
+    assert first.ALT == [record.Substitution(record.SNV, "T"), record.SymbolicAllele("DEL")]
+    assert first.ALT is not second.ALT
+    assert all(a is b for a, b in zip(first.ALT, second.ALT))
+
+
+def test_intern_immutable(record_parser):
+    lines = ["20\t{}\t.\tC\tT,<DEL>\t.\t.\t.\n".format(pos) for pos in (100, 200)]
+    first, second = map(record_parser.parse_line, lines)
+    assert isinstance(first.ALT[0], record.Substitution)
+    assert isinstance(first.ALT[1], record.SymbolicAllele)
+    for alt in first.ALT:
+        with pytest.raises(AttributeError):
+            alt.value = "A"
+        with pytest.raises(AttributeError):
+            del alt.type
+    assert second.ALT == [record.Substitution(record.SNV, "T"), record.SymbolicAllele("DEL")]
+    first.ALT[0] = record.Substitution(record.SNV, "A")
+    assert str(first.ALT[0]) == "Substitution(type_='SNV', value='A')"
+    assert second.ALT[0].value == "T"
+
+
+def test_intern_pickle(record_parser):
+    alt = record_parser._process_alt("C", "T")
+    restored = pickle.loads(pickle.dumps(alt))
+    assert type(restored) is record.FrozenSubstitution
+    assert restored == alt
+    assert copy.copy(alt) == alt
+
+
+def test_no_intern_breakends(record_parser):
+    for alt_str in ("C.", ".C", "C[2:3["):
+        first = record_parser._process_alt("C", alt_str)
+        assert isinstance(first, record.BreakEnd)
+        assert first is not record_parser._process_alt("C", alt_str)
+    assert not record_parser._alt_cache
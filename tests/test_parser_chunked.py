@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Tests for reading the stream in chunks in the Parser"""
+
+import io
+
+import pytest
+
+from vcfpy import Reader
+
+
+@pytest.mark.parametrize("buffer_size", [None, 1, 7, 100, 1024 * 1024])
+def test_read_chunked(multisample_vcf, buffer_size):
+    expected = list(map(str, Reader.from_stream(io.StringIO(multisample_vcf), buffer_size=None)))
+    reader = Reader.from_stream(io.StringIO(multisample_vcf), buffer_size=buffer_size)
+    assert reader.header.samples.names == ["NA00001", "NA00002", "NA00003"]
+    assert list(map(str, reader)) == expected
+    assert len(expected) == 5
+
+
+@pytest.mark.parametrize("buffer_size", [1, 3, 1024])
+def test_read_chunked_no_trailing_newline(multisample_vcf, buffer_size):
+    stream = io.StringIO(multisample_vcf.rstrip("\n"))
+    records = list(Reader.from_stream(stream, buffer_size=buffer_size))
+    assert len(records) == 5
+    assert records[-1].POS == 1234567
+
+
+def test_read_raw_lines_chunked(multisample_vcf):
+    reader = Reader.from_stream(io.StringIO(multisample_vcf), buffer_size=10)
+    lines = reader.parser.read_raw_lines(2)
+    assert [line.split("\t")[1] for line in lines] == ["14370", "17330"]
+    assert not any(line.endswith("\n") for line in lines)
+    assert len(reader.parser.read_raw_lines(10)) == 3
+    assert reader.parser.read_raw_lines(10) == []
+
+
+class NoReadStream(io.StringIO):
+    """Stream that fails on reading chunks, as these would block on pipes"""
+
+    def read(self, size=-1):
+        raise AssertionError("read() called")
+
+
+def test_read_lines_by_default(multisample_vcf):
+    reader = Reader.from_stream(NoReadStream(multisample_vcf))
+    assert reader.buffer_size is None
+    assert next(reader).POS == 14370
+    assert len(list(reader)) == 4
@@ -4,6 +4,8 @@
 
 import pytest
 
+from vcfpy import exceptions
+from vcfpy import field_values
 from vcfpy import header
 from vcfpy import parser
 
@@ -107,3 +109,62 @@ def test_parse_field_value_string_more_empty(number):
     EXPECTED = []
     RESULT = parser.parse_field_value(header.FieldInfo("String", number), ".")
     assert EXPECTED == RESULT
+
+
+# field_values.field_value_decoder() ------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "field_info,value",
+    [
+        (header.FieldInfo("Integer", 1), "42"),
+        (header.FieldInfo("Integer", 1), "."),
+        (header.FieldInfo("Integer", "A"), "42,.,43"),
+        (header.FieldInfo("Integer", "R"), "."),
+        (header.FieldInfo("Float", 1), "0.5"),
+        (header.FieldInfo("Float", "G"), "0.5,1e3"),
+        (header.FieldInfo("String", 1), "a%3Ab"),
+        (header.FieldInfo("String", "."), "a,b%2Cc"),
+        (header.FieldInfo("Character", 2), "a,."),
+        (header.FieldInfo("Flag", 0), True),
+        (header.FieldInfo("String", 1, id_="FT"), "PASS;.;q10"),
+    ],
+)
+def test_field_value_decoder(field_info, value):
+    EXPECTED = parser.parse_field_value(field_info, value)
+    RESULT = field_values.field_value_decoder(field_info)(value)
+    assert EXPECTED == RESULT
+
+
+def test_field_value_decoder_invalid():
+    decode = field_values.field_value_decoder(header.FieldInfo("Integer", 1))
+    with pytest.warns(exceptions.CannotConvertValue):
+        RESULT = decode("x")
+    assert "x" == RESULT
+
+
+def test_format_decoder_compiled_once():
+    lines = [
+        "20\t1\t.\tC\tT\t.\t.\t.\tGT:DP\t0/1:3",
+        "20\t2\t.\tC\tT\t.\t.\t.\tGT:DP\t1/1:.",
+        "20\t3\t.\tC\tT\t.\t.\t.\tGT\t0/0",
+    ]
+    hdr = header.Header(
+        [
+            header.FormatHeaderLine.from_mapping(
+                {"ID": "GT", "Number": 1, "Type": "String", "Description": "Genotype"}
+            ),
+            header.FormatHeaderLine.from_mapping(
+                {"ID": "DP", "Number": 1, "Type": "Integer", "Description": "Depth"}
+            ),
+        ],
+        header.SamplesInfos(["NA00001"]),
+    )
+    record_parser = parser.RecordParser(hdr, hdr.samples)
+    records = list(map(record_parser.parse_line, lines))
+    assert [r.calls[0].data for r in records] == [
+        {"GT": "0/1", "DP": 3},
+        {"GT": "1/1", "DP": None},
+        {"GT": "0/0"},
+    ]
+    assert sorted(record_parser._format_decoders) == ["GT", "GT:DP"]
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Tests for the cached checks of FILTER and FORMAT/FT values
+"""
+
+import io
+import textwrap
+
+from vcfpy import exceptions
+from vcfpy import parser
+from vcfpy import warn_utils
+
+MEDIUM_HEADER = """
+##fileformat=VCFv4.3
+##FILTER=<ID=q10,Description="Quality below 10">
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##FORMAT=<ID=FT,Number=1,Type=String,Description="Sample filter">
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tNA00001
+""".lstrip()
+
+LINES = [
+    "20\t1\t.\tG\tA\t.\tPASS\t.\tGT:FT\t0/1:PASS\n",
+    "20\t2\t.\tG\tA\t.\tq10;xx\t.\tGT:FT\t0/1:yy\n",
+    "20\t3\t.\tG\tA\t.\tq10;xx\t.\tGT:FT\t0/1:q10;yy\n",
+    "20\t4\t.\tG\tA\t.\t.\t.\tGT:FT\t0/1:.\n",
+]
+
+
+def parse(**kwargs):
+    stream = io.StringIO(MEDIUM_HEADER + "".join(LINES))
+    diagnostics = warn_utils.Diagnostics(warn=False)
+    p = parser.Parser(stream, "<builtin>", diagnostics=diagnostics, **kwargs)
+    p.parse_header()
+    records = list(p.parse_lines(list(LINES)))
+    return p, records
+
+
+def test_check_filters_reports_each_occurrence():
+    p, records = parse()
+    assert [r.FILTER for r in records] == [["PASS"], ["q10", "xx"], ["q10", "xx"], []]
+    counts = p.diagnostics.counts
+    assert counts[(exceptions.UnknownFilter, "xx")] == 2
+    assert counts[(exceptions.UnknownFilter, "yy")] == 2
+    assert (exceptions.UnknownFilter, "q10") not in counts
+    assert (exceptions.UnknownFilter, "PASS") not in counts
+
+
+def test_check_filters_cached_by_raw_value():
+    p, _ = parse()
+    record_parser = p._record_parser
+    assert record_parser._unknown_filters == {
+        "PASS": (),
+        "q10;xx": ("xx",),
+        "yy": ("yy",),
+        "q10;yy": ("yy",),
+    }
+
+
+def test_check_filters_ft_raw_value(monkeypatch):
+    lines = [
+        "20\t1\t.\tG\tA\t.\tPASS\t.\tFT:GT\tq10;yy:0/1\n",
+        "20\t2\t.\tG\tA\t.\tPASS\t.\tGT:FT\t0/1\n",
+    ]
+    stream = io.StringIO(MEDIUM_HEADER + "".join(lines))
+    p = parser.Parser(stream, "<builtin>", diagnostics=warn_utils.Diagnostics(warn=False))
+    p.parse_header()
+    checked = []
+    check_filters = p._record_parser._check_filters
+    monkeypatch.setattr(
+        p._record_parser,
+        "_check_filters",
+        lambda filt_str, *args: checked.append(filt_str) or check_filters(filt_str, *args),
+    )
+    records = list(p.parse_lines(lines))
+    assert records[0].calls[0].data["FT"] == ["q10", "yy"]
+    assert checked == ["PASS", "q10;yy", "PASS"]
+    assert p.diagnostics.counts == {(exceptions.UnknownFilter, "yy"): 1}
+
+
+def test_check_filters_disabled():
+    p, records = parse(check_filters=False)
+    assert [r.FILTER for r in records] == [["PASS"], ["q10", "xx"], ["q10", "xx"], []]
+    assert [r.calls[0].data["FT"] for r in records] == [["PASS"], ["yy"], ["q10", "yy"], []]
+    assert not p.diagnostics.counts
+    assert not p._record_parser._unknown_filters
+
+
+def test_check_filters_summary():
+    p, _ = parse()
+    out = io.StringIO()
+    p.print_warn_summary(out)
+    EXPECTED = textwrap.dedent(
+        """
+        Problems found while parsing:
+          UnknownFilter xx: 2 occurrences
+            Filter not found in header: xx; problem in FILTER column
+            Filter not found in header: xx; problem in FILTER column
+          UnknownFilter yy: 2 occurrences
+            Filter not found in header: yy; problem in FORMAT/FT column of sample NA00001
+            Filter not found in header: yy; problem in FORMAT/FT column of sample NA00001
+        """
+    ).lstrip()
+    assert out.getvalue() == EXPECTED
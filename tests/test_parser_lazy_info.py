@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Test lazy decoding of the INFO column
+"""
+
+import io
+import pickle
+import textwrap
+
+from vcfpy import Reader, Writer
+from vcfpy import record
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+VCF = textwrap.dedent(
+    """
+    ##fileformat=VCFv4.3
+    ##contig=<ID=20,length=62435964>
+    ##INFO=<ID=DP,Number=1,Type=Integer,Description="Total Depth">
+    ##INFO=<ID=AF,Number=A,Type=Float,Description="Allele Frequency">
+    ##INFO=<ID=DB,Number=0,Type=Flag,Description="dbSNP membership">
+    ##INFO=<ID=ANNO,Number=.,Type=String,Description="Annotation">
+    ##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+    #CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tNA00001
+    20\t14370\t.\tG\tA,T\t29\t.\tDP=14;AF=0.50,0.25;DB;ANNO=x%3By,z\tGT\t0/1
+    20\t17330\t.\tT\tA\t3\t.\t.\tGT\t0/0
+    """
+).lstrip()
+
+
+def read_records(lazy_info):
+    with Reader.from_stream(io.StringIO(VCF), lazy_info=lazy_info) as reader:
+        return list(reader)
+
+
+def write_records(records):
+    reader = Reader.from_stream(io.StringIO(VCF))
+    out = io.StringIO()
+    writer = Writer.from_stream(out, reader.header)
+    for rec in records:
+        writer.write_record(rec)
+    return out.getvalue().splitlines()[-len(records) :]
+
+
+def test_lazy_info_values():
+    records = read_records(lazy_info=True)
+    info = records[0].INFO
+    assert isinstance(info, record.LazyInfo)
+    assert list(info.keys()) == ["DP", "AF", "DB", "ANNO"]
+    assert not info.is_decoded("AF")
+    assert info["AF"] == [0.5, 0.25]
+    assert info.is_decoded("AF")
+    assert not info.is_decoded("DP")
+    assert info["DP"] == 14
+    assert info["DB"] is True
+    assert info["ANNO"] == ["x;y", "z"]
+    assert "FOO" not in info
+    assert len(records[1].INFO) == 0
+
+
+def test_lazy_info_equals_eager():
+    lazy = read_records(lazy_info=True)
+    eager = read_records(lazy_info=False)
+    assert lazy[0].INFO == eager[0].INFO
+    assert str(lazy[0].INFO) == str(eager[0].INFO)
+    assert lazy[1].INFO == eager[1].INFO
+
+
+def test_lazy_info_write_pristine_verbatim():
+    records = read_records(lazy_info=True)
+    lines = write_records(records)
+    assert lines[0].split("\t")[7] == "DP=14;AF=0.50,0.25;DB;ANNO=x%3By,z"
+    assert lines[1].split("\t")[7] == "."
+
+
+def test_lazy_info_write_accessed_and_modified():
+    records = read_records(lazy_info=True)
+    info = records[0].INFO
+    assert info["AF"] == [0.5, 0.25]
+    info["DP"] = 20
+    del info["DB"]
+    info["NEW"] = ["a"]
+    assert info.modified
+    lines = write_records(records)
+    assert lines[0].split("\t")[7] == "DP=20;AF=0.5,0.25;ANNO=x%3By,z;NEW=a"
+
+
+def test_lazy_info_pickle():
+    records = read_records(lazy_info=True)
+    assert records[0].INFO["AF"] == [0.5, 0.25]
+    del records[0].INFO["DB"]
+    restored = pickle.loads(pickle.dumps(records))
+    assert isinstance(restored[0].INFO, record.LazyInfo)
+    assert restored[0].INFO == {"DP": 14, "AF": [0.5, 0.25], "ANNO": ["x;y", "z"]}
+    assert len(restored[1].INFO) == 0
+    assert not records[0].INFO.is_decoded("DP")
+    assert write_records(restored) == write_records(records)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Tests for the INFO and FORMAT cardinality checks
+"""
+
+import io
+
+import pytest
+
+from vcfpy import Reader, Diagnostics, exceptions, parser
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+CHECKS_VCF = (
+    "##fileformat=VCFv4.3\n"
+    '##INFO=<ID=AC,Number=A,Type=Integer,Description="Allele count">\n'
+    '##INFO=<ID=AD,Number=R,Type=Integer,Description="Allelic depths">\n'
+    '##INFO=<ID=GL,Number=G,Type=Float,Description="Genotype likelihoods">\n'
+    '##INFO=<ID=XY,Number=2,Type=Integer,Description="Pair">\n'
+    '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'
+    '##FORMAT=<ID=FT,Number=1,Type=String,Description="Sample filter">\n'
+    '##FORMAT=<ID=AD,Number=R,Type=Integer,Description="Allelic depths">\n'
+    '##FORMAT=<ID=HQ,Number=.,Type=Integer,Description="Haplotype qualities">\n'
+    '##FORMAT=<ID=PL,Number=G,Type=Integer,Description="Genotype likelihoods">\n'
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tNA00001\tNA00002\n"
+    "20\t100\t.\tC\tT\t.\tPASS\tAC=1;AD=5,3;GL=1,2,3;XY=1,2\t"
+    "GT:FT:AD:HQ\t0/1:PASS:5,3:1,2,3\t./.:.:.:.\n"
+    "20\t200\t.\tC\tT,G\t.\tPASS\tAC=1;AD=5,3;GL=1,2,3;XY=1\t"
+    "GT:FT:AD\t0/1:PASS:5,3\t0/2:PASS:5,0,3\n"
+    "20\t300\t.\tC\tT\t.\tPASS\t.\tGT:PL\t0/1:0,10,20\t1:0,10\n"
+    "20\t400\t.\tC\tT\t.\tPASS\t.\tGT:PL\t0/1:0,10\t1:0,10,20\n"
+    "20\t500\t.\tC\tT\t.\tPASS\t.\tAD:PL\t5,3:0,10,20\t5:0,10\n"
+)
+
+
+@pytest.mark.parametrize(
+    "number,num_alts,ploidy,expected",
+    [
+        (".", 2, 2, None),
+        (1, 2, 2, 1),
+        (3, 2, 2, 3),
+        ("A", 2, 2, 2),
+        ("R", 2, 2, 3),
+        ("G", 1, 2, 3),
+        ("G", 2, 2, 6),
+        ("G", 1, 1, 2),
+        ("G", 1, 3, 4),
+    ],
+)
+def test_expected_count(number, num_alts, ploidy, expected):
+    assert parser.expected_count(number, num_alts, ploidy) == expected
+
+
+def read_counts(record_checks):
+    diagnostics = Diagnostics(warn=False)
+    reader = Reader.from_stream(
+        io.StringIO(CHECKS_VCF), record_checks=record_checks, diagnostics=diagnostics
+    )
+    records = list(reader)
+    assert len(records) == 5
+    return diagnostics.counts
+
+
+def test_info_checks():
+    assert read_counts(["INFO"]) == {
+        (exceptions.IncorrectListLength, "AC"): 1,
+        (exceptions.IncorrectListLength, "AD"): 1,
+        (exceptions.IncorrectListLength, "GL"): 1,
+        (exceptions.IncorrectListLength, "XY"): 1,
+    }
+
+
+def test_format_checks():
+    assert read_counts(["FORMAT"]) == {
+        (exceptions.IncorrectListLength, "AD"): 2,
+        (exceptions.IncorrectListLength, "PL"): 2,
+    }
+
+
+def test_no_checks():
+    assert read_counts([]) == {}
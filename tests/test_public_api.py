@@ -31,8 +31,11 @@ def test_from_header():
 
 def test_from_record():
     assert vcfpy.Record
+    assert vcfpy.LazyInfo
+    assert vcfpy.LazyCalls
     assert vcfpy.UnparsedCall
     assert vcfpy.Call
+    assert vcfpy.Genotype
     assert vcfpy.AltRecord
     assert vcfpy.Substitution
     assert vcfpy.SV
@@ -58,7 +61,16 @@ def test_record_constants():
 
 def test_from_reader():
     assert vcfpy.Reader
+    assert vcfpy.ParallelReader
 
 
 def test_from_writer():
     assert vcfpy.Writer
+
+
+def test_from_arrays():
+    assert vcfpy.GenotypeArrays
+
+
+def test_from_warn_utils():
+    assert vcfpy.Diagnostics
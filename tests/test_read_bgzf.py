@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Test reading of BGZF files
+"""
+
+import gzip
+import io
+import os
+
+import pytest
+
+from vcfpy import bgzf
+from vcfpy import reader
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+def write_bgzf(data):
+    """Return BGZF-compressed ``data`` with one block per 64 KiB"""
+    f = io.BytesIO()
+    w = bgzf.BgzfWriter(fileobj=f, mode="wb")
+    w.write(data)
+    w.flush()
+    f.write(bgzf._bgzf_eof)
+    return f.getvalue()
+
+
+LINES = b"".join(b"line %d \xc3\xa4\n" % i for i in range(20000))
+
+
+def test_read_sequential():
+    r = bgzf.BgzfReader(fileobj=io.BytesIO(write_bgzf(LINES)))
+    lines = list(r)
+    assert len(lines) == 20000
+    assert lines[0] == "line 0 ä\n"
+    assert "".join(lines) == LINES.decode("utf-8")
+    assert r.readline() == ""
+    assert r.read() == ""
+
+
+def test_read_truncated_utf8():
+    data = write_bgzf(b"line \xc3\xa4\nline \xc3")
+    r = bgzf.BgzfReader(fileobj=io.BytesIO(data))
+    assert r.readline() == "line \u00e4\n"
+    with pytest.raises(UnicodeDecodeError):
+        r.readline()
+    r = bgzf.BgzfReader(fileobj=io.BytesIO(data))
+    assert r.read(14) == "line \u00e4\nline "
+    with pytest.raises(UnicodeDecodeError):
+        r.read(100)
+
+
+def test_read_binary():
+    r = bgzf.BgzfReader(fileobj=io.BytesIO(write_bgzf(LINES)), mode="rb")
+    assert r.read(5) == b"line "
+    assert r.readline() == b"0 \xc3\xa4\n"
+    assert r.read(100000) == LINES[10:100010]
+    assert r.read() == LINES[100010:]
+    assert r.read(10) == b""
+
+
+def test_seek_tell():
+    r = bgzf.BgzfReader(fileobj=io.BytesIO(write_bgzf(LINES)), max_cache=2)
+    offsets = []
+    while True:
+        offsets.append(r.tell())
+        if not r.readline():
+            break
+    assert len(set(offsets)) == 20001
+    assert len({bgzf.split_virtual_offset(o)[0] for o in offsets}) > 3
+    for i in (15000, 3, 19999, 7000):
+        r.seek(offsets[i])
+        assert r.readline() == "line %d ä\n" % i
+        assert r.tell() == offsets[i + 1]
+    assert len(r._buffers) == 2
+
+
+def test_block_cache_hit():
+    handle = io.BytesIO(write_bgzf(LINES))
+    r = bgzf.BgzfReader(fileobj=handle, mode="rb")
+    r.read(70000)
+    offset = r.tell()
+    r.read(70000)
+    # drop the compressed data, only the cache can deliver the blocks now
+    handle.seek(0)
+    handle.truncate()
+    r.seek(offset)
+    assert r.read(70000) == LINES[70000:140000]
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        bgzf.BgzfReader(filename="out.gz", mode="w")
+
+
+def test_is_bgzf_file(tmpdir):
+    path = os.path.join(os.path.dirname(__file__), "vcfs", "multi_contig.vcf.gz")
+    assert bgzf.is_bgzf_file(path)
+    gzip_path = str(tmpdir.join("plain.vcf.gz"))
+    with gzip.open(gzip_path, "wb") as f:
+        f.write(LINES)
+    assert not bgzf.is_bgzf_file(gzip_path)
+
+
+def test_reader_uses_bgzf_reader():
+    path = os.path.join(os.path.dirname(__file__), "vcfs", "multi_contig.vcf.gz")
+    with reader.Reader.from_path(path) as r:
+        assert isinstance(r.stream, bgzf.BgzfReader)
+        records = list(r)
+    with reader.Reader.from_path(path[: -len(".gz")]) as r:
+        expected = list(r)
+    assert list(map(str, records)) == list(map(str, expected))
+
+
+def test_reader_plain_gzip(tmpdir):
+    path = os.path.join(os.path.dirname(__file__), "vcfs", "full_vcf43.vcf")
+    gzip_path = str(tmpdir.join("plain.vcf.gz"))
+    with open(path, "rb") as inf, gzip.open(gzip_path, "wb") as outf:
+        outf.write(inf.read())
+    with reader.Reader.from_path(gzip_path) as r:
+        assert not isinstance(r.stream, bgzf.BgzfReader)
+        assert len(list(r)) == 5
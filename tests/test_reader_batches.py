@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Tests for reading records in batches"""
+
+import os
+
+import pytest
+
+from vcfpy import Reader, Record
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+def test_iter_batches(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        batches = list(reader.iter_batches(2))
+    with Reader.from_path(multisample_vcf_file) as reader:
+        expected = list(reader)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    records = [record for batch in batches for record in batch]
+    assert all(isinstance(record, Record) for record in records)
+    assert list(map(str, records)) == list(map(str, expected))
+
+
+def test_iter_batches_mixed_with_next(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        first = next(reader)
+        batches = list(reader.iter_batches(10))
+    assert first.POS == 14370
+    assert len(batches) == 1
+    assert [record.POS for record in batches[0]] == [17330, 1110696, 1230237, 1234567]
+
+
+def test_iter_batches_fetch():
+    path = os.path.join(os.path.dirname(__file__), "vcfs", "multi_contig.vcf.gz")
+    with Reader.from_path(path) as reader:
+        batches = list(reader.fetch("20", 1110695, 1234568).iter_batches(1))
+    assert [[record.POS for record in batch] for batch in batches] == [[1110696], [1230237], [1234567]]
+
+
+def test_iter_batches_invalid_size(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        with pytest.raises(ValueError):
+            next(reader.iter_batches(0))
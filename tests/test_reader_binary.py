@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Tests for parsing records from binary streams"""
+
+import io
+import os
+
+import pytest
+
+from vcfpy import Reader, Writer, Call, LazyCalls, LazyInfo, exceptions
+
+
+def vcf_path(name):
+    return os.path.join(os.path.dirname(__file__), "vcfs", name)
+
+
+@pytest.mark.parametrize("name", ["full_vcf43.vcf", "full_vcf43.vcf.gz", "multi_contig.vcf.gz"])
+@pytest.mark.parametrize("lazy", [False, True])
+def test_read_binary(name, lazy):
+    with Reader.from_path(vcf_path(name)) as reader:
+        expected_header = reader.header
+        expected = list(map(str, reader))
+    with Reader.from_path(vcf_path(name), binary=True, lazy_info=lazy, lazy_calls=lazy) as reader:
+        assert reader.header == expected_header
+        records = list(reader)
+    assert list(map(str, records)) == expected
+
+
+def test_read_binary_lazy_raw_bytes():
+    path = vcf_path("full_vcf43.vcf")
+    with Reader.from_path(path, binary=True, lazy_info=True, lazy_calls=True) as reader:
+        record = next(reader)
+    assert record.CHROM == "20"
+    assert record.ID == ["rs6054257"]
+    assert isinstance(record.INFO, LazyInfo)
+    assert isinstance(record.INFO.raw, bytes)
+    assert record.INFO["DP"] == 14
+    assert isinstance(record.calls, LazyCalls)
+    assert isinstance(record.calls.raw, bytes)
+    call = record.call_for_sample["NA00002"]
+    assert isinstance(call, Call)
+    assert call.data["GT"] == "1|0"
+    assert call.data["HQ"] == [51, 51]
+
+
+@pytest.mark.parametrize("buffer_size", [None, 5])
+def test_read_binary_stream(multisample_vcf, buffer_size):
+    expected = list(map(str, Reader.from_stream(io.StringIO(multisample_vcf))))
+    stream = io.BytesIO(multisample_vcf.encode())
+    reader = Reader.from_stream(stream, buffer_size=buffer_size)
+    assert reader.header.samples.names == ["NA00001", "NA00002", "NA00003"]
+    assert list(map(str, reader)) == expected
+
+
+def test_read_binary_invalid_field_count(multisample_vcf):
+    stream = io.BytesIO(multisample_vcf.replace("GT\t0/0\t1/0\t1/1", "GT\t0/0\t1/0").encode())
+    reader = Reader.from_stream(stream, lazy_calls=True)
+    with pytest.raises(exceptions.InvalidRecordException):
+        next(reader)
+
+
+def test_read_binary_fetch():
+    with Reader.from_path(vcf_path("multi_contig.vcf.gz"), binary=True) as reader:
+        records = list(reader.fetch("20", 1110697, 1234568))
+    assert [record.POS for record in records] == [1230237, 1234567]
+
+
+def test_write_binary_lazy_verbatim(tmpdir, multisample_vcf_file):
+    out_path = str(tmpdir.mkdir("output").join("output.vcf"))
+    with Reader.from_path(
+        multisample_vcf_file, binary=True, lazy_info=True, lazy_calls=True
+    ) as reader:
+        with Writer.from_path(out_path, reader.header) as writer:
+            for i, record in enumerate(reader):
+                if i == 1:
+                    record.call_for_sample["NA00001"].data["GT"] = "1/1"
+                writer.write_record(record)
+    with open(multisample_vcf_file, "rt") as inf, open(out_path, "rt") as outf:
+        expected = inf.read().replace("GT\t0/0\t0/1\t0/0", "GT\t1/1\t0/1\t0/0")
+        assert expected == outf.read()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Tests for reading call information into NumPy arrays"""
+
+import io
+import math
+import textwrap
+
+import pytest
+
+from vcfpy import Reader
+from vcfpy import arrays
+from vcfpy import exceptions
+from vcfpy.warn_utils import Diagnostics
+
+numpy = pytest.importorskip("numpy")
+
+
+VCF = textwrap.dedent(
+    """
+    ##fileformat=VCFv4.3
+    ##contig=<ID=20,length=62435964>
+    ##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+    ##FORMAT=<ID=DP,Number=1,Type=Integer,Description="Read depth">
+    ##FORMAT=<ID=AD,Number=R,Type=Integer,Description="Allelic depths">
+    ##FORMAT=<ID=GL,Number=G,Type=Float,Description="Genotype likelihoods">
+    ##FORMAT=<ID=FT,Number=1,Type=String,Description="Filters">
+    #CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tNA00001\tNA00002\tNA00003
+    20\t14370\t.\tG\tA\t29\t.\t.\tGT:DP:AD\t0/0:10:10,0\t1|0:8:4,4\t./.:.:.
+    20\t17330\t.\tT\tA,C\t3\t.\t.\tGT:AD:DP\t1/2:0,3,4:7\t0/1/1:5,5,0:10\t1:.
+    20\t17331\t.\tT\t.\t3\t.\t.\tGT:GL\t0/0:-0.1,-1,-2\t0/0\t0/0:.
+    """
+).lstrip()
+
+
+def test_read_genotype_arrays_gt(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        batch = reader.read_genotype_arrays(10)
+    assert len(batch) == 5
+    assert batch.samples == ["NA00001", "NA00002", "NA00003"]
+    assert batch.CHROM == ["20"] * 5
+    assert batch.POS.tolist() == [14370, 17330, 1110696, 1230237, 1234567]
+    assert batch.ALT[2] == ["G", "T"]
+    assert batch.gt.dtype == numpy.int8
+    assert batch.gt.shape == (5, 3, 2)
+    assert batch.gt[0].tolist() == [[0, 0], [1, 0], [1, 1]]
+    assert batch.gt[2].tolist() == [[1, 2], [2, 1], [2, 2]]
+    assert not batch.phased.any()
+    assert batch.is_called().all()
+
+
+def test_read_genotype_arrays_batches(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        batches = []
+        while True:
+            batch = reader.read_genotype_arrays(2)
+            if batch is None:
+                break
+            batches.append(batch)
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert batches[-1].POS.tolist() == [1234567]
+
+
+def test_read_genotype_arrays_fields():
+    reader = Reader.from_stream(io.StringIO(VCF))
+    batch = reader.read_genotype_arrays(10, fields=("GT", "DP", "AD", "GL"))
+    # GT, padded to largest ploidy
+    M, P = arrays.GT_MISSING, arrays.GT_PADDING
+    assert batch.gt.shape == (3, 3, 3)
+    assert batch.gt[0].tolist() == [[0, 0, P], [1, 0, P], [M, M, P]]
+    assert batch.gt[1].tolist() == [[1, 2, P], [0, 1, 1], [1, P, P]]
+    assert batch.phased.tolist() == [[False, True, False], [False] * 3, [False] * 3]
+    assert batch.is_called().tolist() == [[True, True, False], [True] * 3, [True] * 3]
+    # Number=1 Integer
+    I = arrays.INT_MISSING
+    assert batch.fields["DP"].dtype == numpy.int32
+    assert batch.fields["DP"].tolist() == [[10, 8, I], [7, 10, I], [I, I, I]]
+    # Number=R Integer, padded to largest number of values
+    assert batch.fields["AD"].shape == (3, 3, 3)
+    assert batch.fields["AD"][0].tolist() == [[10, 0, I], [4, 4, I], [I, I, I]]
+    assert batch.fields["AD"][1].tolist() == [[0, 3, 4], [5, 5, 0], [I, I, I]]
+    # Number=G Float
+    gl = batch.fields["GL"]
+    assert gl.dtype == numpy.float32
+    assert gl.shape == (3, 3, 3)
+    assert gl[2, 0].tolist() == pytest.approx([-0.1, -1, -2])
+    assert all(math.isnan(x) for x in gl[2, 1].tolist())
+    assert all(math.isnan(x) for x in gl[0].ravel().tolist())
+
+
+def test_read_genotype_arrays_explicit_ploidy():
+    reader = Reader.from_stream(io.StringIO(VCF))
+    batch = reader.read_genotype_arrays(10, ploidy=2)
+    assert batch.gt.shape == (3, 3, 2)
+    assert batch.gt[1, 1].tolist() == [0, 1]
+
+
+def test_read_genotype_arrays_string_field():
+    reader = Reader.from_stream(io.StringIO(VCF))
+    with pytest.raises(exceptions.VCFPyException):
+        reader.read_genotype_arrays(10, fields=("FT",))
+
+
+def test_read_genotype_arrays_large_allele_numbers():
+    lines = VCF.splitlines(True)
+    lines[-1] = "20\t17332\t.\tT\tA\t3\t.\t.\tGT\t0/130\t0/1\t70000|1\n"
+    reader = Reader.from_stream(io.StringIO("".join(lines)))
+    first, second = reader.read_genotype_arrays(2), reader.read_genotype_arrays(2)
+    assert first.gt.dtype == numpy.int8
+    assert second.gt.dtype == numpy.int32
+    assert second.gt[0].tolist() == [[0, 130], [0, 1], [70000, 1]]
+    assert second.phased[0].tolist() == [False, False, True]
+
+
+def test_read_genotype_arrays_diagnostics(recwarn):
+    diagnostics = Diagnostics(warn=False)
+    vcf = VCF.replace("1|0:8:", "1|0:x:").replace(":10\t", ":y\t")
+    reader = Reader.from_stream(io.StringIO(vcf), diagnostics=diagnostics)
+    batch = reader.read_genotype_arrays(10, fields=("DP",))
+    assert batch.fields["DP"][:, 1].tolist() == [arrays.INT_MISSING] * 3
+    assert diagnostics.counts == {(exceptions.CannotConvertValue, "Integer"): 2}
+    assert list(recwarn) == []
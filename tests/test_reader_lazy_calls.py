@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Tests for reading with building calls only on access"""
+
+import io
+import os
+import pickle
+
+import pytest
+
+from vcfpy import Reader, Writer, Header, SamplesInfos, Call, UnparsedCall, LazyCalls
+from vcfpy import exceptions
+
+
+def test_reading_lazy_calls(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file, lazy_calls=True) as reader:
+        records = list(reader)
+    with Reader.from_path(multisample_vcf_file) as reader:
+        expected = list(reader)
+    assert len(records) == 5
+    calls = records[0].calls
+    assert isinstance(calls, LazyCalls)
+    assert len(calls) == 3
+    assert not calls.any_materialized()
+    call = records[0].call_for_sample["NA00002"]
+    assert isinstance(call, Call)
+    assert call.data["GT"] == "1/0"
+    assert call.site is records[0]
+    assert calls.is_materialized(1)
+    assert not calls.is_materialized(0)
+    assert calls[1] is call
+    assert calls[-1].data["GT"] == "1/1"
+    assert [c.sample for c in records[0]] == ["NA00001", "NA00002", "NA00003"]
+    assert set(records[0].call_for_sample.keys()) == {"NA00001", "NA00002", "NA00003"}
+    assert list(map(str, records)) == list(map(str, expected))
+
+
+def test_reading_lazy_calls_parse_subset(multisample_vcf_file):
+    with Reader.from_path(
+        multisample_vcf_file, parsed_samples=["NA00001"], lazy_calls=True
+    ) as reader:
+        records = list(reader)
+    assert isinstance(records[0].call_for_sample["NA00001"], Call)
+    assert isinstance(records[0].call_for_sample["NA00002"], UnparsedCall)
+
+
+def test_reading_lazy_calls_invalid_field_count(multisample_vcf):
+    stream = io.StringIO(multisample_vcf.replace("GT\t0/0\t1/0\t1/1", "GT\t0/0\t1/0"))
+    reader = Reader.from_stream(stream, lazy_calls=True)
+    with pytest.raises(exceptions.InvalidRecordException):
+        next(reader)
+
+
+def test_write_lazy_calls_verbatim(tmpdir, multisample_vcf_file):
+    out_path = str(tmpdir.mkdir("output").join("output.vcf"))
+    with Reader.from_path(multisample_vcf_file, lazy_calls=True) as reader:
+        with Writer.from_path(out_path, reader.header) as writer:
+            for i, record in enumerate(reader):
+                if i == 1:
+                    record.call_for_sample["NA00001"].data["GT"] = "1/1"
+                writer.write_record(record)
+    with open(multisample_vcf_file, "rt") as inf, open(out_path, "rt") as outf:
+        expected = inf.read().replace("GT\t0/0\t0/1\t0/0", "GT\t1/1\t0/1\t0/0")
+        assert expected == outf.read()
+
+
+def test_write_lazy_calls_reordered(tmpdir, multisample_vcf_file, multisample_vcf_reordered):
+    out_path = str(tmpdir.mkdir("output").join("output.vcf"))
+    with Reader.from_path(multisample_vcf_file, lazy_calls=True) as reader:
+        samples = SamplesInfos(["NA00002", "NA00003", "NA00001"])
+        header = Header(reader.header.lines, samples)
+        with Writer.from_path(out_path, header) as writer:
+            for i, record in enumerate(reader):
+                if i == 0:
+                    assert record.calls[2].data["GT"] == "1/1"
+                writer.write_record(record)
+    with open(out_path, "rt") as outf:
+        assert multisample_vcf_reordered == outf.read()
+
+
+def write_with_changed_format(out_path, lazy_calls):
+    path = os.path.join(os.path.dirname(__file__), "vcfs", "full_vcf43.vcf")
+    with Reader.from_path(path, lazy_calls=lazy_calls) as reader:
+        with Writer.from_path(out_path, reader.header) as writer:
+            for i, record in enumerate(reader):
+                if i == 0:
+                    record.FORMAT = ["GT", "DP"]
+                elif i == 1:
+                    record.FORMAT.remove("HQ")
+                writer.write_record(record)
+    with open(out_path, "rt") as outf:
+        return outf.read()
+
+
+def test_write_lazy_calls_changed_format(tmpdir):
+    output = tmpdir.mkdir("output")
+    result = write_with_changed_format(str(output.join("lazy.vcf")), True)
+    assert result == write_with_changed_format(str(output.join("eager.vcf")), False)
+    lines = [line for line in result.splitlines() if not line.startswith("#")]
+    assert lines[0].split("\t")[8:] == ["GT:DP", "0|0:1", "1|0:8", "1/1:5"]
+    assert lines[1].split("\t")[8:] == ["GT:GQ:DP", "0|0:49:3", "0|1:3:5", "0/0:41:3"]
+
+
+def test_pickle_lazy_calls(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file, lazy_calls=True) as reader:
+        records = list(reader)
+    with Reader.from_path(multisample_vcf_file) as reader:
+        expected = list(reader)
+    assert records[0].calls[1].data["GT"] == "1/0"
+    restored = pickle.loads(pickle.dumps(records))
+    assert isinstance(restored[0].calls, LazyCalls)
+    assert not records[0].calls.is_materialized(0)
+    assert [c.data for c in restored[0].calls] == [c.data for c in expected[0].calls]
+    assert restored[0].calls[0].site is restored[0]
+    assert restored[0].call_for_sample["NA00003"] is restored[0].calls[2]
+    assert list(map(str, restored)) == list(map(str, expected))
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Tests for parsing only the site columns"""
+
+import io
+import os
+
+import pytest
+
+from vcfpy import Reader, Writer, exceptions
+
+
+def vcf_path(name):
+    return os.path.join(os.path.dirname(__file__), "vcfs", name)
+
+
+@pytest.mark.parametrize("binary", [False, True])
+@pytest.mark.parametrize("lazy", [False, True])
+def test_read_sites_only(binary, lazy):
+    path = vcf_path("full_vcf43.vcf")
+    with Reader.from_path(path) as reader:
+        expected = list(reader)
+    with Reader.from_path(
+        path, sites_only=True, binary=binary, lazy_info=lazy, lazy_calls=lazy
+    ) as reader:
+        assert reader.header.samples.names == []
+        records = list(reader)
+    assert len(records) == len(expected)
+    for record, other in zip(records, expected):
+        assert (record.CHROM, record.POS, record.ID) == (other.CHROM, other.POS, other.ID)
+        assert (record.REF, record.ALT) == (other.REF, other.ALT)
+        assert (record.QUAL, record.FILTER) == (other.QUAL, other.FILTER)
+        assert dict(record.INFO) == dict(other.INFO)
+        assert not record.FORMAT
+        assert record.calls == []
+        assert dict(record.call_for_sample) == {}
+
+
+def test_read_sites_only_no_samples():
+    path = vcf_path("full_vcf43_no_samples.vcf")
+    with Reader.from_path(path) as reader:
+        expected = list(map(str, reader))
+    with Reader.from_path(path, sites_only=True) as reader:
+        assert list(map(str, reader)) == expected
+
+
+def test_read_sites_only_ignores_sample_columns(multisample_vcf):
+    stream = io.StringIO(multisample_vcf.replace("GT\t0/0\t1/0\t1/1", "GT\t0/0\t1/0"))
+    records = list(Reader.from_stream(stream, sites_only=True))
+    assert [record.POS for record in records] == [14370, 17330, 1110696, 1230237, 1234567]
+
+
+def test_read_sites_only_too_few_fields(multisample_vcf):
+    stream = io.StringIO(multisample_vcf.replace("A\t29\t.\t.\tGT\t0/0\t1/0\t1/1", "A\t29"))
+    reader = Reader.from_stream(stream, sites_only=True)
+    with pytest.raises(exceptions.InvalidRecordException):
+        next(reader)
+
+
+def test_write_sites_only(tmpdir, multisample_vcf_file):
+    out_path = str(tmpdir.mkdir("output").join("output.vcf"))
+    with Reader.from_path(multisample_vcf_file, sites_only=True) as reader:
+        with Writer.from_path(out_path, reader.header) as writer:
+            writer.write_records(reader)
+    with open(multisample_vcf_file, "rt") as inf, open(out_path, "rt") as outf:
+        expected = [line.split("\t")[:8] for line in inf.read().splitlines()]
+        expected = [arr[:7] + [arr[7].rstrip()] for arr in expected if not arr[0].startswith("##")]
+        assert expected[0][0] == "#CHROM"
+        lines = [line.split("\t") for line in outf.read().splitlines()]
+        assert [arr for arr in lines if not arr[0].startswith("##")] == expected
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Tests for the slotted record classes and the lazily built sample mapping"""
+
+import pickle
+
+import pytest
+
+from vcfpy import Reader, record
+
+
+def test_record_slots():
+    r = record.Record("20", 100, [], "C", [record.Substitution(record.SNV, "T")], None, [], {})
+    for obj in (r, r.ALT[0], record.Call("NA00001", {}), record.UnparsedCall("NA00001", "0/1")):
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        r.foo = 1
+
+
+def test_record_no_list_copies():
+    ids, alts = ["rs1"], [record.Substitution(record.SNV, "T")]
+    r = record.Record("20", 100, ids, "C", alts, None, [], {})
+    assert r.ID is ids
+    assert r.ALT is alts
+    r = record.Record("20", 100, ("rs1",), "C", (), None, [], {})
+    assert r.ID == ["rs1"]
+    assert r.ALT == []
+
+
+def test_call_for_sample_without_samples():
+    calls = [record.Call("NA00001", {"GT": "0/1"}), record.Call("NA00002", {"GT": "0/0"})]
+    r = record.Record("20", 100, [], "C", [], None, [], {}, ["GT"], calls)
+    assert r.call_for_sample == {"NA00001": calls[0], "NA00002": calls[1]}
+    r.call_for_sample = {}
+    assert r.call_for_sample == {}
+
+
+def test_call_for_sample_from_samples_infos(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        records = list(reader)
+    r = records[0]
+    assert isinstance(r.call_for_sample, record.LazyCallForSample)
+    assert r.call_for_sample is r.call_for_sample
+    assert list(r.call_for_sample) == ["NA00001", "NA00002", "NA00003"]
+    assert r.call_for_sample["NA00002"] is r.calls[1]
+    assert "NA00004" not in r.call_for_sample
+    assert dict(r.call_for_sample) == {call.sample: call for call in r.calls}
+
+
+def test_slotted_equality_and_pickle(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        records = list(reader)
+    alt = records[0].ALT[0]
+    assert alt == record.Substitution(alt.type, alt.value)
+    assert hash(alt) == hash(record.Substitution(alt.type, alt.value))
+    assert alt != record.Substitution(alt.type, "N")
+    restored = pickle.loads(pickle.dumps(records))
+    assert list(map(str, restored)) == list(map(str, records))
+    assert restored[0].ALT == records[0].ALT
+    assert restored[0].call_for_sample["NA00001"] is restored[0].calls[0]
+    assert restored[0].calls[0].site is restored[0]
+
+
+def test_call_ploidy_aliases():
+    call = record.Call("NA00001", {})
+    assert call.ploidy is None
+    call.plodity = 2
+    assert call.ploidy == 2
+    assert call.ploidty == 2
+
+
+def test_call_for_sample_after_reassigning_calls(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        records = list(reader)
+    r = records[0]
+    call_b, call_c = r.calls[1], r.calls[2]
+    assert r.call_for_sample["NA00002"] is call_b
+    r.calls = [call for call in r.calls if call.sample != "NA00001"]
+    assert r.call_for_sample["NA00002"] is call_b
+    assert r.call_for_sample["NA00003"] is call_c
+    with pytest.raises(KeyError):
+        r.call_for_sample["NA00001"]
+    assert list(r.call_for_sample) == ["NA00002", "NA00003"]
+
+
+def test_call_for_sample_after_modifying_calls(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        records = list(reader)
+    r = records[0]
+    call_a, call_c = r.calls[0], r.calls[2]
+    mapping = r.call_for_sample
+    del r.calls[1]
+    assert r.call_for_sample is mapping
+    assert r.call_for_sample["NA00001"] is call_a
+    assert r.call_for_sample["NA00003"] is call_c
+    assert "NA00002" not in r.call_for_sample
+    r.calls.reverse()
+    assert r.call_for_sample["NA00001"] is call_a
+    assert r.call_for_sample["NA00003"] is call_c
+
+
+def test_call_for_sample_miss_builds_no_calls(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file, lazy_calls=True) as reader:
+        r = next(reader)
+    assert "NA00004" not in r.call_for_sample
+    assert r.call_for_sample.get("NA00004") is None
+    assert "NA00002" in r.call_for_sample
+    assert not r.calls.any_materialized()
+
+
+def test_call_for_sample_miss_keeps_positions(multisample_vcf_file):
+    with Reader.from_path(multisample_vcf_file) as reader:
+        r = next(reader)
+    r.calls = r.calls[::-1]
+    mapping = r.call_for_sample
+    assert mapping["NA00001"] is r.calls[2]
+    positions = mapping._positions
+    assert "NA00004" not in mapping
+    assert mapping.get("NA00004") is None
+    assert mapping._positions is positions
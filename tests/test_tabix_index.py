@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Test reading TBI and CSI indices and fetching regions without pysam
+"""
+
+import io
+import os
+import random
+import shutil
+import textwrap
+
+import pytest
+
+import vcfpy
+from vcfpy import tabix
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+HEADER = textwrap.dedent(
+    """
+    ##fileformat=VCFv4.3
+    ##contig=<ID=1,length=10000000>
+    ##contig=<ID=chrUn:1,length=10000000>
+    ##INFO=<ID=END,Number=1,Type=Integer,Description="End position">
+    ##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+    #CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tNA00001
+    """
+).lstrip()
+
+
+def build_records():
+    rng = random.Random(42)
+    result = []
+    for chrom in ("1", "chrUn:1"):
+        positions = sorted(rng.randrange(1, 9000000) for _ in range(3000))
+        for pos in positions:
+            info = vcfpy.OrderedDict()
+            if rng.random() < 0.05:
+                info["END"] = pos + rng.randrange(1, 200000)
+            result.append(
+                vcfpy.Record(
+                    chrom,
+                    pos,
+                    [],
+                    "ACGT"[: rng.randrange(1, 5)],
+                    [vcfpy.Substitution(vcfpy.SNV, "T")],
+                    None,
+                    [],
+                    info,
+                    ["GT"],
+                    [vcfpy.Call("NA00001", vcfpy.OrderedDict(GT="0/1"))],
+                )
+            )
+    return result
+
+
+RECORDS = build_records()
+
+
+def overlapping(chrom, begin, end):
+    """Return positions of the records overlapping the region"""
+    return [
+        r.POS
+        for r in RECORDS
+        if r.CHROM == chrom
+        and (end is None or r.POS - 1 < end)
+        and begin < r.INFO.get("END", r.POS - 1 + len(r.REF))
+    ]
+
+
+@pytest.fixture(scope="module", params=["tbi", "csi"])
+def indexed_vcf(request, tmpdir_factory):
+    path = str(tmpdir_factory.mktemp("tabix").join("out.vcf.gz"))
+    header = vcfpy.Reader.from_stream(io.StringIO(HEADER)).header
+    with vcfpy.Writer.from_path(path, header, index=request.param) as writer:
+        for record in RECORDS:
+            writer.write_record(record)
+    return path
+
+
+def test_load_index(indexed_vcf):
+    index = tabix.TabixIndex.from_path(tabix.find_index(indexed_vcf))
+    assert index.names == ["1", "chrUn:1"]
+    assert index.name_to_idx == {"1": 0, "chrUn:1": 1}
+    assert index.meta_char == "#"
+    assert index.skip == 0
+    assert index.query("2", 0, 1000) == []
+    assert index.query("1", 1000, 1000) == []
+
+
+def test_load_index_invalid():
+    with pytest.raises(ValueError):
+        tabix.TabixIndex.from_bytes(b"BAI\1\0\0\0\0")
+
+
+def test_parse_region(indexed_vcf):
+    index = tabix.TabixIndex.from_path(tabix.find_index(indexed_vcf))
+    assert index.parse_region("1") == ("1", 0, None)
+    assert index.parse_region("1:1,000-2,000") == ("1", 999, 2000)
+    assert index.parse_region("1:1000") == ("1", 999, None)
+    assert index.parse_region("1:1000-") == ("1", 999, None)
+    assert index.parse_region("chrUn:1") == ("chrUn:1", 0, None)
+    assert index.parse_region("chrUn:1:5-10") == ("chrUn:1", 4, 10)
+
+
+def test_fetch_random_regions(indexed_vcf):
+    rng = random.Random(23)
+    with vcfpy.Reader.from_path(indexed_vcf) as reader:
+        for _ in range(100):
+            chrom = rng.choice(["1", "chrUn:1"])
+            begin = rng.randrange(0, 9000000)
+            end = begin + rng.randrange(1, 100000)
+            actual = [record.POS for record in reader.fetch(chrom, begin, end)]
+            assert overlapping(chrom, begin, end) == actual
+
+
+def test_fetch_region_strings(indexed_vcf):
+    with vcfpy.Reader.from_path(indexed_vcf) as reader:
+        actual = [record.POS for record in reader.fetch("chrUn:1")]
+        assert overlapping("chrUn:1", 0, None) == actual
+        actual = [record.POS for record in reader.fetch("1:4,000,001-4,100,000")]
+        assert overlapping("1", 4000000, 4100000) == actual
+        actual = [record.POS for record in reader.fetch("1:8000000")]
+        assert overlapping("1", 7999999, None) == actual
+
+
+@pytest.mark.parametrize("csi", [False, True])
+def test_read_pysam_index(tmpdir, csi):
+    pysam = pytest.importorskip("pysam")
+    path = os.path.join(os.path.dirname(__file__), "vcfs", "multi_contig.vcf.gz")
+    tmp_path = str(tmpdir.join("multi_contig.vcf.gz"))
+    shutil.copy(path, tmp_path)
+    pysam.tabix_index(tmp_path, preset="vcf", csi=csi)
+    index = tabix.TabixIndex.from_path(tabix.find_index(tmp_path))
+    assert index.fmt == ("csi" if csi else "tbi")
+    assert index.names == ["1", "2", "20"]
+    with vcfpy.Reader.from_path(tmp_path) as reader:
+        records = list(reader.fetch("20", 1110697, 1234568))
+    assert [r.POS for r in records] == [1230237, 1234567]
+
+
+def test_fetch_keeps_index_open(indexed_vcf):
+    with vcfpy.Reader.from_path(indexed_vcf) as reader:
+        list(reader.fetch("1", 0, 1000000))
+        tabix_file, tabix_index = reader.tabix_file, reader.tabix_index
+        list(reader.fetch("chrUn:1:1-1000000"))
+        assert reader.tabix_file is tabix_file
+        assert reader.tabix_index is tabix_index
+        assert not tabix_file.closed
+    assert tabix_file.closed
+
+
+def test_merge_regions(indexed_vcf):
+    index = tabix.TabixIndex.from_path(tabix.find_index(indexed_vcf))
+    regions = [
+        ("chrUn:1", 500, 600),
+        "1:101-200",
+        ("1", 150, 300),
+        ("1", 300, 400),
+        ("1", 1000, 2000),
+        ("2", 0, 100),
+        ("chrUn:1", 550, None),
+    ]
+    assert tabix.merge_regions(index, regions) == [
+        ("1", 100, 400),
+        ("1", 1000, 2000),
+        ("chrUn:1", 500, None),
+    ]
+
+
+def test_fetch_many(indexed_vcf):
+    rng = random.Random(5)
+    regions = []
+    for _ in range(200):
+        chrom = rng.choice(["1", "chrUn:1"])
+        begin = rng.randrange(0, 9000000)
+        regions.append((chrom, begin, begin + rng.randrange(1, 200000)))
+    expected = sorted(
+        {(chrom, pos) for chrom, begin, end in regions for pos in overlapping(chrom, begin, end)},
+        key=lambda x: (x[0] != "1", x[1]),
+    )
+    with vcfpy.Reader.from_path(indexed_vcf) as reader:
+        actual = [(record.CHROM, record.POS) for record in reader.fetch_many(regions)]
+    assert len({(r.CHROM, r.POS) for r in RECORDS}) == len(RECORDS)  # no duplicates
+    assert expected == actual
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Tests for collecting problems found while parsing
+"""
+
+import io
+import warnings
+
+import pytest
+
+from vcfpy import Reader, Diagnostics, exceptions
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+DIRTY_VCF = (
+    "##fileformat=VCFv4.3\n"
+    '##INFO=<ID=DP,Number=1,Type=Integer,Description="Depth">\n'
+    '##INFO=<ID=AC,Number=A,Type=Integer,Description="Allele count">\n'
+    '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'
+    '##FORMAT=<ID=GQ,Number=1,Type=Integer,Description="Genotype quality">\n'
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tNA00001\n"
+    "20\t100\t.\tC\tT\t.\tq10\tDP=x;AC=1,2\tGT:GQ\t0/1:y\n"
+    "20\t200\t.\tC\tT\t.\tq10\tDP=z; AC=1\tGT:GQ\t0/1:y\n"
+    "20\t300\t.\tC\tT\t.\tq10;q20\tDP=3\tGT:GQ\t0/1:10\n"
+    "20\t400\t.\tC\tT\t.\tq10\tDP=3\tGT:GQ\t0/1:10\n"
+)
+
+
+def test_diagnostics_report():
+    diagnostics = Diagnostics(max_examples=2)
+    with pytest.warns(exceptions.UnknownFilter) as record:
+        for i in range(5):
+            diagnostics.report(exceptions.UnknownFilter, "q10", "Filter {} in line {}", "q10", i)
+    assert len(record) == 1
+    assert diagnostics.counts == {(exceptions.UnknownFilter, "q10"): 5}
+    assert diagnostics.examples == {
+        (exceptions.UnknownFilter, "q10"): ["Filter q10 in line 0", "Filter q10 in line 1"]
+    }
+
+
+def test_diagnostics_no_warn(recwarn):
+    diagnostics = Diagnostics(max_examples=0, warn=False)
+    diagnostics.report(exceptions.UnknownFilter, "q10", "Filter {}", "q10")
+    assert list(recwarn) == []
+    assert diagnostics.counts[(exceptions.UnknownFilter, "q10")] == 1
+    assert diagnostics.examples == {}
+
+
+def test_reader_diagnostics():
+    diagnostics = Diagnostics(warn=False)
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter("always")
+        reader = Reader.from_stream(
+            io.StringIO(DIRTY_VCF), record_checks=["INFO"], diagnostics=diagnostics
+        )
+        records = list(reader)
+    assert not [w for w in record if issubclass(w.category, exceptions.VCFPyWarning)]
+    assert reader.diagnostics is diagnostics
+    assert [r.INFO["DP"] for r in records] == ["x", "z", 3, 3]
+    assert records[0].calls[0].data["GQ"] == "y"
+    assert diagnostics.counts == {
+        (exceptions.UnknownFilter, "q10"): 4,
+        (exceptions.UnknownFilter, "q20"): 1,
+        (exceptions.CannotConvertValue, "Integer"): 4,
+        (exceptions.IncorrectListLength, "AC"): 1,
+        (exceptions.LeadingTrailingSpaceInKey, "AC"): 1,
+    }
+    out = io.StringIO()
+    reader.print_warn_summary(out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "Problems found while parsing:"
+    assert "  UnknownFilter q10: 4 occurrences" in lines
+    assert "    Filter not found in header: q20; problem in FILTER column" in lines
+    assert "    x cannot be converted to Integer, keeping as string." in lines
+
+
+def test_reader_diagnostics_warns_once():
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter("always")
+        reader = Reader.from_stream(io.StringIO(DIRTY_VCF))
+        list(reader)
+    categories = [w.category for w in record]
+    assert categories.count(exceptions.UnknownFilter) == 2
+    assert categories.count(exceptions.CannotConvertValue) == 1
+    assert reader.diagnostics.counts[(exceptions.UnknownFilter, "q10")] == 4
+
+
+def test_reader_close_prints_summary(capsys):
+    with pytest.warns(exceptions.VCFPyWarning):
+        with Reader.from_stream(io.StringIO(DIRTY_VCF)) as reader:
+            list(reader)
+    err = capsys.readouterr().err
+    assert err.startswith("Problems found while parsing:\n")
+    assert "  UnknownFilter q10: 4 occurrences\n" in err
+    reader.close()
+    assert capsys.readouterr().err == ""
+
+
+def test_reader_close_no_summary_without_warnings(capsys):
+    diagnostics = Diagnostics(warn=False)
+    with Reader.from_stream(io.StringIO(DIRTY_VCF), diagnostics=diagnostics) as reader:
+        list(reader)
+    assert diagnostics.counts
+    assert capsys.readouterr().err == ""
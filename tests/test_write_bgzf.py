@@ -9,6 +9,7 @@ import io
 import pytest
 
 import vcfpy
+from vcfpy import bgzf
 from vcfpy import parser
 from vcfpy import writer
 from vcfpy import record
@@ -155,3 +156,67 @@ def test_write_minimal_record_writer_from_stream_use_bgzf(header_samples, tmpdir
     # check the resulting record
     LINE = "20\t100\t.\tC\tT\t.\t.\t.\tGT\t0/1\t0/0\t1/1\n"
     check_file(path, LINE)
+
+
+def test_write_records_writer_from_path_threads(header_samples, tmpdir_factory):
+    O = vcfpy.OrderedDict
+    # open temporary file and setup the Writer with header
+    path = tmpdir_factory.mktemp("write_header").join("out.vcf.gz")
+    header, _ = header_samples
+    w = writer.Writer.from_path(path, header, threads=4)
+    # write out enough records for several BGZF blocks
+    for pos in range(1, 20001):
+        r = record.Record(
+            "20",
+            pos,
+            [],
+            "C",
+            [record.Substitution(record.SNV, "T")],
+            None,
+            [],
+            O(),
+            ["GT"],
+            [
+                record.Call("NA00001", O(GT="0/1")),
+                record.Call("NA00002", O(GT="0/0")),
+                record.Call("NA00003", O(GT="1/1")),
+            ],
+        )
+        w.write_record(r)
+    w.close()
+    # check the resulting file
+    raw = path.read(mode="rb")
+    assert raw.count(b"BC") > 10
+    assert raw.endswith(bgzf._bgzf_eof)
+    RESULT = codecs.latin_1_decode(gzip.decompress(raw))[0]
+    LINES = "".join(
+        "20\t{}\t.\tC\tT\t.\t.\t.\tGT\t0/1\t0/0\t1/1\n".format(pos) for pos in range(1, 20001)
+    )
+    assert MEDIUM_HEADER + LINES == RESULT
+
+
+def test_bgzf_writer_threads_identical():
+    data = bytes(range(256)) * 1024
+    results = []
+    for threads in (1, 3):
+        f = io.BytesIO()
+        w = bgzf.BgzfWriter(fileobj=f, threads=threads)
+        for _ in range(5):
+            w.write(data)
+        w.flush()
+        results.append(f.getvalue())
+    assert results[0] == results[1]
+    assert gzip.decompress(results[0]) == data * 5
+
+
+def test_bgzf_writer_large_writes():
+    data = bytes(range(256)) * 12345
+    f = io.BytesIO()
+    w = bgzf.BgzfWriter(fileobj=f)
+    w.write(data)
+    assert len(w._buffer) == len(data) % 65536
+    w.write(data[:1000])
+    w.write(data.decode("latin-1"))
+    assert w.raw_tell() == 2 * len(data) + 1000
+    w.flush()
+    assert gzip.decompress(f.getvalue()) == data + data[:1000] + data
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Test building TBI and CSI indices while writing
+"""
+
+import io
+import random
+import textwrap
+
+import pytest
+
+import vcfpy
+from vcfpy import exceptions
+from vcfpy import tabix
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+HEADER = textwrap.dedent(
+    """
+    ##fileformat=VCFv4.3
+    ##contig=<ID=1,length=10000000>
+    ##contig=<ID=2,length=10000000>
+    ##INFO=<ID=END,Number=1,Type=Integer,Description="End position">
+    ##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+    #CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tNA00001
+    """
+).lstrip()
+
+
+@pytest.fixture(scope="module")
+def records():
+    rng = random.Random(42)
+    result = []
+    for chrom in ("2", "1"):
+        positions = sorted(rng.randrange(1, 9000000) for _ in range(5000))
+        for pos in positions:
+            info = vcfpy.OrderedDict()
+            if rng.random() < 0.05:
+                info["END"] = pos + rng.randrange(1, 200000)
+            result.append(
+                vcfpy.Record(
+                    chrom,
+                    pos,
+                    [],
+                    "ACGT"[: rng.randrange(1, 5)],
+                    [vcfpy.Substitution(vcfpy.SNV, "T")],
+                    None,
+                    [],
+                    info,
+                    ["GT"],
+                    [vcfpy.Call("NA00001", vcfpy.OrderedDict(GT="0/1"))],
+                )
+            )
+    return result
+
+
+def test_reg2bin():
+    assert tabix.reg2bin(0, 1) == 4681
+    assert tabix.reg2bin((1 << 14) - 1, (1 << 14) + 1) == 585
+    assert tabix.reg2bin(0, 1 << 29) == 0
+    assert tabix.reg2bin(0, 1, 14, 6) == 37449
+    assert tabix.reg2bin(1 << 29, (1 << 29) + 1, 14, 6) == 37449 + (1 << 15)
+
+
+def test_reg2bins():
+    begin, end = 1000000, 1100000
+    bins = tabix.reg2bins(begin, end)
+    assert tabix.reg2bin(begin, end) in bins
+    assert tabix.reg2bin(begin, begin + 1) in bins
+    assert tabix.reg2bin(end - 1, end) in bins
+    assert bins[0] == 0
+
+
+def test_csi_depth():
+    assert tabix.csi_depth(1000) == 5
+    assert tabix.csi_depth(1 << 29) == 5
+    assert tabix.csi_depth((1 << 29) + 1) == 6
+
+
+@pytest.mark.parametrize("index", ["tbi", "csi"])
+def test_write_index(tmpdir, records, index):
+    pysam = pytest.importorskip("pysam")
+    path = str(tmpdir.join("out.vcf.gz"))
+    header = vcfpy.Reader.from_stream(io.StringIO(HEADER)).header
+    with vcfpy.Writer.from_path(path, header, threads=2, index=index) as writer:
+        for record in records:
+            writer.write_record(record)
+    assert writer.index_path == path + "." + index
+    rng = random.Random(23)
+    with pysam.TabixFile(path, index=writer.index_path) as tabix_file:
+        assert tabix_file.contigs == ["2", "1"]
+        for _ in range(50):
+            chrom = rng.choice(["1", "2"])
+            begin = rng.randrange(0, 9000000)
+            end = begin + rng.randrange(1, 100000)
+            actual = [line.split("\t")[1] for line in tabix_file.fetch(chrom, begin, end)]
+            expected = [
+                str(r.POS)
+                for r in records
+                if r.CHROM == chrom
+                and r.POS - 1 < end
+                and begin < r.INFO.get("END", r.POS - 1 + len(r.REF))
+            ]
+            assert expected == actual
+
+
+def test_write_index_unsorted(tmpdir, records):
+    path = str(tmpdir.join("out.vcf.gz"))
+    header = vcfpy.Reader.from_stream(io.StringIO(HEADER)).header
+    with vcfpy.Writer.from_path(path, header, index="tbi") as writer:
+        writer.write_record(records[1])
+        with pytest.raises(exceptions.InvalidRecordException):
+            writer.write_record(records[0])
+
+
+def test_write_index_requires_bgzf(tmpdir):
+    header = vcfpy.Reader.from_stream(io.StringIO(HEADER)).header
+    with pytest.raises(ValueError):
+        vcfpy.Writer.from_path(str(tmpdir.join("out.vcf")), header, index="tbi")
+
+
+def test_write_index_lazy_info(tmpdir):
+    path = str(tmpdir.join("out.vcf.gz"))
+    lines = [
+        "1\t100\t.\tC\tT\t.\t.\tEND=5000\tGT\t0/1\n",
+        "1\t6000\t.\tC\tT\t.\t.\t.\tGT\t0/1\n",
+        "1\t7000\t.\tC\tT\t.\t.\tEND\tGT\t0/1\n",
+    ]
+    reader = vcfpy.Reader.from_stream(io.StringIO(HEADER + "".join(lines)), lazy_info=True)
+    records = list(reader)
+    with vcfpy.Writer.from_path(path, reader.header, index="tbi") as writer:
+        for record in records:
+            writer.write_record(record)
+    assert all(record.INFO.is_pristine() for record in records)
+    with vcfpy.Reader.from_path(path) as reader:
+        assert [r.POS for r in reader.fetch("1", 4000, 4001)] == [100]
+        assert [r.POS for r in reader.fetch("1", 6999, 7000)] == [7000]
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Test buffered writing of records
+"""
+
+import io
+import os
+
+from vcfpy import reader
+from vcfpy import tabix
+from vcfpy import writer
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+PATH = os.path.join(os.path.dirname(__file__), "vcfs", "full_vcf43.vcf")
+
+
+def read_records():
+    with reader.Reader.from_path(PATH) as r:
+        return r.header, list(r)
+
+
+def test_write_records():
+    header, records = read_records()
+    expected = io.StringIO()
+    w = writer.Writer.from_stream(expected, header)
+    for record in records:
+        w.write_record(record)
+    w.flush()
+    actual = io.StringIO()
+    w = writer.Writer.from_stream(actual, header)
+    w.write_records(iter(records))
+    w.flush()
+    assert expected.getvalue() == actual.getvalue()
+    with open(PATH, "rt") as f:
+        assert f.read() == actual.getvalue()
+
+
+def test_write_unbuffered():
+    header, records = read_records()
+    stream = io.StringIO()
+    w = writer.Writer.from_stream(stream, header)
+    w.write_records(records)
+    assert stream.getvalue().count("\n") == len(header.lines) + 1 + len(records)
+
+
+def test_write_buffered():
+    header, records = read_records()
+    stream = io.StringIO()
+    w = writer.Writer.from_stream(stream, header, buffer_size=writer.DEFAULT_BUFFER_SIZE)
+    w.write_records(records)
+    assert stream.getvalue() == ""
+    w.flush()
+    assert stream.getvalue().count("\n") == len(header.lines) + 1 + len(records)
+
+
+def test_write_buffered_not_closed(tmpdir):
+    header, records = read_records()
+    path = str(tmpdir.join("out.vcf"))
+    w = writer.Writer.from_path(path, header)
+    w.write_records(records)
+    stream = w.stream
+    del w
+    stream.close()
+    with open(path, "rt") as f:
+        assert f.read().count("\n") == len(header.lines) + 1 + len(records)
+
+
+def test_write_small_buffer():
+    header, records = read_records()
+    stream = io.StringIO()
+    w = writer.Writer.from_stream(stream, header, buffer_size=100)
+    w.write_records(records[:2])
+    # first record is longer than the buffer, the second one is kept
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == len(header.lines) + 1 + 1
+    assert lines[-1].startswith("20\t14370\t")
+    w.flush()
+    assert stream.getvalue().splitlines()[-1].startswith("20\t17330\t")
+
+
+def test_write_small_buffer_index(tmpdir):
+    header, records = read_records()
+    path = str(tmpdir.join("out.vcf.gz"))
+    with writer.Writer.from_path(path, header, index="tbi", buffer_size=100) as w:
+        w.write_records(records)
+    index = tabix.TabixIndex.from_path(path + ".tbi")
+    assert index.names == ["20"]
+    with reader.Reader.from_path(path) as r:
+        assert [record.POS for record in r.fetch("20:17330-1110696")] == [17330, 1110696]
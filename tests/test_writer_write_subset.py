@@ -43,3 +43,20 @@ def test_reading_and_write_subset_of_samples_parse_different_subset(
     # Check resulting file
     with open(out_path, "rt") as outf:
         assert multisample_vcf_only_NA00002 == outf.read()
+
+
+def test_reading_and_write_subset_of_samples_reassigned_calls(
+    tmpdir, multisample_vcf_file, multisample_vcf_only_NA00002
+):
+    # Drop the calls of the other samples from the records before writing
+    out_path = str(tmpdir.mkdir("output").join("output.vcf"))
+    with Reader.from_path(multisample_vcf_file) as reader:
+        samples = SamplesInfos(["NA00002"])
+        header = Header(reader.header.lines, samples)
+        with Writer.from_path(out_path, header) as writer:
+            for record in reader:
+                record.calls = [call for call in record.calls if call.sample == "NA00002"]
+                writer.write_record(record)
+    # Check resulting file
+    with open(out_path, "rt") as outf:
+        assert multisample_vcf_only_NA00002 == outf.read()
@@ -30,7 +30,10 @@ from .header import (
 
 from .record import (
     Record,
+    LazyInfo,
+    LazyCalls,
     Call,
+    Genotype,
     UnparsedCall,
     AltRecord,
     Substitution,
@@ -43,10 +46,16 @@ from .record import SNV, MNV, DEL, INS, INDEL, SV, BND, SYMBOLIC, MIXED
 from .record import HOM_REF, HET, HOM_ALT
 from .record import FIVE_PRIME, THREE_PRIME, FORWARD, REVERSE
 
+from .arrays import GenotypeArrays
+
 from .reader import Reader
 
+from .parallel import ParallelReader
+
 from .writer import Writer
 
+from .warn_utils import Diagnostics
+
 from ._version import get_versions
 
 __version__ = get_versions()["version"]
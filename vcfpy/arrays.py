@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""Columnar representation of genotype call information using NumPy
+
+Building one :py:class:`~vcfpy.record.Call` with its ``data`` mapping per
+sample and record dominates the runtime when processing whole cohorts.
+The code in this module converts a batch of raw VCF lines directly into
+NumPy arrays instead.
+
+NumPy is an optional dependency and only required when using this module.
+"""
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from . import exceptions
+from . import record
+from .exceptions import CannotConvertValue
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+#: Value of missing alleles (``.``) in :py:attr:`GenotypeArrays.gt`
+GT_MISSING = -1
+#: Value for padding the alleles of calls with smaller ploidy in
+#: :py:attr:`GenotypeArrays.gt`
+GT_PADDING = -2
+#: Value of missing ``Integer`` values, missing ``Float`` values are NaN
+INT_MISSING = -1
+
+#: NumPy dtypes to use for the FORMAT value types
+DTYPES = {"Integer": "int32", "Float": "float32"}
+
+#: NumPy dtypes to use for :py:attr:`GenotypeArrays.gt` with the largest
+#: allele number they can hold, the smallest sufficient one is used
+GT_DTYPES = (("int8", 127), ("int16", 32767), ("int32", 2147483647))
+
+
+class GenotypeArrays:
+    """Call information of a batch of records in columnar form
+
+    The first axis of all arrays corresponds to the records and the second
+    axis corresponds to the samples.  Fields with ``Number=1`` have two
+    dimensions, all other fields have a third dimension padded to the
+    largest number of values in the batch.
+    """
+
+    def __init__(self, samples, CHROM, POS, REF, ALT, gt, phased, fields):
+        #: ``list`` of ``str`` with the sample names
+        self.samples = samples
+        #: ``list`` of ``str`` with the chromosome names
+        self.CHROM = CHROM
+        #: ``numpy.ndarray`` of ``int64`` with the 1-based positions
+        self.POS = POS
+        #: ``list`` of ``str`` with the REF values
+        self.REF = REF
+        #: ``list`` of ``list`` of ``str`` with the raw ALT values
+        self.ALT = ALT
+        #: ``numpy.ndarray`` of ``int8`` with shape ``(n_records, n_samples,
+        #: ploidy)`` giving the allele numbers, :py:data:`GT_MISSING` for
+        #: no-calls and :py:data:`GT_PADDING` for padding; ``None`` if ``GT``
+        #: was not requested.  Widened to ``int16`` or ``int32`` for batches
+        #: with larger allele numbers, see :py:data:`GT_DTYPES`
+        self.gt = gt
+        #: ``numpy.ndarray`` of ``bool`` with shape ``(n_records,
+        #: n_samples)``, whether the call is phased; ``None`` if ``GT`` was
+        #: not requested
+        self.phased = phased
+        #: ``dict`` mapping the requested FORMAT keys to ``numpy.ndarray``
+        self.fields = fields
+
+    def is_called(self):
+        """Return ``bool`` array of shape ``(n_records, n_samples)``, whether
+        all alleles of the call are called"""
+        return ((self.gt >= 0) | (self.gt == GT_PADDING)).all(axis=2) & (self.gt[:, :, 0] >= 0)
+
+    def __len__(self):
+        return len(self.CHROM)
+
+    def __str__(self):
+        tpl = "GenotypeArrays(n_records={}, samples={}, fields={})"
+        return tpl.format(len(self), repr(self.samples), repr(sorted(self.fields)))
+
+    def __repr__(self):
+        return str(self)
+
+
+def build_genotype_arrays(record_parser, lines, fields=("GT",), ploidy=None):
+    """Build :py:class:`GenotypeArrays` from raw record lines
+
+    :param record_parser: :py:class:`~vcfpy.parser.RecordParser` to use for
+        the header information and the cached FORMAT ``FieldInfo`` lists
+    :param list lines: ``list`` of ``str`` or ``bytes`` with the raw lines
+    :param fields: FORMAT keys to build arrays for, ``"GT"`` is stored in
+        :py:attr:`GenotypeArrays.gt` and :py:attr:`GenotypeArrays.phased`,
+        all others must be of type ``Integer`` or ``Float``
+    :param int ploidy: size of the last axis of the ``GT`` array, alleles
+        beyond are dropped; defaults to the largest ploidy in the batch
+    :raises: ``ImportError`` if NumPy is not available
+    :raises: :py:class:`vcfpy.exceptions.InvalidRecordException` in the case
+        of lines with wrong number of columns
+    :raises: :py:class:`vcfpy.exceptions.VCFPyException` in the case of
+        allele numbers too large for :py:data:`GT_DTYPES`
+
+    Values that cannot be converted are reported to the diagnostics of
+    ``record_parser``.
+    """
+    if numpy is None:
+        raise ImportError("NumPy is required for building genotype arrays")
+    num_samples = len(record_parser.samples.names)
+    chroms, positions, refs, alts = [], [], [], []
+    # per record, mapping from FORMAT key to its position and FieldInfo and
+    # the sample columns split at the colons
+    positions_in_format, rows = [], []
+    for line in lines:
+        if type(line) is bytes:
+            line = line.decode()
+        arr = line.rstrip().split("\t")
+        if len(arr) != record_parser.expected_fields:
+            raise exceptions.InvalidRecordException(
+                "The line contains an invalid number of fields. Was "
+                "{} but expected {}\n{}".format(len(arr), record_parser.expected_fields, line)
+            )
+        chroms.append(arr[0])
+        positions.append(int(arr[1]))
+        refs.append(arr[3])
+        alts.append([] if arr[4] == "." else arr[4].split(","))
+        if len(arr) > 8:
+            format_ = arr[8].split(":")
+            infos = record_parser._get_format_infos(arr[8], format_)
+            positions_in_format.append(
+                {info_key: (i, info) for i, (info_key, info) in enumerate(zip(format_, infos))}
+            )
+            rows.append([column.split(":") for column in arr[9:]])
+        else:
+            positions_in_format.append({})
+            rows.append([])
+    gt, phased, result = None, None, {}
+    for key in fields:
+        values = [
+            _values_for_key(key, pos, row, num_samples)
+            for pos, row in zip(positions_in_format, rows)
+        ]
+        if key == "GT":
+            gt, phased = _build_gt(values, len(lines), num_samples, ploidy)
+        else:
+            infos = [p[key][1] for p in positions_in_format if key in p]
+            if infos:
+                field_info = infos[0]
+            else:
+                field_info = record_parser.header.get_format_field_info(key)
+            result[key] = _build_field(
+                key,
+                field_info,
+                values,
+                len(lines),
+                num_samples,
+                record_parser.diagnostics.report,
+            )
+    return GenotypeArrays(
+        list(record_parser.samples.names),
+        chroms,
+        numpy.array(positions, dtype="int64"),
+        refs,
+        alts,
+        gt,
+        phased,
+        result,
+    )
+
+
+def _values_for_key(key, positions_in_format, columns, num_samples):
+    """Return list of raw values of ``key`` for all samples of a record"""
+    if key not in positions_in_format:
+        return ["."] * num_samples
+    idx = positions_in_format[key][0]
+    return [parts[idx] if idx < len(parts) else "." for parts in columns]
+
+
+def _parse_gt(gt_str):
+    """Return tuple of alleles and phasing flag for the given GT string"""
+    genotype = record.parse_genotype(gt_str)
+    alleles = tuple(GT_MISSING if allele is None else allele for allele in genotype.alleles)
+    return alleles, genotype.phased
+
+
+def _build_gt(values, num_records, num_samples, ploidy):
+    """Build GT and phasing arrays, each distinct GT string is only parsed
+    once"""
+    parsed = {}
+    for row in values:
+        for gt_str in row:
+            if gt_str not in parsed:
+                parsed[gt_str] = _parse_gt(gt_str)
+    if ploidy is None:
+        ploidy = max([len(alleles) for alleles, _ in parsed.values()] or [1])
+    padded = {
+        gt_str: alleles[:ploidy] + (GT_PADDING,) * (ploidy - len(alleles))
+        for gt_str, (alleles, _) in parsed.items()
+    }
+    gt = numpy.array([[padded[s] for s in row] for row in values], dtype=_gt_dtype(parsed))
+    phased = numpy.array([[parsed[s][1] for s in row] for row in values], dtype="bool")
+    return (
+        gt.reshape((num_records, num_samples, ploidy)),
+        phased.reshape((num_records, num_samples)),
+    )
+
+
+def _gt_dtype(parsed):
+    """Return smallest dtype from :py:data:`GT_DTYPES` that can hold the
+    allele numbers of the parsed GT strings"""
+    max_allele = max([max(alleles, default=0) for alleles, _ in parsed.values()] or [0])
+    for dtype, max_value in GT_DTYPES:
+        if max_allele <= max_value:
+            return dtype
+    raise exceptions.VCFPyException(
+        "Allele number {} is too large for the GT array".format(max_allele)
+    )
+
+
+def _build_field(key, field_info, values, num_records, num_samples, report):
+    """Build array for the numeric FORMAT field ``key``, values that cannot
+    be converted are passed to ``report``"""
+    if field_info.type not in DTYPES:
+        raise exceptions.VCFPyException(
+            "Cannot build array for FORMAT/{} of type {}".format(key, field_info.type)
+        )
+    if field_info.type == "Integer":
+        convert, missing = int, INT_MISSING
+    else:
+        convert, missing = float, float("nan")
+
+    def convert_value(value):
+        if value == ".":
+            return missing
+        try:
+            return convert(value)
+        except ValueError:
+            report(
+                CannotConvertValue,
+                field_info.type,
+                "{} cannot be converted to {}, using missing value",
+                value,
+                field_info.type,
+            )
+            return missing
+
+    if field_info.number == 1:
+        data = [[convert_value(v) for v in row] for row in values]
+        return numpy.array(data, dtype=DTYPES[field_info.type]).reshape(
+            (num_records, num_samples)
+        )
+    data = [[list(map(convert_value, v.split(","))) for v in row] for row in values]
+    width = max([len(v) for row in data for v in row] or [1])
+    if isinstance(field_info.number, int):
+        width = max(width, field_info.number)
+    data = [[v + [missing] * (width - len(v)) for v in row] for row in data]
+    return numpy.array(data, dtype=DTYPES[field_info.type]).reshape(
+        (num_records, num_samples, width)
+    )
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-"""Support code for writing BGZF files
+"""Support code for reading and writing BGZF files
 
 Shamelessly taken from Biopython
 """
@@ -24,7 +24,11 @@ Shamelessly taken from Biopython
 # OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE
 # OR PERFORMANCE OF THIS SOFTWARE.
 
+import array
+import bisect
 import codecs
+import collections
+import concurrent.futures
 import struct
 import zlib
 
@@ -83,8 +87,265 @@ def make_virtual_offset(block_start_offset, within_block_offset):
     return (block_start_offset << 16) | within_block_offset
 
 
+def split_virtual_offset(virtual_offset):
+    """Divides a 64-bit BGZF virtual offset into block start & within block offsets.
+    >>> (100000, 0) == split_virtual_offset(6553600000)
+    True
+    >>> (100000, 10) == split_virtual_offset(6553600010)
+    True
+    """
+    start = virtual_offset >> 16
+    return start, virtual_offset ^ (start << 16)
+
+
+def is_bgzf_file(path):
+    """Return whether the file at ``path`` starts with a BGZF block rather
+    than being plain gzip-compressed"""
+    with open(path, "rb") as f:
+        header = f.read(len(_bgzf_header))
+    return len(header) == len(_bgzf_header) and (
+        header[:4] == _bgzf_magic and header[12:14] == _bytes_BC
+    )
+
+
+def _load_bgzf_block(handle):
+    """Load the next BGZF block from ``handle``
+
+    :returns: tuple of the compressed size of the block and the decompressed
+        data, the size is ``0`` at the end of the file
+    :raises: ``ValueError`` if the data is not valid BGZF
+    """
+    magic = handle.read(4)
+    if not magic:
+        return 0, b""
+    if magic != _bgzf_magic:
+        raise ValueError(
+            "A BGZF (e.g. a BAM file) block should start with %r, not %r; "
+            "handle.tell() now says %r" % (_bgzf_magic, magic, handle.tell())
+        )
+    _mod_time, _extra_flags, _os, extra_len = struct.unpack("<LBBH", handle.read(8))
+    block_size = None
+    x_len = 0
+    while x_len < extra_len:
+        subfield_id = handle.read(2)
+        subfield_len = struct.unpack("<H", handle.read(2))[0]
+        subfield_data = handle.read(subfield_len)
+        x_len += subfield_len + 4
+        if subfield_id == _bytes_BC:
+            assert subfield_len == 2, "Wrong BC payload length"
+            block_size = struct.unpack("<H", subfield_data)[0] + 1  # uint16_t
+    if block_size is None:
+        raise ValueError("Missing BSIZE subfield in BGZF block header")
+    # Now comes the compressed data, CRC, and length of uncompressed data.
+    deflate_size = block_size - 1 - extra_len - 19
+    d = zlib.decompressobj(-15)  # Negative window size means no headers
+    data = d.decompress(handle.read(deflate_size)) + d.flush()
+    expected_crc, expected_size = struct.unpack("<II", handle.read(8))
+    if expected_size != len(data):
+        raise ValueError("Decompressed to %i, not %i" % (len(data), expected_size))
+    crc = zlib.crc32(data) & 0xFFFFFFFF
+    if expected_crc != crc:
+        raise ValueError("CRC is %s, not %s" % (crc, expected_crc))
+    return block_size, data
+
+
+class BgzfReader(object):
+    """Read BGZF files
+
+    Supports sequential reading as well as random access using the virtual
+    offsets returned by :py:meth:`~BgzfReader.tell`.  The decompressed
+    blocks are kept in a LRU cache, so jumping back into recently read
+    blocks does not decompress them again.
+
+    In text mode (the default), lines are decoded as UTF-8.
+
+    :param int max_cache: maximal number of decompressed blocks to keep
+    """
+
+    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100):
+        if max_cache < 1:
+            raise ValueError("Use max_cache with a minimum of 1")
+        if fileobj:
+            assert filename is None
+            handle = fileobj
+        else:
+            if "w" in mode.lower() or "a" in mode.lower():
+                raise ValueError("Must use read mode (default), not write or append mode")
+            handle = open(filename, "rb")
+        self._text = "b" not in mode.lower()
+        self._handle = handle
+        #: maximal number of decompressed blocks to keep in the cache
+        self.max_cache = max_cache
+        # LRU cache, mapping block start offsets to data and block size
+        self._buffers = collections.OrderedDict()
+        self._block_start_offset = None
+        self._block_raw_length = None
+        self._buffer = b""
+        self._within_block_offset = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._load_block(handle.tell())
+
+    def _load_block(self, start_offset=None):
+        if start_offset is None:
+            # reading sequentially, the next block starts after this one
+            start_offset = self._block_start_offset + self._block_raw_length
+        if start_offset == self._block_start_offset:
+            self._within_block_offset = 0
+            return
+        elif start_offset in self._buffers:
+            # cache hit, mark as most recently used
+            self._buffers.move_to_end(start_offset)
+            self._buffer, self._block_raw_length = self._buffers[start_offset]
+            self._within_block_offset = 0
+            self._block_start_offset = start_offset
+            return
+        # cache miss, must read from disk
+        self._handle.seek(start_offset)
+        self._block_start_offset = start_offset
+        self._block_raw_length, self._buffer = _load_bgzf_block(self._handle)
+        self._within_block_offset = 0
+        if self._block_raw_length:  # not at EOF
+            while len(self._buffers) >= self.max_cache:
+                self._buffers.popitem(last=False)
+            self._buffers[start_offset] = self._buffer, self._block_raw_length
+
+    def tell(self):
+        """Return a 64-bit unsigned BGZF virtual offset"""
+        if 0 < self._within_block_offset and self._within_block_offset == len(self._buffer):
+            # at the end of the block, point at the start of the next one
+            return (self._block_start_offset + self._block_raw_length) << 16
+        return make_virtual_offset(self._block_start_offset, self._within_block_offset)
+
+    def seek(self, virtual_offset):
+        """Seek to a 64-bit unsigned BGZF virtual offset"""
+        start_offset, within_block = split_virtual_offset(virtual_offset)
+        if start_offset != self._block_start_offset:
+            self._load_block(start_offset)
+        if within_block > len(self._buffer):
+            raise ValueError(
+                "Within offset %i but block size only %i" % (within_block, len(self._buffer))
+            )
+        self._within_block_offset = within_block
+        self._decoder.reset()
+        return virtual_offset
+
+    def _read_bytes(self, size):
+        result = []
+        while self._block_raw_length:
+            begin = self._within_block_offset
+            if size >= 0 and begin + size <= len(self._buffer):
+                result.append(self._buffer[begin : begin + size])
+                self._within_block_offset = begin + size
+                break
+            data = self._buffer[begin:]
+            result.append(data)
+            size -= len(data)
+            self._load_block()
+        return b"".join(result)
+
+    def read(self, size=-1):
+        """Read up to ``size`` bytes, everything until the end of the file
+        if negative"""
+        data = self._read_bytes(size)
+        if self._text:
+            # at the end of the file, incomplete characters raise an error
+            return self._decoder.decode(data, final=not self._block_raw_length)
+        else:
+            return data
+
+    def readline(self):
+        """Read a single line, including the trailing newline"""
+        result = []
+        while self._block_raw_length:
+            begin = self._within_block_offset
+            i = self._buffer.find(b"\n", begin)
+            if i == -1:
+                result.append(self._buffer[begin:])
+                self._load_block()
+            else:
+                result.append(self._buffer[begin : i + 1])
+                self._within_block_offset = i + 1
+                break
+        data = b"".join(result)
+        if self._text:
+            return self._decoder.decode(data, final=not self._block_raw_length)
+        else:
+            return data
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def __iter__(self):
+        return self
+
+    @property
+    def closed(self):
+        return self._handle.closed
+
+    def close(self):
+        """Close underlying file and clear the block cache"""
+        self._handle.close()
+        self._buffer = None
+        self._block_start_offset = None
+        self._buffers = None
+
+    @classmethod
+    def seekable(klass):
+        return True
+
+    @classmethod
+    def isatty(klass):
+        return False
+
+    def fileno(self):
+        return self._handle.fileno()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.close()
+
+
+def compress_block(block, compresslevel=6):
+    """Return BGZF block with the compressed ``block``, including header and
+    footer
+
+    This function does not hold the GIL for most of its runtime, so blocks
+    can be compressed in parallel using threads.
+    """
+    assert len(block) <= 65536
+    # Giving a negative window bits means no gzip/zlib headers,
+    # -15 used in samtools
+    c = zlib.compressobj(compresslevel, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, 0)
+    compressed = c.compress(block) + c.flush()
+    del c
+    assert len(compressed) < 65536, "TODO - Didn't compress enough, try less data in this block"
+    bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
+    crc = struct.pack("<I", zlib.crc32(block) & 0xFFFFFFFF)
+    uncompressed_length = struct.pack("<I", len(block))
+    # Fixed 16 bytes,
+    # gzip magic bytes (4) mod time (4),
+    # gzip flag (1), os (1), extra length which is six (2),
+    # sub field which is BC (2), sub field length of two (2),
+    # Variable data,
+    # 2 bytes: block length as BC sub field (2)
+    # X bytes: the data
+    # 8 bytes: crc (4), uncompressed data length (4)
+    return _bgzf_header + bsize + compressed + crc + uncompressed_length
+
+
 class BgzfWriter(object):
-    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6):
+    """Write BGZF files
+
+    :param int threads: number of threads to use for compression, blocks
+        are compressed on the caller's thread if ``1``
+    """
+
+    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6, threads=1):
         if fileobj:
             assert filename is None
             handle = fileobj
@@ -97,61 +358,75 @@ class BgzfWriter(object):
                 handle = open(filename, "wb")
         self._text = "b" not in mode.lower()
         self._handle = handle
-        self._buffer = b""
+        # data not written out as block yet, always shorter than a block
+        self._buffer = bytearray()
         self.compresslevel = compresslevel
+        self.threads = threads
+        # thread pool and queue of futures for blocks being compressed
+        if threads > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(threads)
+        else:
+            self._executor = None
+        self._pending = collections.deque()
+        # offsets of the written blocks in the uncompressed and compressed
+        # data, for computing virtual offsets from uncompressed offsets
+        self._raw_offset = 0
+        self._raw_blocks_end = 0
+        self._raw_block_starts = array.array("Q")
+        try:
+            self._compressed_offset = handle.tell()
+        except (AttributeError, OSError):
+            self._compressed_offset = 0
+        self._block_starts = array.array("Q")
 
     def _write_block(self, block):
         # print("Saving %i bytes" % len(block))
-        assert len(block) <= 65536
-        # Giving a negative window bits means no gzip/zlib headers,
-        # -15 used in samtools
-        c = zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, 0)
-        compressed = c.compress(block) + c.flush()
-        del c
-        assert len(compressed) < 65536, "TODO - Didn't compress enough, try less data in this block"
-        crc = zlib.crc32(block)
-        # Should cope with a mix of Python platforms...
-        if crc < 0:
-            crc = struct.pack("<i", crc)
-        else:
-            crc = struct.pack("<I", crc)
-        bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
-        crc = struct.pack("<I", zlib.crc32(block) & 0xFFFFFFFF)
-        uncompressed_length = struct.pack("<I", len(block))
-        # Fixed 16 bytes,
-        # gzip magic bytes (4) mod time (4),
-        # gzip flag (1), os (1), extra length which is six (2),
-        # sub field which is BC (2), sub field length of two (2),
-        # Variable data,
-        # 2 bytes: block length as BC sub field (2)
-        # X bytes: the data
-        # 8 bytes: crc (4), uncompressed data length (4)
-        data = _bgzf_header + bsize + compressed + crc + uncompressed_length
+        self._raw_block_starts.append(self._raw_blocks_end)
+        self._raw_blocks_end += len(block)
+        if self._executor is None:
+            self._write_compressed(compress_block(block, self.compresslevel))
+            return
+        # copy the block, the buffer is modified while it is being compressed
+        block = bytes(block)
+        self._pending.append(self._executor.submit(compress_block, block, self.compresslevel))
+        # bound the number of blocks in flight, writing out in order
+        while len(self._pending) > 2 * self.threads:
+            self._write_compressed(self._pending.popleft().result())
+
+    def _write_compressed(self, data):
+        self._block_starts.append(self._compressed_offset)
+        self._compressed_offset += len(data)
         self._handle.write(data)
 
+    def _drain(self):
+        """Write out all blocks that are being compressed"""
+        while self._pending:
+            self._write_compressed(self._pending.popleft().result())
+
     def write(self, data):
         # TODO - Check bytes vs unicode
         if isinstance(data, str):
             data = codecs.latin_1_encode(data)[0]
+        self._raw_offset += len(data)
+        buffer = self._buffer
+        buffer += data
         # block_size = 2**16 = 65536
-        data_len = len(data)
-        if len(self._buffer) + data_len < 65536:
-            # print("Cached %r" % data)
-            self._buffer += data
+        if len(buffer) < 65536:
             return
-        else:
-            # print("Got %r, writing out some data..." % data)
-            self._buffer += data
-            while len(self._buffer) >= 65536:
-                self._write_block(self._buffer[:65536])
-                self._buffer = self._buffer[65536:]
+        # compress full blocks from views into the buffer, then move the
+        # remainder to the front once, keeping the copying linear
+        end = len(buffer) - len(buffer) % 65536
+        view = memoryview(buffer)
+        for begin in range(0, end, 65536):
+            self._write_block(view[begin : begin + 65536])
+        view.release()
+        del buffer[:end]
 
     def flush(self):
-        while len(self._buffer) >= 65536:
-            self._write_block(self._buffer[:65535])
-            self._buffer = self._buffer[65535:]
+        # write() keeps less than a block of data in the buffer
         self._write_block(self._buffer)
-        self._buffer = b""
+        self._buffer = bytearray()
+        self._drain()
         self._handle.flush()
 
     def close(self):
@@ -163,14 +438,38 @@ class BgzfWriter(object):
         """
         if self._buffer:
             self.flush()
+        self._drain()
+        if self._executor is not None:
+            self._executor.shutdown()
+        # the end of the data maps to the start of the EOF block
+        self._raw_block_starts.append(self._raw_offset)
+        self._block_starts.append(self._compressed_offset)
         self._handle.write(_bgzf_eof)
         self._handle.flush()
         self._handle.close()
 
     def tell(self):
-        """Returns a BGZF 64-bit virtual offset."""
+        """Returns a BGZF 64-bit virtual offset.
+
+        Waits for all blocks being compressed to be written out.
+        """
+        self._drain()
         return make_virtual_offset(self._handle.tell(), len(self._buffer))
 
+    def raw_tell(self):
+        """Return offset in the uncompressed data written so far"""
+        return self._raw_offset
+
+    def virtual_offset(self, raw_offset):
+        """Return BGZF 64-bit virtual offset for the given offset in the
+        uncompressed data, as returned by :py:meth:`~BgzfWriter.raw_tell`
+
+        Only valid for data in blocks that have been written out, e.g., after
+        :py:meth:`~BgzfWriter.close`.
+        """
+        i = bisect.bisect_right(self._raw_block_starts, raw_offset) - 1
+        return make_virtual_offset(self._block_starts[i], raw_offset - self._raw_block_starts[i])
+
     def seekable(self):
         # Not seekable, but we do support tell...
         return False
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Conversion of raw INFO and FORMAT field values
+
+Used by :py:class:`~vcfpy.header.Header` for its cached INFO value decoders
+and by the :py:mod:`~vcfpy.parser`.
+"""
+
+import functools
+import warnings
+
+from . import record
+from . import warn_utils
+from .exceptions import CannotConvertValue
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+# Field value converters
+_CONVERTERS = {
+    "Integer": int,
+    "Float": float,
+    "Flag": lambda x: True,
+    "Character": str,
+    "String": str,
+}
+
+
+def convert_field_value(type_, value):
+    """Convert atomic field value according to the type"""
+    if value == ".":
+        return None
+    elif type_ in ("Character", "String"):
+        if "%" in value:
+            for k, v in record.UNESCAPE_MAPPING:
+                value = value.replace(k, v)
+        return value
+    else:
+        try:
+            return _CONVERTERS[type_](value)
+        except ValueError:
+            warnings.warn(
+                ("{} cannot be converted to {}, keeping as " "string.").format(value, type_),
+                CannotConvertValue,
+            )
+            return value
+
+
+def parse_field_value(field_info, value):
+    """Parse ``value`` according to ``field_info``
+    """
+    if field_info.id == "FT":
+        return [x for x in value.split(";") if x != "."]
+    elif field_info.type == "Flag":
+        return True
+    elif field_info.number == 1:
+        return convert_field_value(field_info.type, value)
+    else:
+        if value == ".":
+            return []
+        else:
+            return [convert_field_value(field_info.type, x) for x in value.split(",")]
+
+
+def _atomic_value_converter(type_, report):
+    """Return function for converting atomic values of the given type, see
+    :py:func:`convert_field_value`"""
+    if type_ in ("Character", "String"):
+
+        def convert(value):
+            if value == ".":
+                return None
+            if "%" in value:
+                for k, v in record.UNESCAPE_MAPPING:
+                    value = value.replace(k, v)
+            return value
+
+    elif type_ in _CONVERTERS:
+        converter = _CONVERTERS[type_]
+
+        def convert(value):
+            if value == ".":
+                return None
+            try:
+                return converter(value)
+            except ValueError:
+                report(
+                    CannotConvertValue,
+                    type_,
+                    "{} cannot be converted to {}, keeping as string.",
+                    value,
+                    type_,
+                )
+                return value
+
+    else:
+        convert = functools.partial(convert_field_value, type_)
+    return convert
+
+
+def field_value_decoder(field_info, report=warn_utils.warn):
+    """Return function for parsing values according to ``field_info``
+
+    The result is equivalent to :py:func:`parse_field_value` with the case
+    distinctions on ``field_info`` done once instead of for each value.
+    Values that cannot be converted are passed to ``report``, e.g.,
+    :py:meth:`vcfpy.warn_utils.Diagnostics.report`.
+    """
+    if field_info.id == "FT":
+        return lambda value: [x for x in value.split(";") if x != "."]
+    elif field_info.type == "Flag":
+        return lambda value: True
+    convert = _atomic_value_converter(field_info.type, report)
+    if field_info.number == 1:
+        return convert
+
+    def decode(value):
+        if value == ".":
+            return []
+        else:
+            return [convert(x) for x in value.split(",")]
+
+    return decode
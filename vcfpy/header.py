@@ -4,11 +4,14 @@
 The VCF header class structure is modeled after HTSJDK
 """
 
+import collections
 import json
 import pprint
 import warnings
 
 from . import exceptions
+from . import field_values
+from . import warn_utils
 from .compat import OrderedDict
 from .exceptions import (
     DuplicateHeaderLineWarning,
@@ -273,6 +276,21 @@ class Header:
         self.samples = samples
         # build indices for the different field types
         self._indices = self._build_indices()
+        # functions for decoding INFO values by ID, built on first use, also
+        # for fields missing from the header
+        self._info_decoders = {}
+        # fallback FieldInfo objects by (type, key) for fields missing from
+        # the header, built on first lookup
+        self._missing_field_infos = OrderedDict()
+        #: ``collections.Counter`` with the number of decoded values of
+        #: fields missing from the header by ``(type, key)``, e.g.,
+        #: ``("INFO", "XX")``, counted per record for INFO and per call for
+        #: FORMAT fields
+        self.missing_field_counts = collections.Counter()
+        #: optional :py:class:`~vcfpy.warn_utils.Diagnostics` for reporting
+        #: INFO values that cannot be decoded, set by the parser; warnings
+        #: are issued if ``None``
+        self.diagnostics = None
 
     def _build_indices(self):
         """Build indices for the different field types"""
@@ -392,12 +410,39 @@ class Header:
             return False
         else:
             self._indices[header_line.key][header_line.mapping["ID"]] = header_line
+            if header_line.key == "INFO":
+                self._info_decoders.clear()
             return True
 
     def get_info_field_info(self, key):
         """Return :py:class:`FieldInfo` for the given INFO field"""
         return self._get_field_info("INFO", key)
 
+    def get_info_decoder(self, key):
+        """Return function for decoding raw values of the given INFO field,
+        see :py:func:`vcfpy.field_values.field_value_decoder`
+
+        The functions are cached until INFO header lines are added, also for
+        fields not described in the header.  Each call for such a field is
+        counted in :py:attr:`~Header.missing_field_counts`.
+        """
+        if key not in self._indices["INFO"]:
+            self.missing_field_counts[("INFO", key)] += 1
+        try:
+            return self._info_decoders[key]
+        except KeyError:
+            info = self.get_info_field_info(key)
+            decoder = field_values.field_value_decoder(info, self._report)
+            self._info_decoders[key] = decoder
+            return decoder
+
+    def _report(self, category, key, template, *args):
+        """Report problem to ``self.diagnostics`` or issue warning"""
+        if self.diagnostics is None:
+            warn_utils.warn(category, key, template, *args)
+        else:
+            self.diagnostics.report(category, key, template, *args)
+
     def get_format_field_info(self, key):
         """Return :py:class:`FieldInfo` for the given INFO field"""
         return self._get_field_info("FORMAT", key)
@@ -406,16 +451,36 @@ class Header:
         result = self._indices[type_].get(key)
         if result:
             return result
+        # the warning is only issued on the first lookup of a missing field,
+        # the values are counted where they are decoded
+        res = self._missing_field_infos.get((type_, key))
+        if res is not None:
+            return res
         if key in RESERVED_INFO:
             res = FieldInfo(RESERVED_INFO[key].type, RESERVED_INFO[key].number)
         else:
             res = FieldInfo("String", HEADER_NUMBER_UNBOUNDED)
+        self._missing_field_infos[(type_, key)] = res
         warnings.warn(
             "{} {} not found using {}/{} instead".format(type_, key, res.type, repr(res.number)),
             FieldInfoNotFound,
         )
         return res
 
+    def get_missing_field_info(self, type_, key):
+        """Return fallback :py:class:`FieldInfo` used for the field of the
+        given type (``"INFO"`` or ``"FORMAT"``) missing from the header,
+        ``None`` if it was not looked up yet"""
+        return self._missing_field_infos.get((type_, key))
+
+    def __getstate__(self):
+        # the cached decoder functions cannot be pickled and the diagnostics
+        # belong to the parser
+        state = self.__dict__.copy()
+        state["_info_decoders"] = {}
+        state["diagnostics"] = None
+        return state
+
     def __eq__(self, other):
         if isinstance(other, self.__class__):
             return (self.lines, self.samples) == (other.lines, other.samples)
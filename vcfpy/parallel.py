@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""Parallel parsing of tabix-indexed VCF files using multiple processes
+
+The genome is split into chunks along the contigs and each chunk is parsed
+in a worker process using :py:meth:`vcfpy.reader.Reader.fetch`.
+"""
+
+import multiprocessing
+
+from . import tabix
+from .reader import Reader
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+#: Default size of the chunks to process in one go, in base pairs
+DEFAULT_CHUNK_SIZE = 10000000
+
+# The Reader to use in the worker process, set in _init_worker
+_worker_reader = None
+
+
+def _init_worker(path, tabix_path, record_checks, parsed_samples):
+    """Initialize worker process, opening the Reader"""
+    global _worker_reader
+    _worker_reader = Reader.from_path(
+        path, tabix_path=tabix_path, record_checks=record_checks, parsed_samples=parsed_samples
+    )
+
+
+def _process_region(args):
+    """Read records in the given region and apply ``func`` to them
+
+    Records are assigned to the chunk containing their begin position, so
+    each record is processed exactly once.
+    """
+    (chrom, begin, end), func = args
+    if begin is None:
+        records = list(_worker_reader.fetch(chrom))
+    elif end is None:
+        region = "{}:{}".format(chrom, begin + 1)
+        records = [record for record in _worker_reader.fetch(region) if begin <= record.begin]
+    else:
+        records = [
+            record
+            for record in _worker_reader.fetch(chrom, begin, end)
+            if begin <= record.begin < end
+        ]
+    if func is None:
+        return records
+    else:
+        return func(records)
+
+
+class ParallelReader:
+    """Class for parsing tabix-indexed VCF files in parallel
+
+    The regions to read are built from the ``contig`` header lines and the
+    sequence list of the tabix index, see :py:meth:`~ParallelReader.regions`.
+    Each region is parsed in a process pool, the results are yielded in
+    genomic order unless ``ordered`` is ``False``.
+
+    .. code-block:: python
+
+        def count_records(records):
+            return len(records)
+
+        reader = vcfpy.ParallelReader("in.vcf.gz", processes=16)
+        total = sum(reader.map_regions(count_records))
+
+    .. note::
+        The function passed to :py:meth:`~ParallelReader.map_regions` must
+        be picklable, i.e., defined on the top level of a module.  The same
+        holds for its return value.
+
+    :param path: path to the bgzip-compressed VCF file
+    :param tabix_path: optional string with path to TBI or CSI index
+    :param int processes: number of worker processes, defaults to the number
+        of CPUs
+    :param int chunk_size: size of the chunks contigs are split into
+    :param bool ordered: whether to yield results in genomic order
+    :param list record_checks: record checks to perform, can contain
+        'INFO' and 'FORMAT'
+    :param list parsed_samples: ``list`` of ``str`` values with names of
+        samples to parse call information for (for speedup); leave to
+        ``None`` for ignoring
+    """
+
+    def __init__(
+        self,
+        path,
+        tabix_path=None,
+        processes=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        ordered=True,
+        record_checks=None,
+        parsed_samples=None,
+    ):
+        #: ``str`` with path to the VCF file
+        self.path = str(path)
+        #: optional ``str`` with path to tabix file
+        self.tabix_path = tabix_path
+        #: number of worker processes, ``None`` for number of CPUs
+        self.processes = processes
+        #: size of the chunks in base pairs
+        self.chunk_size = chunk_size
+        #: whether to yield results in genomic order
+        self.ordered = ordered
+        #: checks to perform on records, can contain 'FORMAT' and 'INFO'
+        self.record_checks = tuple(record_checks or [])
+        #: if set, list of samples to parse for
+        self.parsed_samples = parsed_samples
+        with Reader.from_path(self.path, tabix_path=tabix_path) as reader:
+            #: the :py:class:`~vcfpy.header.Header`
+            self.header = reader.header
+            self.tabix_path = reader.tabix_path
+
+    def regions(self):
+        """Return list of ``(chrom, begin, end)`` triples to process
+
+        Contigs are taken in the order of the TBI or CSI index.  Contigs with a
+        length in the header are split into chunks of ``chunk_size``, all
+        others are processed as a whole with ``begin`` and ``end`` being
+        ``None``.  The ``end`` of the last chunk of each contig is ``None``
+        such that records beyond the contig length are not lost.
+        """
+        lengths = {line.id: line.length for line in self.header.get_lines("contig")}
+        tabix_path = self.tabix_path or tabix.find_index(self.path)
+        if not tabix_path:
+            raise FileNotFoundError("Could not find index for {}".format(self.path))
+        contigs = tabix.TabixIndex.from_path(tabix_path).names
+        result = []
+        for contig in contigs:
+            length = lengths.get(contig)
+            if length is None:
+                result.append((contig, None, None))
+            else:
+                begins = list(range(0, int(length), self.chunk_size)) or [0]
+                for begin in begins[:-1]:
+                    result.append((contig, begin, begin + self.chunk_size))
+                result.append((contig, begins[-1], None))
+        return result
+
+    def map_regions(self, func=None, regions=None):
+        """Yield result of applying ``func`` to the list of records in each
+        region
+
+        :param func: function to apply to the list of records of each
+            region; the list of records is yielded if ``None``
+        :param list regions: list of ``(chrom, begin, end)`` triples,
+            defaults to :py:meth:`~ParallelReader.regions`
+        """
+        if regions is None:
+            regions = self.regions()
+        initargs = (self.path, self.tabix_path, self.record_checks, self.parsed_samples)
+        with multiprocessing.Pool(self.processes, _init_worker, initargs) as pool:
+            tasks = [(region, func) for region in regions]
+            if self.ordered:
+                yield from pool.imap(_process_region, tasks)
+            else:
+                yield from pool.imap_unordered(_process_region, tasks)
+
+    def __iter__(self):
+        """Yield all records of the file"""
+        for records in self.map_regions():
+            yield from records
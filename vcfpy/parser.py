@@ -6,13 +6,15 @@ import ast
 import functools
 import math
 import re
+import sys
 import warnings
 
+from . import arrays
 from . import header
 from . import record
 from . import exceptions
+from . import warn_utils
 from .exceptions import (
-    CannotConvertValue,
     LeadingTrailingSpaceInKey,
     UnknownFilter,
     UnknownVCFVersion,
@@ -21,6 +23,11 @@ from .exceptions import (
 
 
 from .compat import OrderedDict
+from .field_values import (  # noqa: F401
+    convert_field_value,
+    parse_field_value,
+    field_value_decoder,
+)
 
 __author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
 
@@ -33,6 +40,10 @@ REQUIRE_NO_SAMPLE_HEADER = ("#CHROM", "POS", "ID", "REF", "ALT", "QUAL", "FILTER
 #: Supported VCF versions, a warning will be issued otherwise
 SUPPORTED_VCF_VERSIONS = ("VCFv4.0", "VCFv4.1", "VCFv4.2", "VCFv4.3")
 
+#: Suggested number of characters to read from the stream at once when
+#: enabling chunked reading with ``buffer_size``
+DEFAULT_BUFFER_SIZE = 8 * 1024 * 1024
+
 
 class QuotedStringSplitter:
     """Helper class for splitting quoted strings
@@ -125,17 +136,20 @@ def split_quoted_string(s, delim=",", quote='"', brackets="[]"):
     return QuotedStringSplitter(delim, quote, brackets).run(s)
 
 
-def split_mapping(pair_str):
+def split_mapping(pair_str, report=warn_utils.warn):
     """Split the ``str`` in ``pair_str`` at ``'='``
 
-    Warn if key needs to be stripped
+    Warn if key needs to be stripped, using the ``report`` function of a
+    :py:class:`~vcfpy.warn_utils.Diagnostics` if given
     """
     orig_key, value = pair_str.split("=", 1)
     key = orig_key.strip()
     if key != orig_key:
-        warnings.warn(
-            "Mapping key {} has leading or trailing space".format(repr(orig_key)),
+        report(
             LeadingTrailingSpaceInKey,
+            key,
+            "Mapping key {} has leading or trailing space",
+            repr(orig_key),
         )
     return key, value
 
@@ -225,51 +239,16 @@ def build_header_parsers():
     return result
 
 
-# Field value converters
-_CONVERTERS = {
-    "Integer": int,
-    "Float": float,
-    "Flag": lambda x: True,
-    "Character": str,
-    "String": str,
-}
-
+#: Substitutions with REF and ALT up to this length are interned by
+#: :py:class:`RecordParser`, symbolic alleles are always interned
+ALT_INTERN_MAX_LENGTH = 4
 
-def convert_field_value(type_, value):
-    """Convert atomic field value according to the type"""
-    if value == ".":
-        return None
-    elif type_ in ("Character", "String"):
-        if "%" in value:
-            for k, v in record.UNESCAPE_MAPPING:
-                value = value.replace(k, v)
-        return value
-    else:
-        try:
-            return _CONVERTERS[type_](value)
-        except ValueError:
-            warnings.warn(
-                ("{} cannot be converted to {}, keeping as " "string.").format(value, type_),
-                CannotConvertValue,
-            )
-            return value
-
-
-def parse_field_value(field_info, value):
-    """Parse ``value`` according to ``field_info``
-    """
-    if field_info.id == "FT":
-        return [x for x in value.split(";") if x != "."]
-    elif field_info.type == "Flag":
-        return True
-    elif field_info.number == 1:
-        return convert_field_value(field_info.type, value)
-    else:
-        if value == ".":
-            return []
-        else:
-            return [convert_field_value(field_info.type, x) for x in value.split(",")]
+#: Maximal number of interned ALT objects per :py:class:`RecordParser`
+ALT_INTERN_MAX_SIZE = 100000
 
+#: Maximal number of distinct FILTER and FORMAT/FT values for which the
+#: check result is cached by :py:class:`RecordParser`
+FILTER_CACHE_MAX_SIZE = 100000
 
 # Regular expression for break-end
 BREAKEND_PATTERN = re.compile("[\\[\\]]")
@@ -388,13 +367,30 @@ class HeaderParser:
 class RecordParser:
     """Helper class for parsing VCF records"""
 
-    def __init__(self, header, samples, record_checks=None):
+    def __init__(
+        self,
+        header,
+        samples,
+        record_checks=None,
+        lazy_info=False,
+        lazy_calls=False,
+        sites_only=False,
+        diagnostics=None,
+        check_filters=True,
+    ):
         #: Header with the meta information
         self.header = header
         #: SamplesInfos with sample information
         self.samples = samples
         #: The checks to perform, can contain 'INFO' and 'FORMAT'
         self.record_checks = tuple(record_checks or [])
+        #: Whether to decode INFO values only on first access
+        self.lazy_info = lazy_info
+        #: Whether to build calls only on first access
+        self.lazy_calls = lazy_calls and bool(self.samples.names)
+        #: Whether to only parse the first eight columns, ignoring FORMAT and
+        #: the sample columns
+        self.sites_only = sites_only
         # Expected number of fields
         if self.samples.names:
             self.expected_fields = 9 + len(self.samples.names)
@@ -402,27 +398,48 @@ class RecordParser:
             self.expected_fields = 8
         # Cache of FieldInfo objects by FORMAT string
         self._format_cache = {}
+        # Cache of functions for decoding the call data by FORMAT string
+        self._format_decoders = {}
+        # Index of FT by FORMAT string, ``None`` if there is no FT field
+        self._ft_indices = {}
+        # Interned AltRecord objects by (REF, ALT) or symbolic ALT string
+        self._alt_cache = {}
+        #: Whether to check the FILTER and FORMAT/FT values against the
+        #: header, independent of ``record_checks``
+        self.check_filters = check_filters
         # Cache of FILTER entries, also applied to FORMAT/FT
         self._filter_ids = set(self.header.filter_ids())
+        # Unknown filters by raw FILTER or FORMAT/FT value
+        self._unknown_filters = {}
+        #: :py:class:`~vcfpy.warn_utils.Diagnostics` to report problems to
+        if diagnostics is None:
+            diagnostics = warn_utils.Diagnostics()
+        self.diagnostics = diagnostics
         # Helper for checking INFO fields
         if "INFO" in self.record_checks:
-            self._info_checker = InfoChecker(self.header)
+            self._info_checker = InfoChecker(self.header, self.diagnostics)
         else:
             self._info_checker = NoopInfoChecker()
         # Helper for checking FORMAT fields
         if "FORMAT" in self.record_checks:
-            self._format_checker = FormatChecker(self.header)
+            self._format_checker = FormatChecker(self.header, self.diagnostics)
         else:
             self._format_checker = NoopFormatChecker()
 
     def parse_line(self, line_str):
         """Parse line from file (including trailing line break) and return
         resulting Record
+
+        The line can also be given as ``bytes``, see
+        :py:meth:`~RecordParser._split_line_bytes`.
         """
         line_str = line_str.rstrip()
         if not line_str:
             return None  # empty line, EOF
-        arr = self._split_line(line_str)
+        if type(line_str) is bytes:
+            arr = self._split_line_bytes(line_str)
+        else:
+            arr = self._split_line(line_str)
         # CHROM
         chrom = arr[0]
         # POS
@@ -438,7 +455,7 @@ class RecordParser:
         alts = []
         if arr[4] != ".":
             for alt in arr[4].split(","):
-                alts.append(process_alt(self.header, ref, alt))
+                alts.append(self._process_alt(ref, alt))
         # QUAL
         if arr[5] == ".":
             qual = None
@@ -452,7 +469,8 @@ class RecordParser:
             filt = []
         else:
             filt = arr[6].split(";")
-        self._check_filters(filt, "FILTER")
+            if self.check_filters:
+                self._check_filters(arr[6], "FILTER")
         # INFO
         info = self._parse_info(arr[7], len(alts))
         if len(arr) == 9:
@@ -465,94 +483,245 @@ class RecordParser:
             format_ = arr[8].split(":")
             # sample/call columns
             calls = self._handle_calls(alts, format_, arr[8], arr)
-        return record.Record(chrom, pos, ids, ref, alts, qual, filt, info, format_, calls)
+        return record.Record(
+            chrom, pos, ids, ref, alts, qual, filt, info, format_, calls, self.samples
+        )
+
+    def _process_alt(self, ref, alt_str):
+        """Process alternative value, shared immutable objects are returned
+        for short substitutions and symbolic alleles, see
+        :py:class:`~vcfpy.record.FrozenSubstitution` and
+        :py:class:`~vcfpy.record.FrozenSymbolicAllele`
+        """
+        if alt_str.startswith("<") and alt_str.endswith(">"):
+            key = alt_str
+        elif (
+            len(ref) <= ALT_INTERN_MAX_LENGTH
+            and len(alt_str) <= ALT_INTERN_MAX_LENGTH
+            and not any(c in alt_str for c in ".[]")  # no breakend
+        ):
+            key = (ref, alt_str)
+        else:
+            return process_alt(self.header, ref, alt_str)
+        try:
+            return self._alt_cache[key]
+        except KeyError:
+            result = process_alt(self.header, ref, alt_str)
+            if type(result) is record.SymbolicAllele:
+                result = record.FrozenSymbolicAllele(result.value)
+            else:
+                result = record.FrozenSubstitution(result.type, result.value)
+            if len(self._alt_cache) < ALT_INTERN_MAX_SIZE:
+                self._alt_cache[key] = result
+            return result
 
     def _handle_calls(self, alts, format_, format_str, arr):
         """Handle FORMAT and calls columns, factored out of parse_line"""
-        if format_str not in self._format_cache:
-            self._format_cache[format_str] = list(map(self.header.get_format_field_info, format_))
+        self._get_format_decoder(format_str, format_)
         # per-sample calls
+        if self.lazy_calls:
+            build = self._call_builder(alts, format_, format_str)
+            return record.LazyCalls(self.samples, arr[9], build, format_)
         calls = []
         for sample, raw_data in zip(self.samples.names, arr[9:]):
-            if self.samples.is_parsed(sample):
-                data = self._parse_calls_data(format_, self._format_cache[format_str], raw_data)
-                call = record.Call(sample, data)
-                self._format_checker.run(call, len(alts))
-                self._check_filters(call.data.get("FT"), "FORMAT/FT", call.sample)
-                calls.append(call)
-            else:
-                calls.append(record.UnparsedCall(sample, raw_data))
+            calls.append(self._build_call(sample, raw_data, alts, format_, format_str))
         return calls
 
-    def _check_filters(self, filt, source, sample=None):
-        if not filt:
-            return
-        for f in filt:
-            self._check_filter(f, source, sample)
-
-    def _check_filter(self, f, source, sample):
-        if f == "PASS":
-            pass  # the PASS filter is implicitely defined
-        elif f not in self._filter_ids:
-            if source == "FILTER":
-                warnings.warn(
-                    ("Filter not found in header: {}; problem in FILTER " "column").format(f),
-                    UnknownFilter,
-                )
-            else:
-                assert source == "FORMAT/FT" and sample
-                warnings.warn(
-                    (
-                        "Filter not found in header: {}; problem in "
-                        "FORMAT/FT column of sample {}"
-                    ).format(f, sample),
-                    UnknownFilter,
-                )
+    def _get_format_infos(self, format_str, format_):
+        """Return list of FieldInfo objects for the FORMAT column, cached by
+        the FORMAT string"""
+        if format_str not in self._format_cache:
+            self._format_cache[format_str] = list(map(self.header.get_format_field_info, format_))
+        return self._format_cache[format_str]
+
+    def _get_format_decoder(self, format_str, format_):
+        """Return function for decoding the data of a call into an
+        ``OrderedDict``, compiled once per FORMAT string"""
+        if format_str not in self._format_decoders:
+            infos = self._get_format_infos(format_str, format_)
+            keys = tuple(format_)
+            report = self.diagnostics.report
+            decoders = tuple(field_value_decoder(info, report) for info in infos)
+            # fields missing from the header, counted for each call
+            missing = tuple(
+                ("FORMAT", key) for key in keys if not self.header.has_header_line("FORMAT", key)
+            )
+            missing_field_counts = self.header.missing_field_counts
+
+            def decode(gt_str):
+                if missing:
+                    missing_field_counts.update(missing)
+                # The standard is very nice to parsers, we can simply split
+                # at colon characters
+                values = gt_str.split(":")
+                return OrderedDict(zip(keys, [f(v) for f, v in zip(decoders, values)]))
+
+            self._format_decoders[format_str] = decode
+            self._ft_indices[format_str] = keys.index("FT") if "FT" in keys else None
+        return self._format_decoders[format_str]
+
+    def _build_call(self, sample, raw_data, alts, format_, format_str):
+        """Build Call (or UnparsedCall if sample is not parsed) for sample"""
+        if self.samples.is_parsed(sample):
+            data = self._format_decoders[format_str](raw_data)
+            call = record.Call(sample, data)
+            self._format_checker.run(call, len(alts))
+            ft_idx = self._ft_indices[format_str]
+            if self.check_filters and ft_idx is not None:
+                # check the raw FT value, the same values are cached
+                values = raw_data.split(":", ft_idx + 1)
+                if len(values) > ft_idx and values[ft_idx] not in ("", "."):
+                    self._check_filters(values[ft_idx], "FORMAT/FT", sample)
+            return call
+        else:
+            return record.UnparsedCall(sample, raw_data)
+
+    def _call_builder(self, alts, format_, format_str):
+        """Return function for building calls on access, used for
+        :py:class:`~vcfpy.record.LazyCalls`"""
+
+        def build(sample, raw_data):
+            if type(raw_data) is bytes:
+                raw_data = raw_data.decode()
+            return self._build_call(sample, raw_data, alts, format_, format_str)
+
+        return build
+
+    def _check_filters(self, filt_str, source, sample=None):
+        """Check the semicolon-separated FILTER or FORMAT/FT value, the
+        unknown filters of each distinct value are only determined once"""
+        unknown = self._unknown_filters.get(filt_str)
+        if unknown is None:
+            # the PASS filter is implicitely defined
+            unknown = tuple(
+                f for f in filt_str.split(";") if f != "PASS" and f not in self._filter_ids
+            )
+            if len(self._unknown_filters) < FILTER_CACHE_MAX_SIZE:
+                self._unknown_filters[filt_str] = unknown
+        for f in unknown:
+            self._report_unknown_filter(f, source, sample)
+
+    def _report_unknown_filter(self, f, source, sample):
+        if source == "FILTER":
+            self.diagnostics.report(
+                UnknownFilter, f, "Filter not found in header: {}; problem in FILTER column", f
+            )
+        else:
+            assert source == "FORMAT/FT" and sample
+            self.diagnostics.report(
+                UnknownFilter,
+                f,
+                "Filter not found in header: {}; problem in FORMAT/FT column of sample {}",
+                f,
+                sample,
+            )
 
     def _split_line(self, line_str):
-        """Split line and check number of columns"""
-        arr = line_str.rstrip().split("\t")
-        if len(arr) != self.expected_fields:
+        """Split line and check number of columns
+
+        When building calls lazily, the sample columns are kept together
+        as the last entry of the resulting list.  When parsing only the
+        sites, the line is only split up to the INFO column.
+        """
+        if self.sites_only:
+            arr = line_str.split("\t", 8)[:8]
+            self._check_sites_only_fields(arr, line_str)
+            return arr
+        if self.lazy_calls:
+            arr = line_str.split("\t", 9)
+            num_fields = len(arr) + (arr[9].count("\t") if len(arr) == 10 else 0)
+        else:
+            arr = line_str.split("\t")
+            num_fields = len(arr)
+        if num_fields != self.expected_fields:
             raise exceptions.InvalidRecordException(
-                (
-                    "The line contains an invalid number of fields. Was "
-                    "{} but expected {}\n{}".format(len(arr), 9 + len(self.samples.names), line_str)
-                )
+                "The line contains an invalid number of fields. Was "
+                "{} but expected {}\n{}".format(num_fields, 9 + len(self.samples.names), line_str)
             )
         return arr
 
+    def _split_line_bytes(self, line):
+        """Split ``bytes`` line and check number of columns
+
+        Only the columns up to FORMAT are decoded, the INFO column is kept as
+        ``bytes`` when decoding INFO lazily and the sample columns are kept
+        together as ``bytes`` when building calls lazily.
+        """
+        if self.sites_only:
+            arr = line.split(b"\t", 8)[:8]
+            self._check_sites_only_fields(arr, line.decode())
+            result = [value.decode() for value in arr[:7]]
+            result.append(arr[7] if self.lazy_info else arr[7].decode())
+            return result
+        arr = line.split(b"\t", 9)
+        num_fields = len(arr) + (arr[9].count(b"\t") if len(arr) == 10 else 0)
+        if num_fields != self.expected_fields:
+            raise exceptions.InvalidRecordException(
+                "The line contains an invalid number of fields. Was "
+                "{} but expected {}\n{}".format(
+                    num_fields, 9 + len(self.samples.names), line.decode()
+                )
+            )
+        result = [value.decode() for value in arr[:7]]
+        result.append(arr[7] if self.lazy_info else arr[7].decode())
+        if len(arr) > 8:
+            result.append(arr[8].decode())
+        if len(arr) == 10:
+            if self.lazy_calls:
+                result.append(arr[9])
+            else:
+                result += arr[9].decode().split("\t")
+        return result
+
+    @classmethod
+    def _check_sites_only_fields(klass, arr, line_str):
+        """Check that the line has the eight site columns, the number of sample
+        columns is not checked when parsing only the sites"""
+        if len(arr) != 8:
+            raise exceptions.InvalidRecordException(
+                "The line contains an invalid number of fields. Was "
+                "{} but expected at least 8\n{}".format(len(arr), line_str)
+            )
+
     def _parse_info(self, info_str, num_alts):
         """Parse INFO column from string"""
+        if self.lazy_info:
+            return record.LazyInfo(info_str, self._split_info, self._info_decoder(num_alts))
         result = OrderedDict()
+        get_decoder = self.header.get_info_decoder
+        for key, value in self._split_info(info_str):
+            result[key] = get_decoder(key)(value)
+        self._info_checker.run_all(result, num_alts)
+        return result
+
+    def _split_info(self, info_str):
+        """Split INFO column string into list of key/raw value pairs, the raw
+        value of flags is ``True``"""
+        if type(info_str) is bytes:  # lazy INFO of bytes line
+            info_str = info_str.decode()
         if info_str == ".":
-            return result
+            return []
         # The standard is very nice to parsers, we can simply split at
         # semicolon characters, although I (Manuel) don't know how strict
         # programs follow this
+        result = []
         for entry in info_str.split(";"):
             if "=" not in entry:  # flag
-                key = entry
-                result[key] = parse_field_value(self.header.get_info_field_info(key), True)
+                result.append((entry, True))
             else:
-                key, value = split_mapping(entry)
-                result[key] = parse_field_value(self.header.get_info_field_info(key), value)
-            self._info_checker.run(key, result[key], num_alts)
+                result.append(split_mapping(entry, self.diagnostics.report))
         return result
 
-    @classmethod
-    def _parse_calls_data(klass, format_, infos, gt_str):
-        """Parse genotype call information from arrays using format array
+    def _info_decoder(self, num_alts):
+        """Return function for decoding raw INFO values on access, used for
+        :py:class:`~vcfpy.record.LazyInfo`"""
 
-        :param list format: List of strings with format names
-        :param gt_str arr: string with genotype information values
-        """
-        data = OrderedDict()
-        # The standard is very nice to parsers, we can simply split at
-        # colon characters, although I (Manuel) don't know how strict
-        # programs follow this
-        for key, info, value in zip(format_, infos, gt_str.split(":")):
-            data[key] = parse_field_value(info, value)
-        return data
+        def decode(key, value):
+            result = self.header.get_info_decoder(key)(value)
+            self._info_checker.run(key, result, num_alts)
+            return result
+
+        return decode
 
 
 class HeaderChecker:
@@ -593,6 +762,26 @@ def binomial(n, k):
     return res
 
 
+@functools.lru_cache(maxsize=None)
+def expected_count(number, num_alts, ploidy=2):
+    """Return the expected number of values of a field with the given
+    ``Number`` for ``num_alts`` alternative alleles and the given ``ploidy``,
+    ``None`` if any number of values is valid
+
+    The results are cached, there only are few distinct combinations.
+    """
+    if number == header.HEADER_NUMBER_UNBOUNDED:
+        return None
+    elif number == header.HEADER_NUMBER_ALLELES:
+        return num_alts
+    elif number == header.HEADER_NUMBER_REF:
+        return num_alts + 1
+    elif number == header.HEADER_NUMBER_GENOTYPES:
+        return binomial(num_alts + ploidy, ploidy)
+    else:
+        return number
+
+
 class NoopInfoChecker:
     """Helper class that performs no checks"""
 
@@ -602,13 +791,20 @@ class NoopInfoChecker:
     def run(self, key, value, num_alts):
         pass
 
+    def run_all(self, info, num_alts):
+        pass
+
 
 class InfoChecker:
     """Helper class for checking an INFO field"""
 
-    def __init__(self, header):
+    def __init__(self, header, diagnostics=None):
         #: VCFHeader to use for checking
         self.header = header
+        #: :py:class:`~vcfpy.warn_utils.Diagnostics` to report problems to
+        if diagnostics is None:
+            diagnostics = warn_utils.Diagnostics()
+        self.diagnostics = diagnostics
 
     def run(self, key, value, num_alts):
         """Check value in INFO[key] of record
@@ -619,22 +815,27 @@ class InfoChecker:
         :param value: value to check
         :param int alts: list of alternative alleles, for length
         """
+        if not isinstance(value, list) or not value:
+            return  # not a list or missing value
         field_info = self.header.get_info_field_info(key)
-        if not isinstance(value, list):
-            return
-        TABLE = {
-            ".": len(value),
-            "A": num_alts,
-            "R": num_alts + 1,
-            "G": binomial(num_alts + 1, 2),  # diploid only at the moment
-        }
-        expected = TABLE.get(field_info.number, field_info.number)
-        if len(value) != expected:
+        # diploid only at the moment
+        expected = expected_count(field_info.number, num_alts)
+        if expected is not None and len(value) != expected:
             tpl = "Number of elements for INFO field {} is {} instead of {}"
-            warnings.warn(
-                tpl.format(key, len(value), field_info.number), exceptions.IncorrectListLength
+            self.diagnostics.report(
+                exceptions.IncorrectListLength, key, tpl, key, len(value), field_info.number
             )
 
+    def run_all(self, info, num_alts):
+        """Check all values of the INFO ``dict`` of a record in one pass
+
+        :param dict info: INFO of the record
+        :param int num_alts: number of alternative alleles
+        """
+        for key, value in info.items():
+            if isinstance(value, list) and value:
+                self.run(key, value, num_alts)
+
 
 class NoopFormatChecker:
     """Helper class that performs no checks"""
@@ -649,38 +850,43 @@ class NoopFormatChecker:
 class FormatChecker:
     """Helper class for checking a FORMAT field"""
 
-    def __init__(self, header):
+    def __init__(self, header, diagnostics=None):
         #: VCFHeader to use for checking
         self.header = header
+        #: :py:class:`~vcfpy.warn_utils.Diagnostics` to report problems to
+        if diagnostics is None:
+            diagnostics = warn_utils.Diagnostics()
+        self.diagnostics = diagnostics
 
     def run(self, call, num_alts):
         """Check ``FORMAT`` of a record.Call
 
         Currently, only checks for consistent counts are implemented
         """
+        ploidy = call.ploidy
         for key, value in call.data.items():
-            self._check_count(call, key, value, num_alts)
+            # FT is a list of filters, whatever its number
+            if isinstance(value, list) and value and key != "FT":
+                self._check_count(key, value, num_alts, ploidy)
 
-    def _check_count(self, call, key, value, num_alts):
+    def _check_count(self, key, value, num_alts, ploidy):
         field_info = self.header.get_format_field_info(key)
-        if isinstance(value, list):
-            return
-        num_alleles = len(call.gt_alleles or [])
-        TABLE = {
-            ".": len(value),
-            "A": num_alts,
-            "R": num_alts + 1,
-            "G": binomial(num_alts + num_alleles, num_alleles),
-        }
-        expected = TABLE.get(field_info.number, field_info.number)
-        if len(value) != expected:
+        if ploidy is None and field_info.number == header.HEADER_NUMBER_GENOTYPES:
+            return  # no GT, the number of genotypes is unknown
+        expected = expected_count(field_info.number, num_alts, ploidy)
+        if expected is not None and len(value) != expected:
             tpl = (
                 "Number of elements for FORMAT field {} is {} instead "
                 "of {} (number specifier {})"
             )
-            warnings.warn(
-                tpl.format(key, len(value), expected, field_info.number),
+            self.diagnostics.report(
                 exceptions.IncorrectListLength,
+                key,
+                tpl,
+                key,
+                len(value),
+                expected,
+                field_info.number,
             )
 
 
@@ -692,17 +898,70 @@ class Parser:
     :param stream: ``file``-like object to read from
     :param str path: path the VCF is parsed from, for display purposes
         only, optional
+    :param list record_checks: record checks to perform, can contain
+        'INFO' and 'FORMAT'
+    :param bool lazy_info: whether to decode INFO values only on first
+        access, see :py:class:`~vcfpy.record.LazyInfo`
+    :param bool lazy_calls: whether to build calls only on first access,
+        see :py:class:`~vcfpy.record.LazyCalls`
+    :param int buffer_size: number of characters to read from the stream
+        at once, the chunks are split into lines by the parser; ``None``
+        (the default) for reading line by line with ``readline()``.  Note
+        that reading a chunk blocks until ``buffer_size`` characters are
+        available, so only use chunks for reading whole files.
+    :param bool sites_only: whether to only parse the first eight columns,
+        the FORMAT and sample columns are dropped and the header has no
+        samples
+    :param diagnostics: :py:class:`~vcfpy.warn_utils.Diagnostics` to report
+        problems in the records to, a new one is created by default
+    :param bool check_filters: whether to check the FILTER and FORMAT/FT
+        values against the header, independent of ``record_checks``
+
+    The ``stream`` can also be opened in binary mode.  The header is then
+    decoded as UTF-8 and records are parsed from ``bytes``, see
+    :py:meth:`RecordParser._split_line_bytes`.
     """
 
-    def __init__(self, stream, path=None, record_checks=None):
+    def __init__(
+        self,
+        stream,
+        path=None,
+        record_checks=None,
+        lazy_info=False,
+        lazy_calls=False,
+        buffer_size=None,
+        sites_only=False,
+        diagnostics=None,
+        check_filters=True,
+    ):
         self.stream = stream
         self.path = path
         #: checks to perform, can contain 'INFO' and 'FORMAT'
         self.record_checks = tuple(record_checks or [])
+        #: whether to decode INFO values only on first access
+        self.lazy_info = lazy_info
+        #: whether to build calls only on first access
+        self.lazy_calls = lazy_calls
+        #: number of characters to read at once, ``None`` for line by line
+        self.buffer_size = buffer_size
+        #: whether to only parse the first eight columns
+        self.sites_only = sites_only
+        #: :py:class:`~vcfpy.warn_utils.Diagnostics` with the problems found
+        #: in the records
+        if diagnostics is None:
+            diagnostics = warn_utils.Diagnostics()
+        self.diagnostics = diagnostics
+        #: whether to check the FILTER and FORMAT/FT values
+        self.check_filters = check_filters
         #: header, once it has been read
         self.header = None
-        # the currently read line
-        self._line = stream.readline()  # trailing '\n'
+        # iterator over the lines of the current chunk and the incomplete
+        # line at its end
+        self._chunk_lines = iter(())
+        self._partial_line = ""
+        # the currently read line, without line break when read in chunks
+        self._line = None
+        self._read_next_line()
         #: :py:class:`vcfpy.header.SamplesInfos` with sample information;
         #: set on parsing the header
         self.samples = None
@@ -714,9 +973,37 @@ class Parser:
     def _read_next_line(self):
         """Read next line store in self._line and return old one"""
         prev_line = self._line
-        self._line = self.stream.readline()
+        if not self.buffer_size:
+            self._line = self.stream.readline()
+            return prev_line
+        line = next(self._chunk_lines, None)
+        if line is None:
+            self._chunk_lines = self._read_chunk_lines()
+            line = next(self._chunk_lines, "")  # "" at EOF
+        self._line = line
         return prev_line
 
+    def _decode_line(self):
+        """Decode ``self._line`` if read from binary stream, for the header"""
+        if type(self._line) is bytes:
+            self._line = self._line.decode()
+
+    def _read_chunk_lines(self):
+        """Read next chunk from the stream and return iterator over its
+        lines; the incomplete line at the end of the chunk is completed with
+        the next one, the iterator is empty at EOF"""
+        while True:
+            chunk = self.stream.read(self.buffer_size)
+            if not chunk:
+                line, self._partial_line = self._partial_line, ""
+                return iter([line] if line else [])
+            if self._partial_line:
+                chunk = self._partial_line + chunk
+            lines = chunk.split("\n" if type(chunk) is str else b"\n")
+            self._partial_line = lines.pop()
+            if lines:
+                return iter(lines)
+
     def parse_header(self, parsed_samples=None):
         """Read and parse :py:class:`vcfpy.header.Header` from file, set
         into ``self.header`` and return it
@@ -730,20 +1017,34 @@ class Parser:
         # parse header lines
         sub_parser = HeaderParser()
         header_lines = []
+        self._decode_line()
         while self._line and self._line.startswith("##"):
             header_lines.append(sub_parser.parse_line(self._line))
             self._read_next_line()
+            self._decode_line()
         # parse sample info line
         self.samples = self._handle_sample_line(parsed_samples)
+        if self.sites_only:
+            self.samples = header.SamplesInfos([])
         # construct Header object
         self.header = header.Header(header_lines, self.samples)
+        self.header.diagnostics = self.diagnostics
         # check header for consistency
         self._header_checker.run(self.header)
         # construct record parser
-        self._record_parser = RecordParser(self.header, self.samples, self.record_checks)
+        self._record_parser = RecordParser(
+            self.header,
+            self.samples,
+            self.record_checks,
+            self.lazy_info,
+            self.lazy_calls,
+            self.sites_only,
+            self.diagnostics,
+            self.check_filters,
+        )
         # read next line, must not be header
         self._read_next_line()
-        if self._line and self._line.startswith("#"):
+        if self._line and self._line[:1] in ("#", b"#"):
             raise exceptions.IncorrectVCFFormat(
                 'Expecting non-header line or EOF after "#CHROM" line'
             )
@@ -792,6 +1093,30 @@ class Parser:
         """Pare the given line without reading another one from the stream"""
         return self._record_parser.parse_line(line)
 
+    def parse_lines(self, lines):
+        """Parse the given raw record lines and return ``list`` of
+        :py:class:`vcfpy.record.Record`"""
+        parse_line = self._record_parser.parse_line
+        return [parse_line(line) for line in lines]
+
+    def read_raw_lines(self, count):
+        """Read up to ``count`` raw record lines from the stream, fewer lines
+        are returned at the end of the file; the lines have no line breaks
+        unless ``buffer_size`` is ``None``"""
+        result = []
+        while len(result) < count:
+            line = self._read_next_line()
+            if not line.rstrip():
+                break  # empty line, EOF
+            result.append(line)
+        return result
+
+    def parse_genotype_arrays(self, lines, fields=("GT",), ploidy=None):
+        """Parse the given raw lines into
+        :py:class:`~vcfpy.arrays.GenotypeArrays`, see
+        :py:func:`~vcfpy.arrays.build_genotype_arrays`"""
+        return arrays.build_genotype_arrays(self._record_parser, lines, fields, ploidy)
+
     def parse_next_record(self):
         """Read, parse and return next :py:class:`vcfpy.record.Record`
 
@@ -801,6 +1126,21 @@ class Parser:
         """
         return self.parse_line(self._read_next_line())
 
-    def print_warn_summary(self):
-        """If there were any warnings, print summary with warnings"""
-        # TODO: remove?
+    def print_warn_summary(self, file=None):
+        """If there were any warnings, print summary with warnings
+
+        :param file: ``file``-like object to print to, defaults to
+            ``sys.stderr``
+        """
+        file = file or sys.stderr
+        if self.header is not None and self.header.missing_field_counts:
+            print("Fields not found in header:", file=file)
+            for (type_, key), count in sorted(self.header.missing_field_counts.items()):
+                info = self.header.get_missing_field_info(type_, key)
+                print(
+                    "  {} {}: {} occurrences, used {}/{}".format(
+                        type_, key, count, info.type, repr(info.number)
+                    ),
+                    file=file,
+                )
+        self.diagnostics.print_summary(file)
@@ -3,11 +3,10 @@
 """
 
 import gzip
-import os
-
-import pysam
-
+import itertools
+from . import bgzf
 from . import parser
+from . import tabix
 
 __author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
 
@@ -38,7 +37,18 @@ class Reader:
 
     @classmethod
     def from_stream(
-        klass, stream, path=None, tabix_path=None, record_checks=None, parsed_samples=None
+        klass,
+        stream,
+        path=None,
+        tabix_path=None,
+        record_checks=None,
+        parsed_samples=None,
+        lazy_info=False,
+        lazy_calls=False,
+        buffer_size=None,
+        sites_only=False,
+        diagnostics=None,
+        check_filters=True,
     ):
         """Create new :py:class:`Reader` from file
 
@@ -53,6 +63,21 @@ class Reader:
         :param list parsed_samples: ``list`` of ``str`` values with names of
             samples to parse call information for (for speedup); leave to
             ``None`` for ignoring
+        :param bool lazy_info: decode INFO values only on first access (for
+            speedup), see :py:class:`~vcfpy.record.LazyInfo`
+        :param bool lazy_calls: build calls only on first access (for
+            speedup), see :py:class:`~vcfpy.record.LazyCalls`
+        :param int buffer_size: number of characters to read from the
+            stream at once (for speedup when reading whole files, e.g.,
+            :py:data:`vcfpy.parser.DEFAULT_BUFFER_SIZE`), by default
+            ``None`` for reading line by line
+        :param bool sites_only: only parse the first eight columns (for
+            speedup), the records have no calls and the header no samples
+        :param diagnostics: :py:class:`~vcfpy.warn_utils.Diagnostics` to
+            report problems in the records to, instead of issuing a warning
+            for each
+        :param bool check_filters: whether to check the FILTER and FORMAT/FT
+            values against the header, independent of ``record_checks``
         """
         record_checks = record_checks or []
         if tabix_path and not path:
@@ -63,10 +88,29 @@ class Reader:
             tabix_path=tabix_path,
             record_checks=record_checks,
             parsed_samples=parsed_samples,
+            lazy_info=lazy_info,
+            lazy_calls=lazy_calls,
+            buffer_size=buffer_size,
+            sites_only=sites_only,
+            diagnostics=diagnostics,
+            check_filters=check_filters,
         )
 
     @classmethod
-    def from_path(klass, path, tabix_path=None, record_checks=None, parsed_samples=None):
+    def from_path(
+        klass,
+        path,
+        tabix_path=None,
+        record_checks=None,
+        parsed_samples=None,
+        lazy_info=False,
+        lazy_calls=False,
+        buffer_size=None,
+        binary=False,
+        sites_only=False,
+        diagnostics=None,
+        check_filters=True,
+    ):
         """Create new :py:class:`Reader` from path
 
         .. note::
@@ -75,50 +119,119 @@ class Reader:
 
         :param path: the path to load from (converted to ``str`` for
             compatibility with ``path.py``)
-        :param tabix_path: optional string with path to TBI index,
+        :param tabix_path: optional string with path to TBI or CSI index,
             automatic inferral from ``path`` will be tried on the fly
             if not given
         :param list record_checks: record checks to perform, can contain
             'INFO' and 'FORMAT'
+        :param list parsed_samples: ``list`` of ``str`` values with names of
+            samples to parse call information for (for speedup); leave to
+            ``None`` for ignoring
+        :param bool lazy_info: decode INFO values only on first access (for
+            speedup), see :py:class:`~vcfpy.record.LazyInfo`
+        :param bool lazy_calls: build calls only on first access (for
+            speedup), see :py:class:`~vcfpy.record.LazyCalls`
+        :param int buffer_size: number of characters to read from the
+            stream at once (for speedup when reading whole files, e.g.,
+            :py:data:`vcfpy.parser.DEFAULT_BUFFER_SIZE`), by default
+            ``None`` for reading line by line
+        :param bool binary: whether to open the file in binary mode and parse
+            the records from ``bytes``; the INFO column with ``lazy_info``
+            and the sample columns with ``lazy_calls`` are then only decoded
+            on access, so use this together with the lazy modes
+        :param bool sites_only: only parse the first eight columns (for
+            speedup), the records have no calls and the header no samples
+        :param diagnostics: :py:class:`~vcfpy.warn_utils.Diagnostics` to
+            report problems in the records to, instead of issuing a warning
+            for each
+        :param bool check_filters: whether to check the FILTER and FORMAT/FT
+            values against the header, independent of ``record_checks``
         """
         record_checks = record_checks or []
         path = str(path)
+        mode = "rb" if binary else "rt"
         if path.endswith(".gz"):
-            f = gzip.open(path, "rt")
+            if bgzf.is_bgzf_file(path):
+                f = bgzf.BgzfReader(path, mode)
+            else:  # plain gzip, can only be read sequentially
+                f = gzip.open(path, mode)
             if not tabix_path:
-                tabix_path = path + ".tbi"
-                if not os.path.exists(tabix_path):
-                    tabix_path = None  # guessing path failed
+                tabix_path = tabix.find_index(path)  # None if guessing failed
         else:
-            f = open(path, "rt")
+            f = open(path, mode)
         return klass.from_stream(
             stream=f,
             path=path,
             tabix_path=tabix_path,
             record_checks=record_checks,
             parsed_samples=parsed_samples,
+            lazy_info=lazy_info,
+            lazy_calls=lazy_calls,
+            buffer_size=buffer_size,
+            sites_only=sites_only,
+            diagnostics=diagnostics,
+            check_filters=check_filters,
         )
 
-    def __init__(self, stream, path=None, tabix_path=None, record_checks=None, parsed_samples=None):
+    def __init__(
+        self,
+        stream,
+        path=None,
+        tabix_path=None,
+        record_checks=None,
+        parsed_samples=None,
+        lazy_info=False,
+        lazy_calls=False,
+        buffer_size=None,
+        sites_only=False,
+        diagnostics=None,
+        check_filters=True,
+    ):
         #: stream (``file``-like object) to read from
         self.stream = stream
         #: optional ``str`` with the path to the stream
         self.path = path
-        #: optional ``str`` with path to tabix file
+        #: optional ``str`` with path to TBI or CSI index file
         self.tabix_path = tabix_path
         #: checks to perform on records, can contain 'FORMAT' and 'INFO'
         self.record_checks = tuple(record_checks or [])
         #: if set, list of samples to parse for
         self.parsed_samples = parsed_samples
-        #: the ``pysam.TabixFile`` used for reading from index bgzip-ed VCF;
-        #: constructed on the fly
+        #: whether to decode INFO values only on first access
+        self.lazy_info = lazy_info
+        #: whether to build calls only on first access
+        self.lazy_calls = lazy_calls
+        #: number of characters to read at once, ``None`` for line by line
+        self.buffer_size = buffer_size
+        #: whether to only parse the first eight columns
+        self.sites_only = sites_only
+        #: the :py:class:`~vcfpy.bgzf.BgzfReader` used for reading from
+        #: index bgzip-ed VCF; constructed on the fly
         self.tabix_file = None
+        #: the :py:class:`~vcfpy.tabix.TabixIndex` used for reading from
+        #: index bgzip-ed VCF; loaded on the fly
+        self.tabix_index = None
         # the iterator through the Tabix file to use
         self.tabix_iter = None
         #: the parser to use
-        self.parser = parser.Parser(stream, self.path, self.record_checks)
+        self.parser = parser.Parser(
+            stream,
+            self.path,
+            self.record_checks,
+            self.lazy_info,
+            self.lazy_calls,
+            self.buffer_size,
+            self.sites_only,
+            diagnostics,
+            check_filters,
+        )
+        #: the :py:class:`~vcfpy.warn_utils.Diagnostics` with the problems
+        #: found in the records
+        self.diagnostics = self.parser.diagnostics
         #: the Header
         self.header = self.parser.parse_header(parsed_samples)
+        # whether the summary of the problems was printed on closing
+        self._warn_summary_printed = False
 
     def fetch(self, chrom_or_region, begin=None, end=None):
         """Jump to the start position of the given chromosomal position
@@ -132,21 +245,105 @@ class Reader:
         """
         if begin is not None and end is None:
             raise ValueError("begin and end must both be None or neither")
-        # close tabix file if any and is open
-        if self.tabix_file and not self.tabix_file.closed:
-            self.tabix_file.close()
-        # open tabix file if not yet open
-        if not self.tabix_file or self.tabix_file.closed:
-            self.tabix_file = pysam.TabixFile(filename=self.path, index=self.tabix_path)
+        self._open_tabix()
         # jump to the next position
         if begin is None:
-            self.tabix_iter = self.tabix_file.fetch(region=chrom_or_region)
+            chrom, begin, end = self.tabix_index.parse_region(chrom_or_region)
         else:
-            self.tabix_iter = self.tabix_file.fetch(reference=chrom_or_region, start=begin, end=end)
+            chrom = chrom_or_region
+        self.tabix_iter = tabix.fetch_lines(self.tabix_file, self.tabix_index, chrom, begin, end)
+        return self
+
+    def fetch_many(self, regions):
+        """Limit iteration to the records overlapping any of the given
+        regions
+
+        The regions are sorted and overlapping regions are merged, so each
+        record is yielded once and in the order of the file.
+
+        :param regions: iterable of samtools region strings (e.g.,
+            "chr1:123,456-123,900") or ``(chrom, begin, end)`` triples with
+            0-based begin (inclusive) and end (exclusive) positions
+        """
+        self._open_tabix()
+        regions = tabix.merge_regions(self.tabix_index, regions)
+        self.tabix_iter = tabix.fetch_lines_many(self.tabix_file, self.tabix_index, regions)
         return self
 
+    def _open_tabix(self):
+        """Load index and open file for indexed access if not done yet, both
+        are kept for subsequent queries"""
+        if self.tabix_file and not self.tabix_file.closed:
+            return
+        tabix_path = self.tabix_path or tabix.find_index(self.path)
+        if not tabix_path:
+            raise FileNotFoundError("Could not find index for {}".format(self.path))
+        self.tabix_index = tabix.TabixIndex.from_path(tabix_path)
+        self.tabix_file = bgzf.BgzfReader(self.path, "rt")
+
+    def iter_batches(self, size):
+        """Yield ``list`` objects of up to ``size``
+        :py:class:`~vcfpy.record.Record` objects each, until the end of the
+        file or the fetched region
+
+        The raw lines of a batch are read in one go and then parsed in one
+        loop, which saves the per-record overhead of the iteration with
+        ``next()``.  Batching and iterating the :py:class:`Reader` can be
+        mixed.
+
+        :param int size: maximal number of records per batch
+        """
+        if size < 1:
+            raise ValueError("Batch size must be positive but was {}".format(size))
+        while True:
+            if self.tabix_iter:
+                lines = list(itertools.islice(self.tabix_iter, size))
+            else:
+                lines = self.parser.read_raw_lines(size)
+            if not lines:
+                return
+            yield self.parser.parse_lines(lines)
+
+    def read_genotype_arrays(self, size, fields=("GT",), ploidy=None):
+        """Read the next ``size`` records as
+        :py:class:`~vcfpy.arrays.GenotypeArrays`, bypassing the construction
+        of :py:class:`~vcfpy.record.Record` and :py:class:`~vcfpy.record.Call`
+        objects.  Requires NumPy.
+
+        :param int size: maximal number of records to read
+        :param fields: FORMAT keys to build arrays for, ``"GT"`` is stored in
+            separate arrays, all others must be of type ``Integer`` or
+            ``Float``
+        :param int ploidy: size of the last axis of the ``GT`` array,
+            defaults to the largest ploidy in the batch
+        :returns: :py:class:`~vcfpy.arrays.GenotypeArrays` or ``None`` if at
+            end
+        """
+        if self.sites_only:
+            raise ValueError("Cannot read genotype arrays when parsing only the sites")
+        if self.tabix_iter:
+            lines = list(itertools.islice(self.tabix_iter, size))
+        else:
+            lines = self.parser.read_raw_lines(size)
+        if not lines:
+            return None
+        return self.parser.parse_genotype_arrays(lines, fields, ploidy)
+
+    def print_warn_summary(self, file=None):
+        """Print summary of the problems found while parsing, see
+        :py:meth:`~vcfpy.parser.Parser.print_warn_summary`"""
+        self.parser.print_warn_summary(file)
+
     def close(self):
-        """Close underlying stream"""
+        """Close underlying stream
+
+        If the :py:class:`~vcfpy.warn_utils.Diagnostics` issue warnings,
+        the summary of the problems found while parsing is printed to
+        ``sys.stderr`` on the first call, see :py:meth:`print_warn_summary`.
+        """
+        if self.diagnostics.warn and not self._warn_summary_printed:
+            self._warn_summary_printed = True
+            self.print_warn_summary()
         if self.tabix_file and not self.tabix_file.closed:
             self.tabix_file.close()
         if self.stream:
@@ -170,7 +367,7 @@ class Reader:
         :raises: ``StopException`` if at end
         """
         if self.tabix_iter:
-            return self.parser.parse_line(str(next(self.tabix_iter)))
+            return self.parser.parse_line(next(self.tabix_iter))
         else:
             result = self.parser.parse_next_record()
             if result is None:
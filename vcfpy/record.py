@@ -4,8 +4,12 @@
 The VCF record structure is modeled after the one of PyVCF
 """
 
+from collections import namedtuple
+from collections.abc import Mapping, MutableMapping, Sequence
 import re
 
+from .compat import OrderedDict
+
 
 #: Code for single nucleotide variant allele
 SNV = "SNV"
@@ -51,13 +55,47 @@ ESCAPE_MAPPING = [
 UNESCAPE_MAPPING = [(v, k) for k, v in ESCAPE_MAPPING]
 
 
+def _slot_values(obj):
+    """Return ``dict`` with the values of the public slots of ``obj``, the
+    counterpart of ``obj.__dict__`` for the classes using ``__slots__``"""
+    return {
+        name: getattr(obj, name, None)
+        for klass in type(obj).__mro__
+        for name in getattr(klass, "__slots__", ())
+        if not name.startswith("_")
+    }
+
+
 class Record:
     """Represent one record from the VCF file
 
     Record objects are iterators of their calls
+
+    :param samples: optional :py:class:`~vcfpy.header.SamplesInfos`, the
+        ``calls`` must then be given in the order of the sample names and
+        :py:attr:`~Record.call_for_sample` uses its sample indices
     """
 
-    def __init__(self, CHROM, POS, ID, REF, ALT, QUAL, FILTER, INFO, FORMAT=None, calls=None):
+    __slots__ = (
+        "CHROM",
+        "POS",
+        "begin",
+        "end",
+        "ID",
+        "REF",
+        "ALT",
+        "QUAL",
+        "FILTER",
+        "INFO",
+        "FORMAT",
+        "calls",
+        "_samples",
+        "_call_for_sample",
+    )
+
+    def __init__(
+        self, CHROM, POS, ID, REF, ALT, QUAL, FILTER, INFO, FORMAT=None, calls=None, samples=None
+    ):
         if bool(FORMAT) != bool(calls):
             raise ValueError("Either provide both FORMAT and calls or none.")
         #: A ``str`` with the chromosome name
@@ -69,11 +107,13 @@ class Record:
         #: An ``int`` with a 0-based end position
         self.end = None  # XXX
         #: A list of the semicolon-separated values of the ID column
-        self.ID = list(ID)
+        self.ID = ID if type(ID) is list else list(ID)
         #: A ``str`` with the REF value
         self.REF = REF
-        #: A list of alternative allele records of type :py:class:`AltRecord`
-        self.ALT = list(ALT)
+        #: A list of alternative allele records of type :py:class:`AltRecord`,
+        #: the parser shares immutable objects between records for common
+        #: alleles, see :py:class:`FrozenSubstitution`
+        self.ALT = ALT if type(ALT) is list else list(ALT)
         #: The quality value, can be ``None``
         self.QUAL = QUAL
         #: A list of strings for the FILTER column
@@ -85,12 +125,35 @@ class Record:
         #: and only if ``calls`` is also given.
         self.FORMAT = FORMAT or ()
         #: A list of genotype :py:class:`Call` objects.  Optional, must be given if
-        #: and only if ``FORMAT`` is also given.
-        self.calls = list(calls or ())
-        for call in self.calls:
-            call.site = self
-        #: A mapping from sample name to entry in self.calls.
-        self.call_for_sample = {call.sample: call for call in self.calls}
+        #: and only if ``FORMAT`` is also given.  Can also be a
+        #: :py:class:`LazyCalls` object that builds the calls on access.
+        if isinstance(calls, LazyCalls):
+            self.calls = calls
+            self.calls.site = self
+            samples = calls.samples
+        else:
+            self.calls = calls if type(calls) is list else list(calls or ())
+            for call in self.calls:
+                call.site = self
+        self._samples = samples
+        self._call_for_sample = None
+
+    @property
+    def call_for_sample(self):
+        """A mapping from sample name to entry in self.calls, derived on
+        first access"""
+        mapping = self._call_for_sample
+        if mapping is None or (
+            type(mapping) is LazyCallForSample and mapping.calls is not self.calls
+        ):
+            # first access or self.calls has been reassigned
+            mapping = LazyCallForSample(self.calls, self._samples)
+            self._call_for_sample = mapping
+        return mapping
+
+    @call_for_sample.setter
+    def call_for_sample(self, value):
+        self._call_for_sample = value
 
     def is_snv(self):
         """Return ``True`` if it is a SNV"""
@@ -159,7 +222,7 @@ class Record:
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -168,7 +231,7 @@ class Record:
         return NotImplemented
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(tuple(sorted(_slot_values(self).items())))
 
     def __str__(self):
         tpl = "Record({})"
@@ -190,10 +253,272 @@ class Record:
         return str(self)
 
 
+class LazyInfo(MutableMapping):
+    """Mapping for the INFO column that decodes values on first access
+
+    The raw INFO string is only split into its entries when the mapping is
+    first used and each value is only decoded when it is accessed.  The
+    :py:class:`~vcfpy.writer.Writer` will write out entries that have not
+    been accessed verbatim.  All values are decoded when pickling.
+
+    :param raw: the raw value of the INFO column, ``str`` or ``bytes``
+    :param split: callable returning list of ``(key, raw value)`` pairs
+        for ``raw``, flags have the raw value ``True``
+    :param decode: callable for converting ``(key, raw value)`` into the
+        parsed value
+    """
+
+    def __init__(self, raw, split, decode):
+        #: ``str`` or ``bytes`` with the raw INFO column value
+        self.raw = raw
+        #: whether entries were added, assigned, or removed
+        self.modified = False
+        # helpers for splitting and decoding
+        self._split = split
+        self._decode = decode
+        # OrderedDict with raw values, built on first access
+        self._raw_values = None
+        # ``dict`` with the decoded values
+        self._values = {}
+
+    def _entries(self):
+        """Return OrderedDict with raw values, splitting ``self.raw`` if
+        necessary"""
+        if self._raw_values is None:
+            self._raw_values = OrderedDict(self._split(self.raw))
+        return self._raw_values
+
+    def is_decoded(self, key):
+        """Return whether the value for ``key`` has been decoded or set"""
+        return key in self._values
+
+    def is_pristine(self):
+        """Return whether no value has been decoded or modified yet"""
+        return not self._values and not self.modified
+
+    def raw_value(self, key):
+        """Return raw value for ``key``, ``True`` for flags"""
+        return self._entries()[key]
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        value = self._decode(key, self._entries()[key])
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._entries().setdefault(key, None)
+        self._values[key] = value
+        self.modified = True
+
+    def __delitem__(self, key):
+        del self._entries()[key]
+        self._values.pop(key, None)
+        self.modified = True
+
+    def __iter__(self):
+        return iter(self._entries())
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key):
+        return key in self._entries()
+
+    def copy(self):
+        """Return ``OrderedDict`` with all values decoded"""
+        return OrderedDict(self.items())
+
+    def __getstate__(self):
+        # the helpers belong to the parser and cannot be pickled, so all
+        # values are decoded before
+        state = self.__dict__.copy()
+        state["_values"] = {
+            key: self._values[key] if key in self._values else self._decode(key, value)
+            for key, value in self._entries().items()
+        }
+        state["_raw_values"] = self._raw_values
+        state["_split"] = state["_decode"] = None
+        return state
+
+    def __str__(self):
+        return repr(self.copy())
+
+    def __repr__(self):
+        return str(self)
+
+
+class LazyCalls(Sequence):
+    """Sequence of the calls of a record that are only built on access
+
+    The raw sample columns are kept as one string and only split when the
+    first call is accessed.  Each :py:class:`Call` is built when it is
+    accessed for the first time.  The :py:class:`~vcfpy.writer.Writer` will
+    write out the columns of calls that have not been accessed verbatim, as
+    long as the record's FORMAT has not been changed.  All calls are built
+    when pickling.
+
+    :param samples: :py:class:`~vcfpy.header.SamplesInfos` describing the
+        sample columns
+    :param raw: the raw, tab-separated sample columns, ``str`` or ``bytes``
+    :param build: callable for converting ``(sample, raw column)`` into a
+        :py:class:`Call` or :py:class:`UnparsedCall`
+    :param format_: the FORMAT keys of the raw sample columns
+    """
+
+    def __init__(self, samples, raw, build, format_=None):
+        #: :py:class:`~vcfpy.header.SamplesInfos` with the sample names
+        self.samples = samples
+        #: ``str`` or ``bytes`` with the raw sample columns
+        self.raw = raw
+        #: ``tuple`` with the FORMAT keys of the raw sample columns, ``None``
+        #: if unknown
+        self.format = None if format_ is None else tuple(format_)
+        #: the :py:class:`Record` of the calls
+        self.site = None
+        # helper for building calls
+        self._build = build
+        # list of raw columns, built on first access
+        self._raw_columns = None
+        # mapping from index to already built calls
+        self._calls = {}
+
+    def raw_column(self, idx):
+        """Return raw column for the call with the given index"""
+        if self._raw_columns is None:
+            self._raw_columns = self.raw.split("\t" if type(self.raw) is str else b"\t")
+        return self._raw_columns[idx]
+
+    def is_materialized(self, idx):
+        """Return whether the call with the given index has been built"""
+        return idx in self._calls
+
+    def any_materialized(self):
+        """Return whether any call has been built"""
+        return bool(self._calls)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        call = self._calls.get(idx)
+        if call is None:
+            if not 0 <= idx < len(self):
+                raise IndexError("call index out of range")
+            call = self._build(self.samples.names[idx], self.raw_column(idx))
+            call.site = self.site
+            self._calls[idx] = call
+        return call
+
+    def __len__(self):
+        return len(self.samples.names)
+
+    def __getstate__(self):
+        # the helper belongs to the parser and cannot be pickled, so all
+        # calls are built before
+        state = self.__dict__.copy()
+        calls = {}
+        for idx, sample in enumerate(self.samples.names):
+            call = self._calls.get(idx)
+            if call is None:
+                call = self._build(sample, self.raw_column(idx))
+                call.site = self.site
+            calls[idx] = call
+        state["_calls"] = calls
+        state["_build"] = None
+        return state
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazyCalls)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, (list, LazyCalls)):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    def __hash__(self):
+        raise TypeError("Unhashable type: LazyCalls")
+
+    def __str__(self):
+        return repr(list(self))
+
+    def __repr__(self):
+        return str(self)
+
+
+class LazyCallForSample(Mapping):
+    """Mapping from sample name to call using the sample indices of
+    :py:class:`~vcfpy.header.SamplesInfos`, instead of building a ``dict``
+    for each record
+
+    The sample indices are only used while the call at the index belongs to
+    the sample.  Otherwise, e.g., after calls have been removed from the
+    list, the positions of the calls are looked up in a ``dict`` that is
+    rebuilt when the number of calls changes or a call has moved.
+
+    :param calls: ``list`` of calls or :py:class:`LazyCalls`, usually in the
+        order of the sample names
+    :param samples: the :py:class:`~vcfpy.header.SamplesInfos` or ``None``
+    """
+
+    __slots__ = ("calls", "samples", "_positions")
+
+    def __init__(self, calls, samples):
+        #: the calls to map into
+        self.calls = calls
+        #: the :py:class:`~vcfpy.header.SamplesInfos`
+        self.samples = samples
+        # position in calls by sample name, built when the calls are not in
+        # the order of the samples
+        self._positions = None
+
+    def _index(self, name):
+        """Return index of the call for ``name`` in ``calls`` or ``None``"""
+        calls = self.calls
+        if type(calls) is LazyCalls:
+            # the calls of LazyCalls are always in the order of its samples
+            return calls.samples.name_to_idx.get(name)
+        if self.samples is not None:
+            idx = self.samples.name_to_idx.get(name)
+            if idx is not None and idx < len(calls) and calls[idx].sample == name:
+                return idx
+        positions = self._positions
+        if positions is None or len(positions) != len(calls):
+            positions = self._positions = {call.sample: i for i, call in enumerate(calls)}
+        idx = positions.get(name)
+        if idx is not None and (idx >= len(calls) or calls[idx].sample != name):
+            positions = self._positions = {call.sample: i for i, call in enumerate(calls)}
+            idx = positions.get(name)
+        return idx
+
+    def __getitem__(self, name):
+        idx = self._index(name)
+        if idx is None:
+            raise KeyError(name)
+        return self.calls[idx]
+
+    def __contains__(self, name):
+        return self._index(name) is not None
+
+    def __iter__(self):
+        if isinstance(self.calls, LazyCalls):
+            return iter(self.samples.names)
+        return (call.sample for call in self.calls)
+
+    def __len__(self):
+        return len(self.calls)
+
+
 class UnparsedCall:
     """Placeholder for :py:class:`Call` when parsing only a subset of fields
     """
 
+    __slots__ = ("sample", "unparsed_data", "site")
+
     def __init__(self, sample, unparsed_data, site=None):
         #: the name of the sample for which the call was made
         self.sample = sample
@@ -206,6 +531,52 @@ class UnparsedCall:
 #: Regular expression for splitting alleles
 ALLELE_DELIM = re.compile(r"[|/]")
 
+#: Maximal number of distinct GT strings for which the :py:class:`Genotype`
+#: is cached by :py:func:`parse_genotype`
+GENOTYPE_CACHE_MAX_SIZE = 10000
+
+
+class Genotype(namedtuple("Genotype", ("alleles", "phased", "called", "ploidy", "gt_type"))):
+    """Immutable description of a GT string, shared by all calls with the
+    same GT string, see :py:func:`parse_genotype`
+
+    ``alleles`` is a ``tuple`` of allele numbers with ``None`` for no-calls,
+    ``gt_type`` is one of ``HOM_REF``, ``HET``, ``HOM_ALT``, or ``None``
+    if not fully called.
+    """
+
+    __slots__ = ()
+
+
+# Genotype objects by GT string
+_GENOTYPES = {}
+
+
+def parse_genotype(gt_str):
+    """Return :py:class:`Genotype` for the given GT string, e.g., ``"0/1"``
+
+    There only are few distinct GT strings in a file, so the results are
+    cached and the string is only split once.
+    """
+    result = _GENOTYPES.get(gt_str)
+    if result is None:
+        alleles = tuple(
+            None if allele == "." else int(allele) for allele in ALLELE_DELIM.split(gt_str)
+        )
+        called = all(a is not None for a in alleles)
+        if not called:
+            gt_type = None
+        elif all(a == 0 for a in alleles):
+            gt_type = HOM_REF
+        elif len(set(alleles)) == 1:
+            gt_type = HOM_ALT
+        else:
+            gt_type = HET
+        result = Genotype(alleles, "|" in gt_str, called, len(alleles), gt_type)
+        if len(_GENOTYPES) < GENOTYPE_CACHE_MAX_SIZE:
+            _GENOTYPES[gt_str] = result
+    return result
+
 
 class Call:
     """The information for a genotype callable
@@ -215,6 +586,8 @@ class Call:
     coverage at the variant position.
     """
 
+    __slots__ = ("sample", "data", "site", "genotype", "gt_alleles", "called", "ploidy")
+
     def __init__(self, sample, data, site=None):
         #: the name of the sample for which the call was made
         self.sample = sample
@@ -223,27 +596,51 @@ class Call:
         self.data = data
         #: the :py:class:`Record` of this :py:class:`Call`
         self.site = site
+        #: the shared :py:class:`Genotype` for the GT value on construction
+        #: or None
+        self.genotype = None
         #: the allele numbers (0, 1, ...) in this calls or None for no-call
         self.gt_alleles = None
         #: whether or not the variant is fully called
         self.called = None
         #: the number of alleles in this sample's call
-        self.plodity = None
-        # My temporary fix
-        if self.data.get("GT", None) is not None and len(self.data.get("GT", None)) != 0:
-            self.gt_alleles = []
-            for allele in ALLELE_DELIM.split(self.data["GT"][0]):
-                if allele == ".":
-                    self.gt_alleles.append(None)
-                else:
-                    self.gt_alleles.append(int(allele))
-            self.called = all([al is not None for al in self.gt_alleles])
-            self.ploidty = len(self.gt_alleles)
+        self.ploidy = None
+        gt_str = self.data.get("GT")
+        if gt_str:
+            if type(gt_str) is not str:  # list if GT is not described in the header
+                gt_str = gt_str[0]
+            self.genotype = parse_genotype(gt_str)
+            self.gt_alleles = list(self.genotype.alleles)
+            self.called = self.genotype.called
+            self.ploidy = self.genotype.ploidy
+
+    @property
+    def plodity(self):
+        """Alias for :py:attr:`~Call.ploidy`, kept for backwards compatibility"""
+        return self.ploidy
+
+    @plodity.setter
+    def plodity(self, value):
+        self.ploidy = value
+
+    @property
+    def ploidty(self):
+        """Alias for :py:attr:`~Call.ploidy`, kept for backwards compatibility"""
+        return self.ploidy
+
+    @ploidty.setter
+    def ploidty(self, value):
+        self.ploidy = value
 
     @property
     def is_phased(self):
         """Return boolean indicating whether this call is phased"""
-        return "|" in self.data.get("GT", "")
+        gt_str = self.data.get("GT")
+        if not gt_str:
+            return False
+        elif type(gt_str) is not str:  # list if GT is not described in the header
+            gt_str = gt_str[0]
+        return "|" in gt_str
 
     @property
     def gt_phase_char(self):
@@ -270,7 +667,14 @@ class Call:
         """The type of genotype, returns one of ``HOM_REF``, ``HOM_ALT``, and
         ``HET``.
         """
-        if not self.called:
+        genotype = self.genotype
+        if (
+            genotype is not None
+            and self.called == genotype.called
+            and tuple(self.gt_alleles or ()) == genotype.alleles
+        ):
+            return genotype.gt_type  # not modified since construction
+        elif not self.called:
             return None  # not called
         elif all(a == 0 for a in self.gt_alleles):
             return HOM_REF
@@ -311,7 +715,7 @@ class Call:
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -320,7 +724,7 @@ class Call:
         return NotImplemented
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(tuple(sorted(_slot_values(self).items())))
 
     def __str__(self):
         tpl = "Call({})"
@@ -337,6 +741,8 @@ class AltRecord:
     Currently, can be a substitution, an SV placeholder, or breakend
     """
 
+    __slots__ = ("type",)
+
     def __init__(self, type_=None):
         #: String describing the type of the variant, could be one of
         #: SNV, MNV, could be any of teh types described in the ALT
@@ -345,7 +751,7 @@ class AltRecord:
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -354,7 +760,7 @@ class AltRecord:
         return NotImplemented
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(tuple(sorted(_slot_values(self).items())))
 
     def serialize(self):
         """Return ``str`` with representation for VCF file"""
@@ -368,6 +774,8 @@ class Substitution(AltRecord):
     Note that this subsumes MNVs, insertions, and deletions.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, type_, value):
         super().__init__(type_)
         #: The alternative base sequence to use in the substitution
@@ -378,7 +786,7 @@ class Substitution(AltRecord):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -387,7 +795,7 @@ class Substitution(AltRecord):
         return NotImplemented
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(tuple(sorted(_slot_values(self).items())))
 
     def __str__(self):
         tpl = "Substitution(type_={}, value={})"
@@ -411,6 +819,15 @@ REVERSE = "-"
 class BreakEnd(AltRecord):
     """A placeholder for a breakend"""
 
+    __slots__ = (
+        "mate_chrom",
+        "mate_pos",
+        "orientation",
+        "mate_orientation",
+        "sequence",
+        "within_main_assembly",
+    )
+
     def __init__(
         self, mate_chrom, mate_pos, orientation, mate_orientation, sequence, within_main_assembly
     ):
@@ -447,7 +864,7 @@ class BreakEnd(AltRecord):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -456,7 +873,7 @@ class BreakEnd(AltRecord):
         return NotImplemented
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(tuple(sorted(_slot_values(self).items())))
 
     def __str__(self):
         tpl = "BreakEnd({})"
@@ -477,12 +894,14 @@ class BreakEnd(AltRecord):
 class SingleBreakEnd(BreakEnd):
     """A placeholder for a single breakend"""
 
+    __slots__ = ()
+
     def __init__(self, orientation, sequence):
         super().__init__(None, None, orientation, None, sequence, None)
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -491,7 +910,7 @@ class SingleBreakEnd(BreakEnd):
         return NotImplemented
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(tuple(sorted(_slot_values(self).items())))
 
     def __str__(self):
         tpl = "SingleBreakEnd({})"
@@ -499,6 +918,39 @@ class SingleBreakEnd(BreakEnd):
         return tpl.format(", ".join(map(repr, vals)))
 
 
+class FrozenAltRecordMixin:
+    """Mixin for the :py:class:`AltRecord` objects that the parser shares
+    between records, their attributes can only be assigned once on
+    construction
+
+    Replace the entries of ``Record.ALT`` instead of modifying them.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(
+                "Cannot modify shared {} object, replace it in Record.ALT instead".format(
+                    self.__class__.__name__
+                )
+            )
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            "Cannot modify shared {} object, replace it in Record.ALT instead".format(
+                self.__class__.__name__
+            )
+        )
+
+
+class FrozenSubstitution(FrozenAltRecordMixin, Substitution):
+    """Immutable :py:class:`Substitution`, shared between records"""
+
+    __slots__ = ()
+
+
 class SymbolicAllele(AltRecord):
     """A placeholder for a symbolic allele
 
@@ -507,6 +959,8 @@ class SymbolicAllele(AltRecord):
     structural variants or IUPAC parameters.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         super().__init__(SYMBOLIC)
         #: The symbolic value, e.g. 'DUP'
@@ -517,7 +971,7 @@ class SymbolicAllele(AltRecord):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -526,10 +980,16 @@ class SymbolicAllele(AltRecord):
         return NotImplemented
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(tuple(sorted(_slot_values(self).items())))
 
     def __str__(self):
         return "SymbolicAllele({})".format(repr(self.value))
 
     def __repr__(self):
         return str(self)
+
+
+class FrozenSymbolicAllele(FrozenAltRecordMixin, SymbolicAllele):
+    """Immutable :py:class:`SymbolicAllele`, shared between records"""
+
+    __slots__ = ()
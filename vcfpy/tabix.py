@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+"""Support code for tabix (TBI) and CSI indices of BGZF-compressed VCF files
+
+See the `tabix <https://samtools.github.io/hts-specs/tabix.pdf>`_ and
+`CSI <https://samtools.github.io/hts-specs/CSIv1.pdf>`_ specifications for
+the binning scheme and the file formats.
+"""
+
+import os
+import struct
+
+from . import bgzf
+from . import exceptions
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+#: Minimal shift (size of the smallest bins and linear index windows) of TBI
+TBI_MIN_SHIFT = 14
+#: Depth of the binning index of TBI
+TBI_DEPTH = 5
+
+#: Value of the ``format`` header field for VCF files
+FORMAT_VCF = 2
+#: Column of the sequence name, 1-based
+COL_SEQ = 1
+#: Column of the begin position, 1-based
+COL_BEG = 2
+#: Column of the end position, ``0`` as the end is computed from REF/INFO
+COL_END = 0
+#: Character starting meta lines
+META_CHAR = "#"
+
+
+def reg2bin(begin, end, min_shift=TBI_MIN_SHIFT, depth=TBI_DEPTH):
+    """Return smallest bin fully containing the 0-based, half-open interval
+    ``[begin, end)``
+
+    >>> reg2bin(0, 1)
+    4681
+    >>> reg2bin(0, 1 << 14 + 1)
+    585
+    >>> reg2bin(0, 1 << 29)
+    0
+    """
+    end -= 1
+    shift = min_shift
+    offset = ((1 << depth * 3) - 1) // 7
+    for level in range(depth, 0, -1):
+        if begin >> shift == end >> shift:
+            return offset + (begin >> shift)
+        shift += 3
+        offset -= 1 << (level - 1) * 3
+    return 0
+
+
+def reg2bins(begin, end, min_shift=TBI_MIN_SHIFT, depth=TBI_DEPTH):
+    """Return list of all bins overlapping the 0-based, half-open interval
+    ``[begin, end)``
+
+    >>> reg2bins(0, 1)
+    [0, 1, 9, 73, 585, 4681]
+    """
+    end -= 1
+    result = []
+    shift = min_shift + depth * 3
+    offset = 0
+    for level in range(depth + 1):
+        result.extend(range(offset + (begin >> shift), offset + (end >> shift) + 1))
+        shift -= 3
+        offset += 1 << level * 3
+    return result
+
+
+def bin_first_pos(bin_, min_shift=TBI_MIN_SHIFT, depth=TBI_DEPTH):
+    """Return first 0-based position covered by ``bin_``"""
+    level, offset = 0, 0
+    while bin_ >= offset + (1 << level * 3):
+        offset += 1 << level * 3
+        level += 1
+    return (bin_ - offset) << (min_shift + (depth - level) * 3)
+
+
+def bin_parent(bin_):
+    """Return parent of ``bin_`` in the binning index"""
+    return (bin_ - 1) >> 3
+
+
+def bin_first(level):
+    """Return number of the first bin on the given ``level``"""
+    return ((1 << level * 3) - 1) // 7
+
+
+def find_index(path):
+    """Return path to the TBI or CSI index of the file at ``path`` or
+    ``None`` if none exists"""
+    for ext in (".tbi", ".csi"):
+        if os.path.exists(path + ext):
+            return path + ext
+    return None
+
+
+def csi_depth(max_length, min_shift=TBI_MIN_SHIFT):
+    """Return depth of a CSI binning index for sequences of up to
+    ``max_length`` positions, at least the depth of TBI"""
+    depth = TBI_DEPTH
+    while max_length > 1 << (min_shift + depth * 3):
+        depth += 1
+    return depth
+
+
+class IndexBuilder:
+    """Build a TBI or CSI index while writing a BGZF-compressed VCF file
+
+    Records have to be added with :py:meth:`~IndexBuilder.add` in the order
+    they are written out, together with the offsets of their first and past
+    their last byte in the uncompressed data.  The offsets are only converted
+    into virtual offsets in :py:meth:`~IndexBuilder.write`, after all blocks
+    have been compressed.
+
+    :param str fmt: index format, one of ``"tbi"`` and ``"csi"``
+    :param int min_shift: size of the smallest bins and linear index windows
+    :param int depth: depth of the binning index
+    """
+
+    def __init__(self, fmt="tbi", min_shift=TBI_MIN_SHIFT, depth=TBI_DEPTH):
+        if fmt not in ("tbi", "csi"):
+            raise ValueError("Invalid index format {}, must be tbi or csi".format(fmt))
+        if fmt == "tbi" and (min_shift, depth) != (TBI_MIN_SHIFT, TBI_DEPTH):
+            raise ValueError("TBI indices require min_shift=14 and depth=5")
+        #: index format, ``"tbi"`` or ``"csi"``
+        self.fmt = fmt
+        #: size of the smallest bins and linear index windows
+        self.min_shift = min_shift
+        #: depth of the binning index
+        self.depth = depth
+        #: names of the contigs, in order of appearance
+        self.names = []
+        # per contig, mapping from bin to list of [begin, end] offset pairs
+        self._bins = []
+        # per contig, list with the smallest offset of a record overlapping
+        # each window, ``None`` for empty windows
+        self._linear = []
+        # begin position of the last record
+        self._last_begin = None
+
+    def add(self, chrom, begin, end, offset_begin, offset_end):
+        """Add record to the index
+
+        :param str chrom: name of the contig
+        :param int begin: 0-based begin position of the record
+        :param int end: 0-based end position of the record (exclusive)
+        :param int offset_begin: offset of the record in the uncompressed data
+        :param int offset_end: offset past the record in the uncompressed data
+        :raises: :py:class:`~vcfpy.exceptions.InvalidRecordException` if the
+            records are not sorted or the position is too large for the index
+        """
+        if not self.names or chrom != self.names[-1]:
+            if chrom in self.names:
+                raise exceptions.InvalidRecordException(
+                    "Cannot index unsorted file, contig {} seen before".format(chrom)
+                )
+            self.names.append(chrom)
+            self._bins.append({})
+            self._linear.append([])
+        elif begin < self._last_begin:
+            raise exceptions.InvalidRecordException(
+                "Cannot index unsorted file, {}:{} after {}:{}".format(
+                    chrom, begin + 1, chrom, self._last_begin + 1
+                )
+            )
+        self._last_begin = begin
+        end = max(end, begin + 1)
+        if end > 1 << (self.min_shift + self.depth * 3):
+            raise exceptions.InvalidRecordException(
+                "Position {}:{} too large for {} index".format(chrom, end, self.fmt.upper())
+            )
+        # append to chunk list of bin, extending the last chunk if possible
+        chunks = self._bins[-1].setdefault(reg2bin(begin, end, self.min_shift, self.depth), [])
+        if chunks and chunks[-1][1] == offset_begin:
+            chunks[-1][1] = offset_end
+        else:
+            chunks.append([offset_begin, offset_end])
+        # update linear index
+        linear = self._linear[-1]
+        first_window, last_window = begin >> self.min_shift, (end - 1) >> self.min_shift
+        if len(linear) <= last_window:
+            linear.extend([None] * (last_window + 1 - len(linear)))
+        for window in range(first_window, last_window + 1):
+            if linear[window] is None:
+                linear[window] = offset_begin
+
+    def write(self, path, virtual_offset):
+        """Write index to ``path``
+
+        :param str path: path to the index file to write
+        :param virtual_offset: function for converting offsets in the
+            uncompressed data into virtual offsets, e.g.,
+            :py:meth:`vcfpy.bgzf.BgzfWriter.virtual_offset`
+        """
+        with bgzf.BgzfWriter(filename=path, mode="wb") as f:
+            f.write(self.serialize(virtual_offset))
+
+    def serialize(self, virtual_offset):
+        """Return the uncompressed index as ``bytes``"""
+        names = b"".join(name.encode("utf-8") + b"\0" for name in self.names)
+        header = struct.pack(
+            "<iiiiii", FORMAT_VCF, COL_SEQ, COL_BEG, COL_END, ord(META_CHAR), 0
+        ) + struct.pack("<i", len(names)) + names
+        if self.fmt == "tbi":
+            result = [b"TBI\1", struct.pack("<i", len(self.names)), header]
+        else:
+            result = [
+                b"CSI\1",
+                struct.pack("<iii", self.min_shift, self.depth, len(header)),
+                header,
+                struct.pack("<i", len(self.names)),
+            ]
+        for bins, linear in zip(self._bins, self._linear):
+            linear = [virtual_offset(offset) for offset in self._fill_linear(linear)]
+            result.append(struct.pack("<i", len(bins)))
+            for bin_, chunks in sorted(bins.items()):
+                if self.fmt == "tbi":
+                    result.append(struct.pack("<I", bin_))
+                else:
+                    window = bin_first_pos(bin_, self.min_shift, self.depth) >> self.min_shift
+                    loff = linear[min(window, len(linear) - 1)]
+                    result.append(struct.pack("<IQ", bin_, loff))
+                result.append(struct.pack("<i", len(chunks)))
+                for begin, end in chunks:
+                    result.append(struct.pack("<QQ", virtual_offset(begin), virtual_offset(end)))
+            if self.fmt == "tbi":
+                result.append(struct.pack("<i", len(linear)))
+                result.append(struct.pack("<%dQ" % len(linear), *linear))
+        return b"".join(result)
+
+    @classmethod
+    def _fill_linear(klass, linear):
+        """Fill empty windows with the offset of the previous window, leading
+        empty windows with the first offset"""
+        result = []
+        first = next(offset for offset in linear if offset is not None)
+        for offset in linear:
+            if offset is None:
+                offset = result[-1] if result else first
+            result.append(offset)
+        return result
+
+
+class TabixIndex:
+    """In-memory representation of a TBI or CSI index
+
+    Use :py:meth:`~TabixIndex.from_path` for loading an index.  Query the
+    chunks of virtual offsets to read for a region with
+    :py:meth:`~TabixIndex.query`, and the matching lines with
+    :py:func:`fetch_lines`.
+    """
+
+    @classmethod
+    def from_path(klass, path):
+        """Load index from the TBI or CSI file at ``path``"""
+        with bgzf.BgzfReader(str(path), "rb") as f:
+            return klass.from_bytes(f.read())
+
+    @classmethod
+    def from_bytes(klass, data):
+        """Load index from the uncompressed TBI or CSI data
+
+        :raises: ``ValueError`` if the data is not a TBI or CSI index
+        """
+        magic = data[:4]
+        if magic == b"TBI\1":
+            fmt, min_shift, depth = "tbi", TBI_MIN_SHIFT, TBI_DEPTH
+            (num_refs,) = struct.unpack_from("<i", data, 4)
+            header_begin = 8
+        elif magic == b"CSI\1":
+            fmt = "csi"
+            min_shift, depth, header_len = struct.unpack_from("<iii", data, 4)
+            header_begin = 16
+            if header_len < 28:
+                raise ValueError("CSI index without tabix header, not for a VCF file")
+            (num_refs,) = struct.unpack_from("<i", data, header_begin + header_len)
+        else:
+            raise ValueError("Not a TBI or CSI index, magic bytes were {}".format(repr(magic)))
+        _fmt, _col_seq, _col_beg, _col_end, meta, skip, names_len = struct.unpack_from(
+            "<iiiiiii", data, header_begin
+        )
+        offset = header_begin + 28
+        names = [name.decode("utf-8") for name in data[offset : offset + names_len].split(b"\0")]
+        names = names[:num_refs]
+        offset += names_len
+        if fmt == "csi":
+            offset += 4  # number of references
+        # bin of the meta data (e.g., number of mapped records) to skip
+        pseudo_bin = bin_first(depth + 1) + 1
+        bins, loffs, linears = [], [], []
+        for _ in range(num_refs):
+            ref_bins, ref_loffs = {}, {}
+            (num_bins,) = struct.unpack_from("<i", data, offset)
+            offset += 4
+            for _ in range(num_bins):
+                if fmt == "tbi":
+                    bin_, num_chunks = struct.unpack_from("<Ii", data, offset)
+                    offset += 8
+                else:
+                    bin_, loff, num_chunks = struct.unpack_from("<IQi", data, offset)
+                    offset += 16
+                    ref_loffs[bin_] = loff
+                values = struct.unpack_from("<%dQ" % (2 * num_chunks), data, offset)
+                offset += 16 * num_chunks
+                if bin_ != pseudo_bin:
+                    ref_bins[bin_] = list(zip(values[::2], values[1::2]))
+            linear = []
+            if fmt == "tbi":
+                (num_windows,) = struct.unpack_from("<i", data, offset)
+                linear = list(struct.unpack_from("<%dQ" % num_windows, data, offset + 4))
+                offset += 4 + 8 * num_windows
+            bins.append(ref_bins)
+            loffs.append(ref_loffs)
+            linears.append(linear)
+        return TabixIndex(fmt, min_shift, depth, names, bins, linears, loffs, chr(meta), skip)
+
+    def __init__(self, fmt, min_shift, depth, names, bins, linear, loffs, meta_char="#", skip=0):
+        #: index format, ``"tbi"`` or ``"csi"``
+        self.fmt = fmt
+        #: size of the smallest bins and linear index windows
+        self.min_shift = min_shift
+        #: depth of the binning index
+        self.depth = depth
+        #: names of the contigs, in the order of the file
+        self.names = names
+        #: mapping from contig name to its index in ``names``
+        self.name_to_idx = {name: i for i, name in enumerate(names)}
+        #: per contig, ``dict`` mapping bin to list of chunks, given as pairs
+        #: of virtual offsets
+        self.bins = bins
+        #: per contig, linear index of TBI, empty lists for CSI
+        self.linear = linear
+        #: per contig, ``dict`` mapping bin to smallest virtual offset of a
+        #: record overlapping the bin for CSI, empty ``dict`` for TBI
+        self.loffs = loffs
+        #: character starting meta lines
+        self.meta_char = meta_char
+        #: number of lines to skip at the start of the file
+        self.skip = skip
+
+    def parse_region(self, region):
+        """Return ``(chrom, begin, end)`` for the samtools region string
+        ``region``, e.g., ``"chr1:123,456-123,900"``
+
+        The 1-based, inclusive coordinates are converted into 0-based,
+        half-open ones.  ``end`` is ``None`` if the region extends to the
+        end of the contig.
+        """
+        if region in self.name_to_idx or ":" not in region:
+            return region, 0, None
+        chrom, _, range_ = region.rpartition(":")
+        range_ = range_.replace(",", "")
+        try:
+            if "-" in range_:
+                begin, end = range_.split("-", 1)
+                return chrom, int(begin or 1) - 1, int(end) if end else None
+            else:
+                return chrom, int(range_) - 1, None
+        except ValueError:
+            return region, 0, None  # not a range, interpret as contig name
+
+    def query(self, chrom, begin, end=None):
+        """Return sorted list of chunks of virtual offsets to read for the
+        records overlapping the given 0-based, half-open region
+
+        Overlapping and adjacent chunks are merged.  The list is empty for
+        contigs not in the index.
+        """
+        idx = self.name_to_idx.get(chrom)
+        if idx is None:
+            return []
+        max_end = 1 << (self.min_shift + self.depth * 3)
+        begin = max(begin, 0)
+        end = max_end if end is None else min(end, max_end)
+        if begin >= end:
+            return []
+        bins = self.bins[idx]
+        min_offset = self._min_offset(idx, begin)
+        chunks = sorted(
+            chunk
+            for bin_ in reg2bins(begin, end, self.min_shift, self.depth)
+            for chunk in bins.get(bin_, ())
+            if chunk[1] > min_offset
+        )
+        result = []
+        for chunk_begin, chunk_end in chunks:
+            if result and chunk_begin <= result[-1][1]:
+                result[-1][1] = max(result[-1][1], chunk_end)
+            else:
+                result.append([chunk_begin, chunk_end])
+        return [tuple(chunk) for chunk in result]
+
+    def _min_offset(self, idx, begin):
+        """Return smallest virtual offset of records overlapping ``begin``
+        from the linear index (TBI) or bin offsets (CSI)"""
+        if self.fmt == "tbi":
+            linear = self.linear[idx]
+            if not linear:
+                return 0
+            return linear[min(begin >> self.min_shift, len(linear) - 1)]
+        else:
+            loffs = self.loffs[idx]
+            bin_ = bin_first(self.depth) + (begin >> self.min_shift)
+            while bin_ not in loffs and bin_ > 0:
+                bin_ = bin_parent(bin_)
+            return loffs.get(bin_, 0)
+
+
+def record_end(arr):
+    """Return 0-based end position of the record from the split line
+    ``arr``, taken from ``INFO/END`` and the length of ``REF`` otherwise"""
+    if len(arr) > 7 and "END=" in arr[7]:
+        for entry in arr[7].split(";"):
+            if entry.startswith("END="):
+                try:
+                    return int(entry[4:])
+                except ValueError:
+                    break
+    return int(arr[1]) - 1 + len(arr[3])
+
+
+def merge_regions(index, regions):
+    """Return sorted list of ``(chrom, begin, end)`` with the overlapping
+    and adjacent ``regions`` merged
+
+    :param index: :py:class:`TabixIndex` giving the order of the contigs,
+        regions on contigs not in the index are dropped
+    :param regions: iterable of samtools region strings or ``(chrom, begin,
+        end)`` triples with 0-based, half-open coordinates, ``end`` may be
+        ``None`` for the end of the contig
+    """
+    parsed = []
+    for region in regions:
+        if isinstance(region, str):
+            region = index.parse_region(region)
+        chrom, begin, end = region
+        if chrom in index.name_to_idx:
+            parsed.append((index.name_to_idx[chrom], begin, end))
+    parsed.sort(key=lambda region: (region[0], region[1]))
+    result = []
+    for idx, begin, end in parsed:
+        if result and result[-1][0] == idx:
+            last_end = result[-1][2]
+            if last_end is None or begin <= last_end:
+                if end is None or last_end is None:
+                    result[-1][2] = None
+                else:
+                    result[-1][2] = max(last_end, end)
+                continue
+        result.append([idx, begin, end])
+    return [(index.names[idx], begin, end) for idx, begin, end in result]
+
+
+def fetch_lines(stream, index, chrom, begin, end=None, min_begin=None):
+    """Yield lines of records overlapping the given 0-based, half-open
+    region
+
+    Only the BGZF blocks of the chunks given by the ``index`` are read.
+
+    :param stream: :py:class:`~vcfpy.bgzf.BgzfReader` to read from
+    :param index: :py:class:`TabixIndex` of the file
+    :param int min_begin: if given, skip records beginning before, e.g., as
+        they were already yielded for the previous region
+    """
+    for chunk_begin, chunk_end in index.query(chrom, begin, end):
+        stream.seek(chunk_begin)
+        while stream.tell() < chunk_end:
+            line = stream.readline()
+            if not line:
+                break
+            arr = line.rstrip("\r\n").split("\t", 8)
+            if arr[0] != chrom:
+                continue
+            record_begin = int(arr[1]) - 1
+            if end is not None and record_begin >= end:
+                return  # sorted by position, no more overlapping records
+            if min_begin is not None and record_begin < min_begin:
+                continue
+            if record_end(arr) > begin:
+                yield line
+
+
+def fetch_lines_many(stream, index, regions):
+    """Yield lines of records overlapping any of the given regions, each
+    line is yielded once
+
+    :param regions: list of ``(chrom, begin, end)`` triples as returned by
+        :py:func:`merge_regions`
+    """
+    prev_chrom, prev_end = None, None
+    for chrom, begin, end in regions:
+        # records beginning before the end of the previous region on the
+        # same contig overlap it and were yielded already
+        min_begin = prev_end if chrom == prev_chrom else None
+        yield from fetch_lines(stream, index, chrom, begin, end, min_begin)
+        prev_chrom, prev_end = chrom, end
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Helpers for collecting the problems found while parsing VCF files
+
+Calling ``warnings.warn()`` for each problem in the records of a dirty file
+is slow and floods the log.  Instead, the parser reports the problems to a
+:py:class:`Diagnostics` object that counts them by category and key, only
+issues a warning on the first occurrence, and keeps a bounded number of
+example messages for the summary.
+"""
+
+import collections
+import sys
+import warnings
+
+__author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
+
+
+#: Default number of example messages to keep for each category and key
+DEFAULT_MAX_EXAMPLES = 3
+
+
+def warn(category, key, template, *args):
+    """Issue warning for the reported problem, used where no
+    :py:class:`Diagnostics` object is available"""
+    warnings.warn(template.format(*args), category)
+
+
+class Diagnostics:
+    """Sink for problems found while parsing
+
+    Problems are counted by category and key, e.g.,
+    :py:class:`~vcfpy.exceptions.UnknownFilter` and the name of the filter.
+    Override :py:meth:`~Diagnostics.report` for custom handling, e.g., for
+    raising exceptions instead.
+
+    :param int max_examples: number of example messages to keep for each
+        category and key
+    :param bool warn: whether to issue a warning for the first occurrence of
+        each category and key
+    """
+
+    def __init__(self, max_examples=DEFAULT_MAX_EXAMPLES, warn=True):
+        #: number of example messages to keep for each category and key
+        self.max_examples = max_examples
+        #: whether to issue a warning for the first occurrence
+        self.warn = warn
+        #: ``collections.Counter`` with the number of occurrences by
+        #: ``(category, key)``
+        self.counts = collections.Counter()
+        #: ``dict`` with ``list`` of example messages by ``(category, key)``
+        self.examples = {}
+
+    def report(self, category, key, template, *args):
+        """Report problem, the message is only formatted when needed
+
+        :param category: the warning class, subclass of
+            :py:class:`~vcfpy.exceptions.VCFPyWarning`
+        :param key: key of the problem within the category, e.g., the name
+            of the filter or INFO field
+        :param str template: template for the message, formatted with
+            ``args``
+        """
+        entry = (category, key)
+        count = self.counts[entry] + 1
+        self.counts[entry] = count
+        if count <= self.max_examples or (count == 1 and self.warn):
+            message = template.format(*args)
+            if count <= self.max_examples:
+                self.examples.setdefault(entry, []).append(message)
+            if count == 1 and self.warn:
+                warnings.warn(message, category)
+
+    def print_summary(self, file=None):
+        """Print summary of the reported problems, nothing if none were
+        reported
+
+        :param file: ``file``-like object to print to, defaults to
+            ``sys.stderr``
+        """
+        file = file or sys.stderr
+        if not self.counts:
+            return
+        print("Problems found while parsing:", file=file)
+        entries = sorted(self.counts, key=lambda entry: (entry[0].__name__, str(entry[1])))
+        for category, key in entries:
+            count = self.counts[(category, key)]
+            print("  {} {}: {} occurrences".format(category.__name__, key, count), file=file)
+            for message in self.examples.get((category, key), []):
+                print("    {}".format(message), file=file)
@@ -4,13 +4,36 @@
 Currently, only writing to plain-text files is supported
 """
 
+import weakref
+
 from . import parser
 from . import record
 from . import bgzf
+from . import tabix
+from .record import LazyCalls, LazyInfo
 
 __author__ = "Manuel Holtgrewe <manuel.holtgrewe@bihealth.de>"
 
 
+#: Default number of characters to collect before writing to the file in
+#: :py:meth:`Writer.from_path`
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def _decode_raw(raw):
+    """Return raw value of lazy INFO or calls as ``str``, decoding ``bytes``
+    from records parsed from binary streams"""
+    return raw.decode() if type(raw) is bytes else raw
+
+
+def _write_out(stream, buffer):
+    """Write out the serialized lines in ``buffer`` when the
+    :py:class:`Writer` is garbage collected without being closed"""
+    if buffer and not getattr(stream, "closed", False):
+        stream.write("".join(buffer))
+        buffer.clear()
+
+
 def format_atomic(value):
     """Format atomic value
 
@@ -56,13 +79,29 @@ class Writer:
     :py:meth:`~Writer.from_path`.
 
     The writer has to be constructed with a :py:class:`~vcfpy.header.Header`
-    object and the full VCF header will be written immediately on construction.
+    object and the full VCF header will be serialized on construction.
     This, of course, implies that modifying the header after construction is
     illegal.
+
+    With a ``buffer_size`` (the default of :py:meth:`~Writer.from_path`), the
+    serialized header and records are collected in a buffer and written to
+    the stream in large chunks.  The buffer is written out on
+    :py:meth:`~Writer.flush`, on :py:meth:`~Writer.close`, and when the
+    writer is garbage collected.  Streams passed to
+    :py:meth:`~Writer.from_stream` are written to immediately by default.
     """
 
     @classmethod
-    def from_stream(klass, stream, header, path=None, use_bgzf=None):
+    def from_stream(
+        klass,
+        stream,
+        header,
+        path=None,
+        use_bgzf=None,
+        threads=1,
+        index=None,
+        buffer_size=0,
+    ):
         """Create new :py:class:`Writer` from file
 
         Note that for getting bgzf support, you have to pass in a stream
@@ -76,28 +115,44 @@ class Writer:
         :param path: optional string with path to store (for display only)
         :param use_bgzf: indicator whether to write bgzf to ``stream``
             if ``True``, prevent if ``False``, interpret ``path`` if ``None``
+        :param int threads: number of threads to use for BGZF compression
+        :param str index: build index of the given type (``"tbi"`` or
+            ``"csi"``) on the fly and write it to ``path`` with the type as
+            the additional extension on closing, requires BGZF
+        :param int buffer_size: number of characters to collect before
+            writing to ``stream``, written to immediately by default
         """
         if use_bgzf or (use_bgzf is None and path and path.endswith(".gz")):
-            stream = bgzf.BgzfWriter(fileobj=stream)
-        return Writer(stream, header, path)
+            stream = bgzf.BgzfWriter(fileobj=stream, threads=threads)
+        return Writer(stream, header, path, index, buffer_size)
 
     @classmethod
-    def from_path(klass, path, header):
+    def from_path(klass, path, header, threads=1, index=None, buffer_size=DEFAULT_BUFFER_SIZE):
         """Create new :py:class:`Writer` from path
 
         :param path: the path to load from (converted to ``str`` for
             compatibility with ``path.py``)
         :param header: VCF header to use, lines and samples are deep-copied
+        :param int threads: number of threads to use for BGZF compression
+            when writing to a path ending in ``".gz"``
+        :param str index: build index of the given type (``"tbi"`` or
+            ``"csi"``) on the fly when writing to a path ending in ``".gz"``,
+            written to ``path`` with the type as the additional extension
+            on closing
+        :param int buffer_size: number of characters to collect before
+            writing to the file
         """
         path = str(path)
         use_bgzf = False  # we already interpret path
         if path.endswith(".gz"):
-            f = bgzf.BgzfWriter(filename=path)
+            f = bgzf.BgzfWriter(filename=path, threads=threads)
         else:
             f = open(path, "wt")
-        return klass.from_stream(f, header, path, use_bgzf=use_bgzf)
+        return klass.from_stream(
+            f, header, path, use_bgzf=use_bgzf, index=index, buffer_size=buffer_size
+        )
 
-    def __init__(self, stream, header, path=None):
+    def __init__(self, stream, header, path=None, index=None, buffer_size=0):
         #: stream (``file``-like object) to read from
         self.stream = stream
         #: the :py:class:~vcfpy.header.Header` to write out, will be
@@ -105,32 +160,103 @@ class Writer:
         self.header = header.copy()
         #: optional ``str`` with the path to the stream
         self.path = path
+        #: optional ``str`` with the path to the index file to write
+        self.index_path = None
+        #: number of characters to collect before writing to ``stream``
+        self.buffer_size = buffer_size
+        # serialized lines not written to stream yet and their total length
+        self._buffer = []
+        self._buffer_len = 0
+        # write out the buffer if the writer is not closed
+        self._finalizer = weakref.finalize(self, _write_out, self.stream, self._buffer)
+        # the tabix.IndexBuilder, if building an index
+        self._index_builder = None
+        if index:
+            if not path or not isinstance(stream, bgzf.BgzfWriter):
+                raise ValueError("Building an index requires writing BGZF to a path")
+            self.index_path = "{}.{}".format(path, index)
+            if index == "csi":
+                lengths = [line.length for line in self.header.get_lines("contig")]
+                max_length = max([int(length) for length in lengths if length] or [0])
+                depth = tabix.csi_depth(max_length)
+                self._index_builder = tabix.IndexBuilder(index, depth=depth)
+            else:
+                self._index_builder = tabix.IndexBuilder(index)
         # write out headers
         self._write_header()
 
     def _write_header(self):
         """Write out the header"""
-        for line in self.header.lines:
-            print(line.serialize(), file=self.stream)
+        lines = [line.serialize() for line in self.header.lines]
         if self.header.samples.names:
-            print(
-                "\t".join(list(parser.REQUIRE_SAMPLE_HEADER) + self.header.samples.names),
-                file=self.stream,
-            )
+            lines.append("\t".join(list(parser.REQUIRE_SAMPLE_HEADER) + self.header.samples.names))
         else:
-            print("\t".join(parser.REQUIRE_NO_SAMPLE_HEADER), file=self.stream)
+            lines.append("\t".join(parser.REQUIRE_NO_SAMPLE_HEADER))
+        self._write("\n".join(lines) + "\n")
+
+    def _write(self, data):
+        """Append ``data`` to the buffer, write out the buffer if full"""
+        self._buffer.append(data)
+        self._buffer_len += len(data)
+        if self._buffer_len >= self.buffer_size:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        """Write out the buffer to the stream"""
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffer_len = 0
+
+    def flush(self):
+        """Write out the buffer and flush the underlying stream"""
+        self._write_buffer()
+        self.stream.flush()
 
     def close(self):
-        """Close underlying stream"""
+        """Write out the buffer, close underlying stream, and write out
+        index, if any"""
+        self._write_buffer()
         self.stream.close()
+        if self._index_builder:
+            self._index_builder.write(self.index_path, self.stream.virtual_offset)
+            self._index_builder = None
 
     def write_record(self, record):
         """Write out the given :py:class:`vcfpy.record.Record` to this
         Writer"""
-        self._serialize_record(record)
+        line = self._serialize_record(record)
+        if self._index_builder:
+            # BGZF output is latin-1 encoded, one byte per character
+            offset = self.stream.raw_tell() + self._buffer_len
+            self._index_record(record, offset, offset + len(line))
+        self._write(line)
+
+    def write_records(self, records):
+        """Write out all :py:class:`vcfpy.record.Record` objects from the
+        iterable ``records`` to this Writer"""
+        write_record = self.write_record
+        for record in records:
+            write_record(record)
+
+    def _index_record(self, record, offset_begin, offset_end):
+        """Add record written out at the given offsets to the index, the end
+        position is taken from ``INFO/END`` and the length of ``REF``
+        otherwise"""
+        begin = record.POS - 1
+        info = record.INFO
+        if isinstance(info, LazyInfo) and not info.is_decoded("END"):
+            # keep the LazyInfo pristine for writing it out verbatim
+            end = info.raw_value("END") if "END" in info else None
+            end = int(end) if isinstance(end, str) and end.isdigit() else None
+        else:
+            end = info.get("END")
+        if not isinstance(end, int):
+            end = begin + len(record.REF)
+        self._index_builder.add(record.CHROM, begin, end, offset_begin, offset_end)
 
     def _serialize_record(self, record):
-        """Serialize whole Record"""
+        """Return serialized line of whole Record, including line break"""
         f = self._empty_to_dot
         row = [record.CHROM, record.POS]
         row.append(f(";".join(record.ID)))
@@ -144,14 +270,19 @@ class Writer:
         row.append(f(self._serialize_info(record)))
         if record.FORMAT:
             row.append(":".join(record.FORMAT))
-        row += [
-            self._serialize_call(record.FORMAT, record.call_for_sample[s])
-            for s in self.header.samples.names
-        ]
-        print(*row, sep="\t", file=self.stream)
+        if isinstance(record.calls, LazyCalls):
+            row += self._serialize_lazy_calls(record.FORMAT, record.calls)
+        else:
+            row += [
+                self._serialize_call(record.FORMAT, record.call_for_sample[s])
+                for s in self.header.samples.names
+            ]
+        return "\t".join(map(str, row)) + "\n"
 
     def _serialize_info(self, record):
         """Return serialized version of record.INFO"""
+        if isinstance(record.INFO, LazyInfo):
+            return self._serialize_lazy_info(record.INFO)
         result = []
         for key, value in record.INFO.items():
             info = self.header.get_info_field_info(key)
@@ -161,6 +292,43 @@ class Writer:
                 result.append("{}={}".format(key, format_value(info, value, "INFO")))
         return ";".join(result)
 
+    def _serialize_lazy_info(self, lazy_info):
+        """Return serialized version of :py:class:`~vcfpy.record.LazyInfo`,
+        entries that were not accessed are written out verbatim"""
+        if lazy_info.is_pristine():
+            raw = _decode_raw(lazy_info.raw)
+            return "" if raw == "." else raw
+        result = []
+        for key in lazy_info:
+            if lazy_info.is_decoded(key):
+                value = lazy_info[key]
+                info = self.header.get_info_field_info(key)
+                if info.type == "Flag":
+                    result.append(key)
+                else:
+                    result.append("{}={}".format(key, format_value(info, value, "INFO")))
+            else:
+                value = lazy_info.raw_value(key)
+                result.append(key if value is True else "{}={}".format(key, value))
+        return ";".join(result)
+
+    def _serialize_lazy_calls(self, format_, calls):
+        """Return list of serialized columns for
+        :py:class:`~vcfpy.record.LazyCalls`, the columns of calls that were
+        not built are written out verbatim unless the FORMAT was changed"""
+        names = self.header.samples.names
+        verbatim = calls.format is None or tuple(format_) == calls.format
+        if verbatim and not calls.any_materialized() and names == calls.samples.names:
+            return [_decode_raw(calls.raw)]
+        result = []
+        for name in names:
+            idx = calls.samples.name_to_idx[name]
+            if not verbatim or calls.is_materialized(idx):
+                result.append(self._serialize_call(format_, calls[idx]))
+            else:
+                result.append(_decode_raw(calls.raw_column(idx)))
+        return result
+
     def _serialize_call(self, format_, call):
         """Return serialized version of the Call using the record's FORMAT'"""
         if isinstance(call, record.UnparsedCall):